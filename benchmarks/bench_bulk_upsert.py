@@ -0,0 +1,90 @@
+# benchmarks/bench_bulk_upsert.py
+"""
+Products per second of MongoDBManager.save_products_bulk against a local
+mongod, compared with the previous per-product upsert_product loop.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 python -m benchmarks.bench_bulk_upsert
+    python -m benchmarks.bench_bulk_upsert --sizes 10 100 1000 10000 --legacy-max 1000
+    python -m benchmarks.bench_bulk_upsert --mode merge   # read-then-merge upserts
+
+Each batch size runs twice against a scratch database: the first pass
+inserts every product, the second re-saves them with new prices (the
+update path). The scratch database is dropped afterwards.
+"""
+import argparse
+import random
+import time
+
+from config.settings import settings
+from src.database.mongo_manager import MongoDBManager
+
+
+def make_products(n: int, price_shift: float = 0.0) -> list:
+    rng = random.Random(n)
+    return [
+        {
+            "platform": rng.choice(["amazon", "flipkart"]),
+            "product_id": f"BENCH{i:06d}",
+            "title": f"Benchmark product {i}",
+            "price": round(rng.uniform(500, 50000), 2) + price_shift,
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "reviews": str(rng.randint(0, 5000)),
+            "url": f"https://example.test/p/{i}",
+            "category": "benchmark",
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_save(db: MongoDBManager, products: list):
+    # Per-product read-merge loop that save_products_bulk replaced
+    mode, settings.product_upsert_mode = settings.product_upsert_mode, "merge"
+    try:
+        for product in products:
+            db.upsert_product(product)
+    finally:
+        settings.product_upsert_mode = mode
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uri", default=None, help="defaults to settings.mongodb_uri")
+    parser.add_argument("--db", default="retail_intelligence_bench")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument(
+        "--legacy-max", type=int, default=1000, help="skip the per-product loop above this size"
+    )
+    parser.add_argument("--mode", choices=["pipeline", "merge"], default=settings.product_upsert_mode)
+    args = parser.parse_args()
+    settings.product_upsert_mode = args.mode
+
+    db = MongoDBManager(args.uri, db_name=args.db)
+    print(f"bulk path: {args.mode} upserts")
+    print(f"{'batch':>7} {'path':<8} {'insert p/s':>12} {'update p/s':>12}")
+    try:
+        for size in args.sizes:
+            paths = [("bulk", db.save_products_bulk)]
+            if size <= args.legacy_max:
+                paths.insert(0, ("legacy", lambda p: legacy_save(db, p)))
+
+            for label, save in paths:
+                db.products.delete_many({})
+                db.price_history.delete_many({})
+                first, second = make_products(size), make_products(size, price_shift=1.0)
+                insert_s = timed(lambda: save(first))
+                update_s = timed(lambda: save(second))
+                print(f"{size:>7} {label:<8} {size / insert_s:>12.0f} {size / update_s:>12.0f}")
+    finally:
+        db.client.drop_database(args.db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
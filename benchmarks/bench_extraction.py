@@ -0,0 +1,116 @@
+# benchmarks/bench_extraction.py
+"""
+Product-card extraction throughput (cards per second) over saved search
+pages, comparing the declarative single-pass specs against the previous
+find()-per-field extractors.
+
+Usage:
+    python -m benchmarks.bench_extraction --runs 50
+    python -m benchmarks.bench_extraction --min-cps 5000   # exit 1 below this
+
+Cards are parsed once up front, so only extraction is timed. Use
+--min-cps in CI to catch regressions when selectors change.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.flipkart_scraper import FlipkartScraper
+from src.utils.helpers import clean_price, clean_rating
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+
+# ── Previous extractors, kept as the baseline ─────────────────────────────────
+def legacy_amazon(card):
+    title_element = card.find("h2")
+    title = title_element.get_text(strip=True) if title_element else None
+    asin = card.get("data-asin")
+    if not title or not asin:
+        return None
+    price_whole = card.find("span", class_="a-price-whole")
+    rating_element = card.find("span", class_="a-icon-alt")
+    reviews_element = card.find("span", {"class": "a-size-base", "dir": "auto"})
+    link_element = card.find("h2").find("a") if card.find("h2") else None
+    img_element = card.find("img", class_="s-image")
+    return {
+        "title": title,
+        "price": clean_price(price_whole.get_text(strip=True)) if price_whole else None,
+        "rating": clean_rating(rating_element.get_text(strip=True)) if rating_element else None,
+        "reviews": reviews_element.get_text(strip=True) if reviews_element else "0",
+        "url": link_element.get("href") if link_element else None,
+        "image_url": img_element.get("src") if img_element else None,
+    }
+
+
+def legacy_flipkart(card):
+    if not card.get("data-id"):
+        return None
+    link_element = card.find("a", href=re.compile(r"/p/"))
+    if not link_element:
+        return None
+    img_element = card.find("img", src=re.compile(r"rukminim|flixcart"))
+    price = None
+    for tag in card.find_all(string=re.compile(r"₹")):
+        cleaned = clean_price(tag.strip())
+        if cleaned and cleaned > 100:
+            price = cleaned
+            break
+    rating = None
+    for tag in card.find_all(string=re.compile(r"^\d\.\d$")):
+        rating = float(tag.strip())
+        break
+    reviews = card.find(string=re.compile(r"\d[\d,]+\s*(Ratings|Reviews|ratings|reviews)"))
+    return {
+        "title": img_element.get("alt") if img_element else None,
+        "price": price,
+        "rating": rating,
+        "reviews": reviews.strip() if reviews else "0",
+        "url": link_element.get("href"),
+    }
+
+
+def cards_per_second(extract, cards, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        for card in cards:
+            extract(card)
+    elapsed = time.perf_counter() - start
+    return len(cards) * runs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--min-cps", type=float, default=0, help="fail if spec throughput is below this")
+    args = parser.parse_args()
+
+    pages = [
+        ("amazon", AmazonScraper(), "amazon_search.html", legacy_amazon),
+        ("flipkart", FlipkartScraper(), "flipkart_search.html", legacy_flipkart),
+    ]
+
+    failed = False
+    print(f"{'page':<10} {'cards':>6} {'legacy c/s':>12} {'spec c/s':>12} {'speedup':>8}")
+    for platform, scraper, fixture, legacy in pages:
+        with open(os.path.join(FIXTURES, fixture), encoding="utf-8") as f:
+            cards = scraper.find_product_cards(scraper.parse_results_page(f.read()))
+
+        legacy_cps = cards_per_second(legacy, cards, args.runs)
+        spec_cps = cards_per_second(scraper._extract_product_info, cards, args.runs)
+        print(
+            f"{platform:<10} {len(cards):>6} {legacy_cps:>12.0f} {spec_cps:>12.0f} "
+            f"{spec_cps / legacy_cps:>7.2f}x"
+        )
+        if args.min_cps and spec_cps < args.min_cps:
+            print(f"❌ {platform} extraction below {args.min_cps:.0f} cards/s")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_parsers.py
+"""
+Parse time and peak memory of each HTML parser backend over saved
+Amazon / Flipkart search pages.
+
+Usage:
+    python -m benchmarks.bench_parsers --runs 20
+    python -m benchmarks.bench_parsers --amazon saved/amazon.html --flipkart saved/flipkart.html
+
+Defaults to the fixture pages in tests/fixtures. Each backend is also
+checked to yield the same products as the html.parser baseline.
+"""
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.flipkart_scraper import FlipkartScraper
+from src.scrapers.base_scraper import LXML_AVAILABLE
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+# (label, tree builder, restrict to product cards)
+BACKENDS = [
+    ("html.parser", "html.parser", False),
+    ("html.parser+strainer", "html.parser", True),
+    ("lxml", "lxml", False),
+    ("lxml+strainer", "lxml", True),
+]
+
+
+def parse_and_extract(scraper, html: str, parser: str, strained: bool) -> list:
+    strainer = scraper.card_strainer if strained else None
+    soup = scraper.parse_html(html, parser=parser, parse_only=strainer)
+    return [scraper._extract_product_info(card) for card in scraper.find_product_cards(soup)]
+
+
+def bench(scraper, html: str, parser: str, strained: bool, runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parse_and_extract(scraper, html, parser, strained)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse_and_extract(scraper, html, parser, strained)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"p50_ms": statistics.median(timings) * 1000, "peak_kb": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--amazon", default=os.path.join(FIXTURES, "amazon_search.html"))
+    parser.add_argument("--flipkart", default=os.path.join(FIXTURES, "flipkart_search.html"))
+    args = parser.parse_args()
+
+    pages = {
+        "amazon": (AmazonScraper(), args.amazon),
+        "flipkart": (FlipkartScraper(), args.flipkart),
+    }
+    backends = [b for b in BACKENDS if LXML_AVAILABLE or b[1] != "lxml"]
+
+    print(f"{'page':<10} {'backend':<22} {'parse p50 (ms)':>15} {'peak (KB)':>10} {'match':>6}")
+    for platform, (scraper, path) in pages.items():
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        baseline = parse_and_extract(scraper, html, "html.parser", False)
+
+        for label, builder, strained in backends:
+            r = bench(scraper, html, builder, strained, args.runs)
+            same = parse_and_extract(scraper, html, builder, strained) == baseline
+            print(
+                f"{platform:<10} {label:<22} {r['p50_ms']:>15.2f} "
+                f"{r['peak_kb']:>10.0f} {'yes' if same else 'NO':>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
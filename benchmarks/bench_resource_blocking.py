@@ -0,0 +1,77 @@
+# benchmarks/bench_resource_blocking.py
+"""
+Bytes transferred and page-ready time for Amazon / Flipkart search pages,
+with and without the headless-Chrome resource-blocking profile.
+
+Usage:
+    python -m benchmarks.bench_resource_blocking --query "wireless headphones" --runs 3
+
+Needs Chrome and network access. Byte counts come from the Resource Timing
+API, so cross-origin responses without Timing-Allow-Origin count as 0 -
+treat the totals as a lower bound; the request count is exact.
+"""
+import argparse
+import statistics
+import time
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.flipkart_scraper import FlipkartScraper
+
+TRANSFER_JS = """
+const entries = performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'));
+return [entries.length, entries.reduce((sum, e) => sum + (e.transferSize || 0), 0)];
+"""
+
+SEARCH_URLS = {
+    "amazon": "https://www.amazon.in/s?k={}",
+    "flipkart": "https://www.flipkart.com/search?q={}",
+}
+
+
+def measure(scraper, url: str, block_resources: bool, runs: int) -> dict:
+    """Fresh driver per run so caches don't flatter the second mode"""
+    ready_times, byte_counts, request_counts = [], [], []
+
+    for _ in range(runs):
+        driver = scraper.setup_driver(block_resources=block_resources)
+        try:
+            start = time.monotonic()
+            driver.get(url)
+            scraper.wait_until_ready(driver)
+            ready_times.append(time.monotonic() - start)
+
+            requests_made, transferred = driver.execute_script(TRANSFER_JS)
+            request_counts.append(requests_made)
+            byte_counts.append(transferred)
+        finally:
+            driver.quit()
+
+    return {
+        "ready_p50": statistics.median(ready_times),
+        "bytes_p50": statistics.median(byte_counts),
+        "requests_p50": statistics.median(request_counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--query", default="wireless headphones")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    scrapers = {"amazon": AmazonScraper(), "flipkart": FlipkartScraper()}
+
+    print(f"{'platform':<10} {'mode':<9} {'ready p50 (s)':>14} {'KB p50':>10} {'requests':>9}")
+    for platform, scraper in scrapers.items():
+        url = SEARCH_URLS[platform].format(args.query.replace(" ", "+"))
+        for label, block in (("full", False), ("blocked", True)):
+            r = measure(scraper, url, block, args.runs)
+            print(
+                f"{platform:<10} {label:<9} {r['ready_p50']:>14.2f} "
+                f"{r['bytes_p50'] / 1024:>10.0f} {r['requests_p50']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
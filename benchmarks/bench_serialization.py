@@ -0,0 +1,116 @@
+# benchmarks/bench_serialization.py
+"""
+Documents per second of JSON-encoding product documents for API
+responses, comparing src.utils.serialization against the previous
+per-document serialize_doc() + jsonify path.
+
+Usage:
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --products 10000 --history 30 --runs 5
+
+Products are full documents (every field, ObjectId and datetimes) with
+``--history`` embedded price points each. No database is needed.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from src.utils import serialization
+
+
+# ── Previous encoder, kept as the baseline ───────────────────────────────────
+def legacy_serialize_doc(doc):
+    if doc is None:
+        return None
+    d = dict(doc)
+    for key, value in d.items():
+        if hasattr(value, '__str__') and type(value).__name__ == 'ObjectId':
+            d[key] = str(value)
+        elif isinstance(value, datetime):
+            d[key] = value.isoformat()
+        elif isinstance(value, list):
+            d[key] = [legacy_serialize_doc(item) if isinstance(item, dict) else
+                      (str(item) if type(item).__name__ == 'ObjectId' else
+                       (item.isoformat() if isinstance(item, datetime) else item))
+                      for item in value]
+    return d
+
+
+def legacy_encode(docs) -> bytes:
+    # jsonify(): Flask's default provider sorts keys
+    return json.dumps([legacy_serialize_doc(d) for d in docs], sort_keys=True).encode("utf-8")
+
+
+def make_products(n: int, history: int) -> list:
+    rng = random.Random(n)
+    start = datetime(2025, 1, 1)
+    products = []
+    for i in range(n):
+        prices = [round(rng.uniform(500, 50000), 2) for _ in range(history)]
+        seen = [start + timedelta(hours=6 * h) for h in range(history)]
+        products.append({
+            "_id": ObjectId(),
+            "unique_id": f"amazon_BENCH{i:06d}",
+            "platform": "amazon",
+            "product_id": f"BENCH{i:06d}",
+            "title": f"Benchmark product {i} with a realistically long listing title",
+            "category": "electronics",
+            "url": f"https://www.amazon.in/dp/BENCH{i:06d}",
+            "image_url": f"https://m.media-amazon.com/images/I/{i:08d}.jpg",
+            "current_price": prices[-1],
+            "current_rating": round(rng.uniform(3.0, 5.0), 1),
+            "current_reviews": str(rng.randint(0, 5000)),
+            "in_stock": True,
+            "lowest_price": min(prices),
+            "highest_price": max(prices),
+            "average_price": round(sum(prices) / history, 2),
+            "price_trend": rng.choice(["up", "down", "stable"]),
+            "price_change_percent": round(rng.uniform(-20, 20), 2),
+            "times_scraped": history,
+            "first_seen": seen[0],
+            "last_seen": seen[-1],
+            "created_at": seen[0],
+            "updated_at": seen[-1],
+            "price_history": [{"price": p, "timestamp": t} for p, t in zip(prices, seen)],
+        })
+    return products
+
+
+def docs_per_second(encode, docs, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        encode(docs)
+    return len(docs) * runs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--history", type=int, default=30, help="embedded price points per product")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = make_products(args.products, args.history)
+    assert json.loads(legacy_encode(docs[:50])) == json.loads(serialization.dumps(docs[:50]))
+
+    encoders = [("legacy", legacy_encode)]
+    if serialization.ORJSON_AVAILABLE:
+        encoders.append(("orjson", lambda d: serialization.dumps(d, sort_keys=True)))
+    else:
+        print("orjson not installed, measuring the stdlib fallback")
+        encoders.append(("stdlib", lambda d: serialization.dumps(d, sort_keys=True)))
+
+    print(f"{args.products} products x {args.history} history points")
+    print(f"{'encoder':<8} {'docs/s':>10} {'MB/s':>8}")
+    for label, encode in encoders:
+        size = len(encode(docs))
+        dps = docs_per_second(encode, docs, args.runs)
+        print(f"{label:<8} {dps:>10.0f} {size * dps / len(docs) / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
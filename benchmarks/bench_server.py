@@ -0,0 +1,89 @@
+# benchmarks/bench_server.py
+"""
+HTTP load test for the API: requests per second and latency percentiles
+of the dashboard read endpoints under concurrent keep-alive clients.
+
+Usage:
+    python run_dashboard.py &                           # development server
+    python -m benchmarks.bench_server --url http://localhost:5000 --clients 50
+
+    gunicorn -c gunicorn.conf.py src.api.app:app &      # production server
+    python -m benchmarks.bench_server --url http://localhost:5000 --clients 50
+
+Each client thread holds one keep-alive connection and cycles through
+--paths for --seconds. Run it against both servers with the same data to
+compare them.
+"""
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_PATHS = [
+    "/api/stats",
+    "/api/dashboard/recent?limit=15",
+    "/api/products?limit=50",
+    "/api/products?platform=amazon&limit=50",
+    "/api/products/price-analytics",
+]
+
+
+def client(url, paths, deadline, latencies, errors, lock):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    mine, failed, i = [], 0, 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                failed += 1
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            failed += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+        mine.append(time.perf_counter() - start)
+    conn.close()
+    with lock:
+        latencies.extend(mine)
+        errors.append(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=client, args=(args.url, args.paths, deadline, latencies, errors, lock))
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    n = len(latencies)
+    pct = lambda p: latencies[min(n - 1, int(n * p))] * 1000 if n else 0.0
+    print(f"{args.clients} clients, {elapsed:.1f}s, {n} requests, {sum(errors)} errors")
+    print(f"{'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    print(f"{n / elapsed:>8.0f} {pct(0.50):>8.1f} {pct(0.95):>8.1f} {pct(0.99):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/standin_app.py
+"""
+The API served over an in-memory MongoDB stand-in (mongomock), seeded with
+synthetic products, so bench_server can compare the two servers without a
+mongod and without scraping. It measures the HTTP layer, not MongoDB.
+
+Usage:
+    python -m benchmarks.standin_app --port 5000        # development server
+    export MONGODB_URI=mongodb://standin GEMINI_API_KEY=x
+    gunicorn -c gunicorn.conf.py benchmarks.standin_app:app  # production server
+    python -m benchmarks.bench_server --url http://localhost:5000 --clients 50
+
+gunicorn.conf.py loads the settings before this module, hence the dummy
+variables. Every MongoClient in a process shares one in-memory server, so
+workers forked from the preloaded app (and their reconnect_after_fork
+clients) see the seeded data; each worker gets its own copy, though, so
+this suits read-only load like bench_server's. Needs the mongomock package.
+"""
+import argparse
+import os
+import random
+
+import mongomock
+import mongomock.collection
+import pymongo
+from mongomock.store import ServerStore
+
+os.environ.setdefault("MONGODB_URI", "mongodb://standin")
+os.environ.setdefault("GEMINI_API_KEY", "standin")
+
+_store = ServerStore()
+
+
+class _StandinClient(mongomock.MongoClient):
+    """One in-memory server for every client, like a real mongod"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("_store", _store)
+        super().__init__(*args, **kwargs)
+
+
+def _drop_sort(add):
+    # pymongo >= 4.11 passes sort= to bulk operations; mongomock predates it
+    def wrapper(self, *args, sort=None, **kwargs):
+        return add(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ("add_update", "add_replace"):
+    _builder = mongomock.collection.BulkOperationBuilder
+    setattr(_builder, _name, _drop_sort(getattr(_builder, _name)))
+
+# Must happen before the app (and db_manager) is imported
+pymongo.MongoClient = _StandinClient
+
+from src.api.app import app  # noqa: E402
+from src.database.mongo_manager import db_manager  # noqa: E402
+
+SEED_PRODUCTS = int(os.environ.get("STANDIN_PRODUCTS", 1000))
+
+
+def seed(n: int):
+    """n products, saved twice so each has a price change and history"""
+    rng = random.Random(0)
+    for _ in range(2):
+        db_manager.save_products_bulk([
+            {
+                "platform": ["amazon", "flipkart"][i % 2],
+                "product_id": f"P{i}",
+                "title": f"Product {i} " + "x" * 60,
+                "price": round(rng.uniform(500, 5000), 2),
+                "rating": 4.1,
+                "reviews": "10",
+                "url": f"https://example.test/p/{i}",
+                "category": "phones",
+            }
+            for i in range(n)
+        ])
+
+
+seed(SEED_PRODUCTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    # Same server as run_dashboard.py
+    app.run(debug=True, host="127.0.0.1", port=args.port, use_reloader=False)
+
+
+if __name__ == "__main__":
+    main()
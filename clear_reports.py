@@ -25,6 +25,16 @@ def main():
             
         print(f"Found {count} analysis reports. Deleting...")
         result = reports_collection.delete_many(query)
+        # Keep the dashboard's report counter in step, and bump the reports
+        # write version so cached report lists (ETags) are refetched
+        db["stats"].update_one(
+            {"_id": "total:reports"}, {"$inc": {"count": -result.deleted_count}}
+        )
+        db["stats"].update_one(
+            {"_id": "version:reports"},
+            {"$inc": {"count": 1}, "$setOnInsert": {"kind": "version"}},
+            upsert=True,
+        )
         
         print(f"Successfully deleted {result.deleted_count} reports from the database.")
         print("Done. Please refresh the dashboard in your browser.")
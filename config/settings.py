@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import os
 
 
@@ -16,6 +16,97 @@ class Settings(BaseSettings):
     # Scraping
     scrape_delay: int = 2
     max_retries: int = 3
+    retry_backoff_base: float = 1.0  # seconds; doubled per attempt, with full jitter
+    retry_backoff_max: float = 30.0
+    breaker_failure_threshold: int = 5  # consecutive failed fetches before a domain trips
+    breaker_cooldown_seconds: float = 120.0  # open time before a half-open probe
+
+    # Politeness: (requests per second, burst) per platform, shared by all
+    # threads in the process. Override with RATE_LIMITS='{"amazon": [0.5, 2]}'
+    rate_limits: Dict[str, Tuple[float, int]] = {
+        "amazon": (0.5, 2),
+        "flipkart": (1.0, 3),
+        "default": (0.5, 1),
+    }
+
+    # Selenium driver pool (per platform)
+    driver_pool_size: int = 2
+    driver_max_pages: int = 50  # recycle a driver after this many page loads
+    driver_checkout_timeout: float = 60.0
+    page_ready_timeout: float = 10.0  # max wait for the results grid
+    page_ready_poll: float = 0.25
+    block_resources: bool = True  # skip images, fonts, media, CSS and trackers
+
+    # HTML parsing
+    html_parser: str = "lxml"  # "lxml" or "html.parser"
+    parse_only_cards: bool = True  # SoupStrainer restricted to product cards
+    parse_workers: int = 0  # processes for multi-page parsing; <= 1 parses in-thread
+
+    # Raw HTML snapshots
+    snapshot_enabled: bool = True
+    snapshot_dir: str = "./data/snapshots"
+    snapshot_codec: str = "gzip"  # "gzip" or "zstd" (needs zstandard)
+    snapshot_max_age_days: int = 30  # 0 keeps snapshots forever
+    snapshot_max_bytes: int = 2 * 1024 ** 3  # compressed blobs; 0 is unlimited
+    snapshot_prune_interval: int = 3600  # seconds between prunes on write; 0 disables
+
+    # Pagination
+    max_search_pages: int = 20
+    per_domain_concurrency: int = 3  # simultaneous page fetches per site
+    page_fetch_workers: int = 8
+
+    # Pooled HTTP tier
+    http_timeout: float = 10.0
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 20
+    http_tier_reprobe_seconds: int = 1800  # retry plain HTTP on escalated domains
+
+    # Product upserts: "pipeline" (one atomic read-free update per product)
+    # or "merge" (read existing documents, merge in Python; not safe with
+    # concurrent writers to the same products: reconcile with POST /api/stats/rebuild)
+    product_upsert_mode: str = "pipeline"
+
+    # Streaming ingest
+    ingest_batch_size: int = 25  # products per micro-batch write
+    ingest_flush_seconds: float = 2.0  # write a partial batch after this long
+
+    # API
+    search_max_workers: int = 4  # concurrent platform scrapes per process
+    search_deadline_seconds: float = 60.0
+    search_deadline_max_seconds: float = 300.0  # cap on a request's deadline_seconds
+    products_page_size: int = 50  # default /api/products page
+    products_page_max: int = 200
+    export_batch_size: int = 1000  # rows per export chunk / Parquet row group
+    export_batch_max: int = 10000
+
+    # Response cache for read endpoints, keyed on the MongoDB write counters
+    # so writes from any process invalidate it. "memory" holds entries per
+    # process; "redis" shares them across workers.
+    response_cache_enabled: bool = True
+    response_cache_backend: str = "memory"
+    response_cache_redis_url: Optional[str] = None
+    response_cache_ttl_seconds: float = 30.0
+    response_cache_max_entries: int = 512
+
+    # Production server (gunicorn.conf.py); WEB_CONCURRENCY overrides workers
+    server_workers: int = 0  # processes, 0 = one per CPU core; each holds its own pools and caches
+    server_threads: int = 8  # request threads per worker
+    server_keepalive: int = 5  # seconds an idle keep-alive connection is kept
+    server_timeout: int = 120  # silent workers are restarted after this long
+    server_graceful_timeout: int = 60  # in-flight requests get this long on reload
+    # Recycle workers after this many requests; 0 disables. Recycling stops
+    # the worker's running jobs (requeued after job_stale_seconds), and the
+    # UI polls /api/jobs every second, so keep it off or very high
+    server_max_requests: int = 0
+    server_max_requests_jitter: int = 0
+
+    # PDF chat: uploaded PDFs' chunks live in MongoDB so every worker can answer
+    pdf_session_ttl_seconds: int = 24 * 3600  # sessions are dropped after this
+
+    # Background jobs
+    job_workers: int = 2  # concurrent collection jobs per process
+    job_stale_seconds: int = 600  # running jobs idle this long are requeued
+    job_ttl_seconds: int = 7 * 24 * 3600  # finished jobs are purged after this
 
     # CrewAI
     crew_llm_model: Optional[str] = "gemini/gemini-2.0-flash"
@@ -0,0 +1,55 @@
+# gunicorn.conf.py
+"""
+Production server settings for the Flask API.
+
+    gunicorn -c gunicorn.conf.py src.api.app:app
+
+preload_app imports the app (Flask, CrewAI, LangChain, the Mongo client)
+once in the master, so workers fork with those modules already loaded
+and share their memory copy-on-write. Per-process resources (Mongo
+client, HTTP sessions, thread pools, AI clients, RAG sessions) are
+recreated in each worker by the modules' os.register_at_fork hooks.
+
+Graceful restart: `kill -HUP <master pid>` starts new workers with the
+current code and config and retires the old ones once their in-flight
+requests finish (up to graceful_timeout).
+
+One worker per CPU core by default (settings.server_workers = 0). Workers
+share nothing in memory, so anything a later request needs lives in
+MongoDB: jobs are claimed and tracked there, PDF chat chunks are stored
+there and any worker rebuilds the session's vectorstore on demand, and the
+write counters keep each worker's response cache consistent. With more
+than one worker set RESPONSE_CACHE_BACKEND=redis to share cache entries.
+
+max_requests recycling is off by default: a recycled worker abandons its
+running jobs until they are requeued after job_stale_seconds, and the UI's
+job polling alone would trigger it every few minutes.
+"""
+import os
+
+from config.settings import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: requests mostly wait on MongoDB, scrapers and LLM calls
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", settings.server_workers)) or os.cpu_count() or 1
+threads = settings.server_threads
+
+preload_app = True
+keepalive = settings.server_keepalive
+timeout = settings.server_timeout
+graceful_timeout = settings.server_graceful_timeout
+max_requests = settings.server_max_requests
+max_requests_jitter = settings.server_max_requests_jitter
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Job recovery starts pool threads, so it runs in each worker after the
+    # fork, never in the master; claims are atomic, so each job runs once
+    from src.api.jobs import recover_jobs
+
+    recover_jobs()
@@ -0,0 +1,27 @@
+"""
+Move embedded price/rating history arrays out of product documents and
+into the price_history collection.
+
+Examples:
+    python migrate_history.py
+    python migrate_history.py --batch-size 200
+
+Runs online: scrapers can keep writing while it works, and it can be
+re-run safely if interrupted.
+"""
+import argparse
+
+from src.database.mongo_manager import db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate embedded product history")
+    parser.add_argument("--batch-size", type=int, default=500, help="products per batch")
+    args = parser.parse_args()
+
+    totals = db_manager.migrate_embedded_history(batch_size=args.batch_size)
+    print(f"\nMigrated {totals['products']} products, {totals['points']} history points.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Re-run product extraction over stored HTML snapshots, without scraping.
+
+Examples:
+    python replay_snapshots.py --platform amazon
+    python replay_snapshots.py --platform flipkart --query "wireless headphones" --save
+    python replay_snapshots.py --platform amazon --since 2026-10-01 --save --category electronics
+    python replay_snapshots.py --prune --max-age-days 14
+"""
+import argparse
+from datetime import datetime
+
+from src.scrapers import SUPPORTED_PLATFORMS, make_scraper
+from src.scrapers.snapshot_store import SnapshotStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay extraction over HTML snapshots")
+    parser.add_argument("--platform", choices=SUPPORTED_PLATFORMS)
+    parser.add_argument("--query", help="only snapshots of this search query")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO date/time lower bound")
+    parser.add_argument("--save", action="store_true", help="upsert the products into MongoDB")
+    parser.add_argument("--category", default="uncategorized", help="category for saved products")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--prune", action="store_true", help="apply snapshot retention and exit")
+    parser.add_argument("--max-age-days", type=int, help="override settings.snapshot_max_age_days")
+    parser.add_argument("--max-bytes", type=int, help="override settings.snapshot_max_bytes")
+    args = parser.parse_args()
+
+    if args.prune:
+        removed = SnapshotStore().prune(args.max_age_days, args.max_bytes)
+        print(f"Removed {removed['records']} records and {removed['blobs']} blobs "
+              f"({removed['bytes'] / 1e6:.1f} MB).")
+        return
+    if not args.platform:
+        parser.error("--platform is required unless --prune is given")
+
+    scraper = make_scraper(args.platform)
+    db_manager = None
+    if args.save:
+        from src.database.mongo_manager import db_manager
+
+    pages = products_total = 0
+    batch = []
+    for record, (card_count, products) in scraper.replay_snapshots(args.query, args.since):
+        pages += 1
+        products_total += len(products)
+        print(f"{record['timestamp']}  {record['query']!r} page {record['page']}: "
+              f"{len(products)}/{card_count} cards extracted")
+
+        if db_manager:
+            for product in products:
+                product["category"] = args.category
+            batch.extend(products)
+            if len(batch) >= args.batch_size:
+                db_manager.save_products_bulk(batch)
+                batch = []
+
+    if db_manager and batch:
+        db_manager.save_products_bulk(batch)
+
+    print(f"\nReplayed {pages} pages, {products_total} products extracted.")
+
+
+if __name__ == "__main__":
+    main()
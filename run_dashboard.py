@@ -1,10 +1,15 @@
+# Development server (single process, auto-reload off). For production use
+#   gunicorn -c gunicorn.conf.py src.api.app:app
 from src.api.app import app
+from src.api.jobs import recover_jobs
 
 if __name__ == "__main__":
     import os
     port = int(os.environ.get("PORT", 5000))
     print(f"\nRetail Intelligence Platform")
     print(f"-> Running on http://localhost:{port}\n")
+    # Pick up collection jobs left queued or running by a previous process
+    recover_jobs()
     app.run(
         debug=True,
         port=port,
@@ -6,20 +6,51 @@ Replaces the Streamlit UI with a proper client-server architecture.
 import sys
 import os
 import json
+import functools
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from flask import Flask, jsonify, request, send_file, send_from_directory
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    request,
+    send_file,
+    send_from_directory,
+    stream_with_context,
+)
 from flask_cors import CORS
 import io
 
 from src.api.chat import chat_bp
+from src.api.conditional import etag, request_data_version
+from src.api.jobs import jobs_bp, submit_collect_job
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.database.mongo_manager import db_manager
+from src.database.mongo_manager import db_manager, projection
 from src.agents.analysis_agent import ProductAnalysisAgent
 from src.utils.pdf_generator import ReportPDFGenerator
+from config.settings import settings
+from src.scrapers import SUPPORTED_PLATFORMS, make_scraper
+from src.scrapers.base_scraper import (
+    get_driver_pool_stats,
+    get_fetch_tier_stats,
+    get_page_ready_stats,
+)
+from src.utils.circuit_breaker import get_circuit_breaker_stats
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.response_cache import get_response_cache
+from src.utils.serialization import MongoJSONProvider
+from src.utils.exporters import (
+    EXPORT_FORMATS,
+    PRICE_HISTORY_COLUMNS,
+    PRODUCT_COLUMNS,
+    export_chunks,
+    fields_for,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,13 +61,33 @@ app = Flask(
     static_folder=os.path.join(os.path.dirname(__file__), "..", "ui", "static"),
     static_url_path="/static",
 )
+app.json = MongoJSONProvider(app)  # jsonify() encodes ObjectId/datetime natively
 CORS(app)
 
 # Singleton instances
 _agent = None
 _pdf_gen = None
 
+# Shared pool for per-platform scrapes in multi-platform search
+_search_executor = ThreadPoolExecutor(
+    max_workers=settings.search_max_workers, thread_name_prefix="search"
+)
+
 app.register_blueprint(chat_bp)
+app.register_blueprint(jobs_bp)
+
+
+def _reset_after_fork():
+    # Clients and pool threads created before a fork belong to the parent
+    global _agent, _pdf_gen, _search_executor
+    _agent = None
+    _pdf_gen = None
+    _search_executor = ThreadPoolExecutor(
+        max_workers=settings.search_max_workers, thread_name_prefix="search"
+    )
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
 
 def get_agent():
     global _agent
@@ -52,23 +103,56 @@ def get_pdf_gen():
 
 
 # ── Helper ─────────────────────────────────────────────────────────────────────
-def serialize_doc(doc):
-    """Convert MongoDB document to JSON-serializable dict."""
-    if doc is None:
-        return None
-    d = dict(doc)
-    # Convert ObjectId and datetime
-    for key, value in d.items():
-        if hasattr(value, '__str__') and type(value).__name__ == 'ObjectId':
-            d[key] = str(value)
-        elif isinstance(value, datetime):
-            d[key] = value.isoformat()
-        elif isinstance(value, list):
-            d[key] = [serialize_doc(item) if isinstance(item, dict) else
-                      (str(item) if type(item).__name__ == 'ObjectId' else
-                       (item.isoformat() if isinstance(item, datetime) else item))
-                      for item in value]
-    return d
+# Response headers @cached does not store with a body
+UNCACHED_HEADERS = {"Content-Type", "Content-Length", "Set-Cookie", "X-Cache"}
+
+
+def cached(*collections: str):
+    """
+    Serve a GET endpoint from the response cache, keyed by path, query
+    args and the write version of ``collections`` (MongoDB counters, so a
+    write from any worker invalidates it). Only 200 responses are stored.
+    Under @etag the same version read builds the tag and the key.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return view(*args, **kwargs)
+            try:
+                version = request_data_version(*collections)
+            except Exception as e:
+                logger.warning(f"⚠️ Response cache bypassed for {request.path}: {e}")
+                return view(*args, **kwargs)
+
+            # The version is read before the query, so a write racing with
+            # this request can only make the stored entry unreachable
+            key, hit = cache.get(request.path, request.args.items(multi=True), version)
+            if hit is not None:
+                response = app.response_class(
+                    hit["body"], status=hit["status"], mimetype=hit["mimetype"],
+                    headers=hit["headers"],
+                )
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, {
+                    "status": response.status_code,
+                    "mimetype": response.mimetype,
+                    # Content-Type/-Length are rebuilt from mimetype and body
+                    "headers": [
+                        (name, value) for name, value in response.headers.items()
+                        if name not in UNCACHED_HEADERS
+                    ],
+                    "body": response.get_data(),
+                })
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
 
 
 # ── Serve Frontend ─────────────────────────────────────────────────────────────
@@ -85,6 +169,8 @@ def serve_ui_file(filename):
 
 # ── Dashboard / Stats ──────────────────────────────────────────────────────────
 @app.route("/api/stats")
+@etag("products", "reports", "stats")
+@cached("products", "reports", "stats")
 def get_stats():
     try:
         stats = db_manager.get_database_stats()
@@ -93,11 +179,21 @@ def get_stats():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/stats/rebuild", methods=["POST"])
+def rebuild_stats():
+    """Recount the stats counters from the collections (reconciliation)"""
+    try:
+        return jsonify(db_manager.rebuild_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/dashboard/recent")
+@cached("products")
 def get_recent_activity():
     try:
         limit = int(request.args.get("limit", 10))
-        products = db_manager.get_all_products(limit=limit)
+        products = db_manager.get_all_products(limit=limit, profile="summary")
         data = []
         for p in products:
             data.append({
@@ -123,106 +219,138 @@ def collect_data():
 
     if not search_query:
         return jsonify({"error": "search_query is required"}), 400
+    if platform not in SUPPORTED_PLATFORMS:
+        return jsonify({"error": f"Unknown platform: {platform}"}), 400
 
     try:
-        if platform == "amazon":
-            from src.scrapers.amazon_scraper import AmazonScraper
-            scraper = AmazonScraper()
-        elif platform == "flipkart":
-            from src.scrapers.flipkart_scraper import FlipkartScraper
-            scraper = FlipkartScraper()
-
-        else:
-            return jsonify({"error": f"Unknown platform: {platform}"}), 400
-
-        products = scraper.search_products(search_query, max_results=max_results)
-
-        if not products:
-            return jsonify({"error": "No products found", "products": [], "stats": {}}), 200
-
-        for product in products:
-            product["category"] = category
-
-        results = db_manager.save_products_bulk(products)
-
-        # Return simplified product list
-        simplified = []
-        for p in products:
-            simplified.append({
-                "title": p.get("title", "Unknown"),
-                "price": p.get("price"),
-                "rating": p.get("rating"),
-                "platform": p.get("platform", platform).upper(),
-            })
-
-        return jsonify({
-            "success": True,
-            "stats": results,
-            "products": simplified,
-            "total": len(products),
+        # Scrape + ingest run on the job workers; poll GET /api/jobs/<id>
+        job_id = submit_collect_job({
+            "search_query": search_query,
+            "platform": platform,
+            "category": category,
+            "max_results": max_results,
         })
+        return jsonify({
+            "job_id": job_id,
+            "state": "queued",
+            "status_url": f"/api/jobs/{job_id}",
+        }), 202
     except Exception as e:
         logger.error(f"Collection error: {e}")
         return jsonify({"error": str(e)}), 500
 
 
 # ── Products ───────────────────────────────────────────────────────────────────
+def _product_filters() -> dict:
+    """query_products/iter_products filters from the request's query args"""
+    def number(name):
+        value = request.args.get(name)
+        return float(value) if value not in (None, "") else None
+
+    platform = request.args.get("platform", "all").lower()
+    category = request.args.get("category", "all").lower()
+    return {
+        "platform": None if platform == "all" else platform,
+        "category": None if category == "all" else category,
+        "view": request.args.get("view", "all"),
+        "min_price": number("min_price"),
+        "max_price": number("max_price"),
+        "min_rating": number("min_rating"),
+    }
+
+
 @app.route("/api/products")
+@etag("products")
+@cached("products")
 def get_products():
+    """
+    One page of products, newest first (trending: best rated first).
+    Query args: platform, category, view (all/price_drops/trending),
+    min_price, max_price, min_rating, limit and cursor (the previous
+    page's next_cursor).
+    """
     try:
-        platform = request.args.get("platform", "all").lower()
-        category = request.args.get("category", "all").lower()
-        view = request.args.get("view", "all")
-        limit = int(request.args.get("limit", 100))
-
-        if view == "price_drops":
-            products = db_manager.get_price_drops(min_percent=5.0)
-        elif view == "trending":
-            products = db_manager.get_trending_products(limit=limit)
-        elif platform != "all":
-            products = db_manager.get_products_by_platform(platform)
-        else:
-            products = db_manager.get_all_products(limit=limit)
-
-        if category != "all":
-            products = [p for p in products if p.get("category", "").lower() == category]
-
-        return jsonify([serialize_doc(p) for p in products])
+        limit = int(request.args.get("limit", settings.products_page_size))
+        limit = max(1, min(limit, settings.products_page_max))
+
+        products, next_cursor = db_manager.query_products(
+            **_product_filters(),
+            limit=limit,
+            cursor=request.args.get("cursor") or None,
+            profile="table",
+        )
+        return jsonify({
+            "products": products,
+            "next_cursor": next_cursor,
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _search_platform(platform: str, search_query: str, max_results: int, category: str):
+    """Scrape and save one platform; runs on the search executor."""
+    start = time.monotonic()
+    scraper = make_scraper(platform)
+    products = scraper.search_products(search_query, max_results)
+    scraped = time.monotonic()
+
+    if products:
+        for p in products:
+            p["category"] = category
+        db_manager.save_products_bulk(products)
+    saved = time.monotonic()
+
+    timings = {
+        "scrape_seconds": round(scraped - start, 3),
+        "save_seconds": round(saved - scraped, 3),
+        "total_seconds": round(saved - start, 3),
+    }
+    return products, timings
+
+
 @app.route("/api/products/search", methods=["POST"])
 def multi_platform_search():
     body = request.get_json() or {}
     search_query = body.get("search_query", "").strip()
-    max_results = int(body.get("max_results", 5))
     category = body.get("category", "electronics").lower()
     platforms = body.get("platforms", ["amazon", "flipkart"])
+    try:
+        max_results = int(body.get("max_results", 5))
+        deadline = float(body.get("deadline_seconds", settings.search_deadline_seconds))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid max_results/deadline_seconds: {e}"}), 400
 
     if not search_query:
         return jsonify({"error": "search_query is required"}), 400
+    if not deadline > 0:  # also rejects NaN
+        return jsonify({"error": "deadline_seconds must be positive"}), 400
+    deadline = min(deadline, settings.search_deadline_max_seconds)
 
     results = {}
     errors = {}
+    timings = {}
 
-    for platform in platforms:
+    # Run every platform concurrently; the slowest one no longer adds to the others
+    futures = {
+        platform: _search_executor.submit(
+            _search_platform, platform, search_query, max_results, category
+        )
+        for platform in dict.fromkeys(platforms)
+        if platform in SUPPORTED_PLATFORMS
+    }
+    wait(futures.values(), timeout=deadline)
+
+    for platform, future in futures.items():
+        if not future.done():
+            # Left running in the background; its products are still saved
+            errors[platform] = f"Timed out after {deadline:g}s"
+            timings[platform] = {"timed_out": True}
+            continue
         try:
-            if platform == "amazon":
-                from src.scrapers.amazon_scraper import AmazonScraper
-                scraper = AmazonScraper()
-            elif platform == "flipkart":
-                from src.scrapers.flipkart_scraper import FlipkartScraper
-                scraper = FlipkartScraper()
-
-            else:
-                continue
-
-            products = scraper.search_products(search_query, max_results)
+            products, timings[platform] = future.result()
             if products:
-                for p in products:
-                    p["category"] = category
-                db_manager.save_products_bulk(products)
                 results[platform] = [{
                     "title": p.get("title", "Unknown"),
                     "price": p.get("price"),
@@ -237,6 +365,7 @@ def multi_platform_search():
     return jsonify({
         "results": results,
         "errors": errors,
+        "timings": timings,
         "summary": {
             "total": sum(len(v) for v in results.values()),
             "platforms_searched": len(results),
@@ -248,19 +377,42 @@ def multi_platform_search():
 
 
 @app.route("/api/products/price-drops")
+@cached("products")
 def get_price_drops():
     try:
         min_percent = float(request.args.get("min_percent", 10.0))
-        products = db_manager.get_price_drops(min_percent=min_percent)
-        return jsonify([serialize_doc(p) for p in products])
+        products = db_manager.get_price_drops(min_percent=min_percent, profile="table")
+        return jsonify(products)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/products/<unique_id>/price-history")
+@cached("products")
+def get_price_history(unique_id):
+    try:
+        start = request.args.get("start")
+        end = request.args.get("end")
+        points = db_manager.get_price_history(
+            unique_id,
+            start=datetime.fromisoformat(start) if start else None,
+            end=datetime.fromisoformat(end) if end else None,
+        )
+        return jsonify({
+            "unique_id": unique_id,
+            "points": [{"timestamp": p["timestamp"].isoformat(), "price": p["price"]} for p in points],
+        })
+    except ValueError as e:
+        return jsonify({"error": f"Invalid start/end: {e}"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/products/price-analytics")
+@cached("products")
 def get_price_analytics():
     try:
-        products = db_manager.get_all_products(limit=200)
+        products = db_manager.get_all_products(limit=200, profile="table")
         prices = [p.get("current_price") for p in products if p.get("current_price") is not None]
         price_increases = [p for p in products if p.get("price_trend") == "up"]
 
@@ -271,13 +423,81 @@ def get_price_analytics():
             "max_price": max(prices) if prices else 0,
             "price_drops_count": sum(1 for p in products if p.get("price_trend") == "down"),
             "price_increases_count": len(price_increases),
-            "price_increases": [serialize_doc(p) for p in sorted(price_increases, key=lambda x: x.get("price_change_percent", 0), reverse=True)[:20]],
+            "price_increases": sorted(price_increases, key=lambda x: x.get("price_change_percent", 0), reverse=True)[:20],
             "price_distribution": prices[:100],
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# ── Export ─────────────────────────────────────────────────────────────────────
+def _export_batch_size() -> int:
+    """Rows per cursor batch and per encoded chunk (?batch_size=)"""
+    batch_size = int(request.args.get("batch_size", settings.export_batch_size))
+    return max(1, min(batch_size, settings.export_batch_max))
+
+
+def _export_response(docs, columns, name: str, batch_size: int):
+    """Stream ``docs`` in the requested format (?format=ndjson|csv|parquet)"""
+    fmt = request.args.get("format", "ndjson").lower()
+    chunks = export_chunks(docs, columns, fmt, batch_size)
+    mimetype, ext = EXPORT_FORMATS[fmt]
+    filename = f"{name}_{datetime.now():%Y%m%d_%H%M%S}.{ext}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@app.route("/api/export/products")
+def export_products():
+    """
+    Every product matching the /api/products filters (platform, category,
+    view, min_price, max_price, min_rating) as NDJSON, CSV or Parquet,
+    streamed batch_size rows at a time.
+    """
+    try:
+        batch_size = _export_batch_size()
+        docs = db_manager.iter_products(
+            **_product_filters(),
+            fields=fields_for(PRODUCT_COLUMNS),
+            batch_size=batch_size,
+        )
+        return _export_response(docs, PRODUCT_COLUMNS, "products", batch_size)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/export/price-history")
+def export_price_history():
+    """
+    Price/rating history points, optionally for one unique_id or
+    platform and within start/end (ISO dates), streamed like
+    /api/export/products.
+    """
+    try:
+        start = request.args.get("start")
+        end = request.args.get("end")
+        platform = request.args.get("platform", "all").lower()
+        batch_size = _export_batch_size()
+        docs = db_manager.iter_history(
+            unique_id=request.args.get("unique_id") or None,
+            platform=None if platform == "all" else platform,
+            start=datetime.fromisoformat(start) if start else None,
+            end=datetime.fromisoformat(end) if end else None,
+            fields=fields_for(PRICE_HISTORY_COLUMNS),
+            batch_size=batch_size,
+        )
+        return _export_response(docs, PRICE_HISTORY_COLUMNS, "price_history", batch_size)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # ── AI Analysis ────────────────────────────────────────────────────────────────
 @app.route("/api/analysis/quick", methods=["POST"])
 def run_quick_analysis():
@@ -292,7 +512,7 @@ def run_quick_analysis():
         if category != "all":
             query["category"] = category.lower()
 
-        products = list(db_manager.products.find(query))
+        products = list(db_manager.products.find(query, projection("summary")))
 
         if not products:
             return jsonify({"error": "No products found for the selected filters"}), 404
@@ -339,7 +559,7 @@ def run_deep_analysis():
         if category != "all":
             query["category"] = category.lower()
 
-        products = list(db_manager.products.find(query))
+        products = list(db_manager.products.find(query, projection("summary")))
 
         if not products:
             return jsonify({"error": "No products found for the selected filters"}), 404
@@ -372,12 +592,13 @@ def run_deep_analysis():
 
 # ── Reports ────────────────────────────────────────────────────────────────────
 @app.route("/api/reports")
+@etag("reports")
 def get_reports():
     try:
         reports = list(db_manager.reports.find(
             {"report_type": {"$in": ["quick_analysis", "deep_analysis"]}}
         ).sort("generated_at", -1).limit(50))
-        return jsonify([serialize_doc(r) for r in reports])
+        return jsonify(reports)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -443,5 +664,33 @@ def health():
     return jsonify({"status": "ok", "timestamp": datetime.now().isoformat()})
 
 
+@app.route("/api/health/scrapers")
+def scraper_health():
+    """Per-domain circuit breakers, fetch tiers, rate limits and driver pools"""
+    breakers = get_circuit_breaker_stats()
+    degraded = sorted(d for d, b in breakers.items() if b["state"] != "closed")
+    return jsonify(
+        {
+            "status": "degraded" if degraded else "ok",
+            "degraded_domains": degraded,
+            "circuit_breakers": breakers,
+            "fetch_tiers": get_fetch_tier_stats(),
+            "rate_limits": get_rate_limiter().stats(),
+            "driver_pools": get_driver_pool_stats(),
+            "page_ready": get_page_ready_stats(),
+            "timestamp": datetime.now().isoformat(),
+        }
+    )
+
+
+@app.route("/api/health/cache")
+def cache_health():
+    """Response cache hit/miss counts per route"""
+    cache = get_response_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **cache.stats()})
+
+
 if __name__ == "__main__":
     app.run(debug=True, port=5000, host="0.0.0.0")
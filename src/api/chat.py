@@ -5,12 +5,15 @@
 #   app.register_blueprint(chat_bp)
 
 import json
+import os
 import logging
 from datetime import datetime
 from flask import Blueprint, jsonify, request
 from bson import ObjectId
 from google import genai
 from src.database.mongo_manager import db_manager
+from src.api.conditional import etag
+from src.utils.serialization import to_jsonable
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -27,25 +30,13 @@ def get_gemini():
     return _gemini_client
 
 
-# ── Helper: serialize ObjectId / datetime ─────────────────────────────────────
-def _clean(doc: dict) -> dict:
-    out = {}
-    for k, v in doc.items():
-        if isinstance(v, ObjectId):
-            out[k] = str(v)
-        elif isinstance(v, datetime):
-            out[k] = v.isoformat()
-        elif isinstance(v, dict):
-            out[k] = _clean(v)
-        elif isinstance(v, list):
-            out[k] = [
-                _clean(i) if isinstance(i, dict)
-                else (str(i) if isinstance(i, ObjectId) else i)
-                for i in v
-            ]
-        else:
-            out[k] = v
-    return out
+def _reset_after_fork():
+    # The client's HTTP connections belong to the parent process
+    global _gemini_client
+    _gemini_client = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 # ── Helper: build a readable text summary of a report ────────────────────────
@@ -167,6 +158,7 @@ Rules:
 # Used by the frontend to populate the report selector
 # ══════════════════════════════════════════════════════════════════════════════
 @chat_bp.route("/reports", methods=["GET"])
+@etag("reports")
 def list_reports():
     try:
         raw = list(
@@ -237,7 +229,7 @@ def chat():
     if not report:
         return jsonify({"error": f"No report found with id: {report_id}"}), 404
 
-    report = _clean(report)
+    report = to_jsonable(report)
 
     # ── Convert report to readable text ───────────────────────────────────
     report_text = _report_to_text(report)
@@ -267,7 +259,8 @@ def chat():
 # ENDPOINT 3 — POST /api/chat/upload-pdf
 # Accepts a multipart/form-data PDF upload, runs RAG ingestion,
 # returns { session_id, filename, page_count, chunk_count }
-# Nothing is persisted to MongoDB or disk — entirely ephemeral.
+# The embedded chunks are kept in MongoDB until pdf_session_ttl_seconds so
+# every server worker can answer the session; nothing is written to disk.
 # ══════════════════════════════════════════════════════════════════════════════
 @chat_bp.route("/upload-pdf", methods=["POST"])
 def upload_pdf():
@@ -332,7 +325,7 @@ def chat_pdf():
 
 # ══════════════════════════════════════════════════════════════════════════════
 # ENDPOINT 5 — DELETE /api/chat/pdf/<session_id>
-# Immediately frees the in-memory session (optional — called on tab clear)
+# Immediately drops the session and its stored chunks (optional — called on tab clear)
 # ══════════════════════════════════════════════════════════════════════════════
 @chat_bp.route("/pdf/<session_id>", methods=["DELETE"])
 def delete_pdf_session(session_id):
@@ -0,0 +1,64 @@
+# src/api/conditional.py
+"""
+Conditional GET support for read endpoints.
+
+ETags are derived from the request URL and the database write counters
+(MongoDBManager.data_version), so checking If-None-Match costs a single
+_id lookup: a matching request gets 304 Not Modified without running the
+endpoint's query or serializing anything. The lookup is shared with the
+response cache (see request_data_version), so a tag and the cached body
+sent with it always belong to the same version.
+"""
+import functools
+import hashlib
+import logging
+
+from flask import current_app, g, request
+
+from src.database.mongo_manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+
+def request_data_version(*collections: str):
+    """db_manager.data_version(*collections), read at most once per request"""
+    versions = g.setdefault("data_versions", {})
+    if collections not in versions:
+        versions[collections] = db_manager.data_version(*collections)
+    return versions[collections]
+
+
+def make_etag(path: str, args, version) -> str:
+    """Opaque tag for a URL (path and sorted query args) at a data version"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(args))
+    return hashlib.sha1(f"{path}?{query}|{version}".encode("utf-8")).hexdigest()[:20]
+
+
+def etag(*collections: str):
+    """
+    Tag a GET endpoint's 200 responses with the write version of
+    ``collections`` and answer matching If-None-Match requests with 304
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                tag = make_etag(
+                    request.path, request.args.items(multi=True), request_data_version(*collections)
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ No ETag for {request.path}: {e}")
+                return view(*args, **kwargs)
+
+            if request.if_none_match.contains(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(tag)
+            # Let browsers keep the body but always revalidate it
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,166 @@
+# src/api/jobs.py
+# Background collection jobs
+# POST /api/collect enqueues a job here and returns immediately; a bounded
+# worker pool runs the scrape + ingest and records progress in the MongoDB
+# `jobs` collection, which GET /api/jobs/<id> reads back.
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import Blueprint, jsonify
+from bson import ObjectId
+from bson.errors import InvalidId
+from src.database.mongo_manager import db_manager
+from src.scrapers import make_scraper
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+_executor = ThreadPoolExecutor(max_workers=settings.job_workers, thread_name_prefix="job")
+
+
+def _reset_after_fork():
+    # Pool threads are not copied into a forked child; start with a fresh pool
+    global _executor
+    _executor = ThreadPoolExecutor(max_workers=settings.job_workers, thread_name_prefix="job")
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ── Queueing ──────────────────────────────────────────────────────────────────
+def submit_collect_job(params: dict) -> str:
+    """Persist a collect job and hand it to the worker pool."""
+    job_id = db_manager.create_job("collect", params)
+    _executor.submit(_run_job, job_id)
+    logger.info(f"📥 Queued collect job {job_id}: {params.get('search_query')}")
+    return job_id
+
+
+def recover_jobs():
+    """
+    Requeue jobs interrupted by a restart and schedule every queued job.
+    Call once per serving process (run_dashboard.py, gunicorn post_fork),
+    never in a process that is about to fork.
+    """
+    try:
+        job_ids = db_manager.requeue_stale_jobs(settings.job_stale_seconds)
+    except Exception as e:
+        logger.error(f"Job recovery failed: {e}")
+        return
+    for job_id in job_ids:
+        _executor.submit(_run_job, job_id)
+    if job_ids:
+        logger.info(f"Scheduled {len(job_ids)} queued jobs after startup")
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+def _run_job(job_id: str):
+    # Claim is atomic, so a job scheduled by two processes only runs once
+    job = db_manager.claim_job(job_id)
+    if not job:
+        return
+
+    queued_seconds = (job["started_at"] - job["created_at"]).total_seconds()
+    timings = {"queued_seconds": round(queued_seconds, 3)}
+    try:
+        result = _collect(job_id, job["params"], timings)
+        db_manager.update_job(job_id, {"state": "succeeded", "result": result, "timings": timings})
+        logger.info(f"✅ Job {job_id} finished: {result['total']} products")
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        db_manager.update_job(job_id, {"state": "failed", "error": str(e), "timings": timings})
+
+
+def _collect(job_id: str, params: dict, timings: dict) -> dict:
+    """Scrape one platform, ingesting products in micro-batches as they arrive."""
+    platform = params["platform"]
+    scraper = make_scraper(platform)
+    if scraper is None:
+        raise ValueError(f"Unknown platform: {platform}")
+
+    db_manager.update_job(job_id, {"progress": {"stage": "scrape", "scraped": 0, "saved": 0}})
+    summaries = []
+
+    def tagged_products():
+        # Products flow straight from the scraper into micro-batch writes
+        for product in scraper.iter_products(params["search_query"], max_results=params["max_results"]):
+            product["category"] = params["category"]
+            summaries.append({
+                "title": product.get("title", "Unknown"),
+                "price": product.get("price"),
+                "rating": product.get("rating"),
+                "platform": product.get("platform", platform).upper(),
+            })
+            yield product
+
+    def on_batch(saved, stats):
+        if "first_saved_seconds" not in timings:
+            timings["first_saved_seconds"] = round(time.monotonic() - start, 3)
+        db_manager.update_job(job_id, {
+            "progress": {"stage": "scrape", "scraped": len(summaries), "saved": saved, "stats": stats},
+        })
+
+    start = time.monotonic()
+    stats = db_manager.save_products_stream(tagged_products(), on_batch=on_batch)
+    timings["collect_seconds"] = round(time.monotonic() - start, 3)
+    timings["total_seconds"] = round(timings["queued_seconds"] + timings["collect_seconds"], 3)
+
+    db_manager.update_job(job_id, {
+        "progress": {
+            "stage": "done",
+            "scraped": len(summaries),
+            "saved": stats["inserted"] + stats["updated"],
+        },
+    })
+
+    return {
+        "stats": stats,
+        "total": len(summaries),
+        "products": summaries,
+    }
+
+
+def _job_to_json(job: dict) -> dict:
+    def iso(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    return {
+        "job_id": str(job["_id"]),
+        "type": job.get("type"),
+        "state": job.get("state"),
+        "params": job.get("params", {}),
+        "progress": job.get("progress", {}),
+        "timings": job.get("timings", {}),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": iso(job.get("created_at")),
+        "started_at": iso(job.get("started_at")),
+        "finished_at": iso(job.get("finished_at")),
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# GET /api/jobs/<job_id>
+# Returns state, progress (stage, scraped count) and per-stage timings
+# ══════════════════════════════════════════════════════════════════════════════
+@jobs_bp.route("/<job_id>", methods=["GET"])
+def get_job(job_id):
+    try:
+        ObjectId(job_id)
+    except (InvalidId, TypeError):
+        return jsonify({"error": "Invalid job_id format"}), 400
+
+    try:
+        job = db_manager.get_job(job_id)
+    except Exception as e:
+        logger.error(f"get_job error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    if not job:
+        return jsonify({"error": f"No job found with id: {job_id}"}), 404
+    return jsonify(_job_to_json(job))
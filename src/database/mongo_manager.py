@@ -1,7 +1,17 @@
 # src/database/mongo_manager.py
-from pymongo import MongoClient, ASCENDING, DESCENDING
-from datetime import datetime
-from typing import List, Dict, Optional
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
+import base64
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from config.settings import settings
 import logging
 
@@ -9,22 +19,168 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Named field projections for product reads, lightest first.
+#   summary: dashboards and AI prompts
+#   table:   product lists, comparisons and price-drop cards
+#   full:    the whole document
+PRODUCT_PROJECTIONS: Dict[str, Optional[Dict]] = {
+    "summary": {
+        "_id": 0,
+        "unique_id": 1,
+        "platform": 1,
+        "title": 1,
+        "current_price": 1,
+        "current_rating": 1,
+        "price_trend": 1,
+        "last_seen": 1,
+    },
+    "table": {
+        "_id": 0,
+        "unique_id": 1,
+        "platform": 1,
+        "product_id": 1,
+        "title": 1,
+        "category": 1,
+        "url": 1,
+        "image_url": 1,
+        "current_price": 1,
+        "current_rating": 1,
+        "current_reviews": 1,
+        "price_trend": 1,
+        "price_change_percent": 1,
+        "lowest_price": 1,
+        "highest_price": 1,
+        "average_price": 1,
+        "times_scraped": 1,
+        "first_seen": 1,
+        "last_seen": 1,
+        "updated_at": 1,
+    },
+    "full": None,
+}
+
+
+def projection(profile: str) -> Optional[Dict]:
+    """Projection for a named profile (see PRODUCT_PROJECTIONS)"""
+    try:
+        return PRODUCT_PROJECTIONS[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown projection profile '{profile}', expected one of {sorted(PRODUCT_PROJECTIONS)}"
+        )
+
+
+
+def write_receipt_fields(write_id: ObjectId) -> Dict:
+    """
+    Projection reading back what one write did to a product: its receipt
+    in pending_writes, pushed atomically by that write as
+    {"w": write id, "new", "price", "rating": changed?, "prev", "trend": price_trend before/after}
+    """
+    return {
+        "unique_id": 1,
+        "platform": 1,
+        "category": 1,
+        "pending_writes": {"$elemMatch": {"w": write_id}},
+    }
+
+# Reports counted in the dashboard stats
+ANALYSIS_REPORT_TYPES = ("quick_analysis", "deep_analysis")
+
+# Filters for the /api/products views
+PRODUCT_VIEWS = {
+    "all": {},
+    "price_drops": {"price_trend": "down", "price_change_percent": {"$lt": -5.0}},
+    "trending": {"current_rating": {"$gte": 4.0}},
+}
+
+# Sort keys of a view ahead of the (updated_at, _id) keyset, all descending
+PRODUCT_VIEW_SORTS = {
+    "trending": ["current_rating"],
+}
+
+
+def encode_cursor(doc: Dict, lead: List[str] = ()) -> str:
+    """
+    Opaque keyset cursor pointing just past ``doc`` in (*lead, updated_at, _id)
+    order; ``lead`` holds a view's leading sort fields (PRODUCT_VIEW_SORTS)
+    """
+    data = {"u": doc["updated_at"].isoformat(), "i": str(doc["_id"])}
+    if lead:
+        data["k"] = [doc.get(field) for field in lead]
+    raw = json.dumps(data)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, lead: List[str] = ()) -> Tuple[datetime, ObjectId, List]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values = data.get("k", [])
+        if len(values) != len(lead):
+            raise ValueError("cursor is for another view")
+        return datetime.fromisoformat(data["u"]), ObjectId(data["i"]), values
+    except (ValueError, KeyError, TypeError, AttributeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+_last_write_time = datetime.min
+_write_time_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    """
+    Write timestamp at BSON (millisecond) precision, so it compares equal
+    once stored, and unique per call so *_changed_at identifies one write
+    """
+    global _last_write_time
+    now = datetime.now()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    with _write_time_lock:
+        if now <= _last_write_time:
+            now = _last_write_time + timedelta(milliseconds=1)
+        _last_write_time = now
+    return now
+
+
 class MongoDBManager:
     """Manages all MongoDB operations for retail intelligence"""
 
-    def __init__(self):
-        self.client = MongoClient(settings.mongodb_uri)
-        self.db = self.client["retail_intelligence"]
+    def __init__(self, mongodb_uri: Optional[str] = None, db_name: str = "retail_intelligence"):
+        self._uri = mongodb_uri or settings.mongodb_uri
+        self._db_name = db_name
+        self._connect()
+
+        # Create indexes for performance
+        self._create_indexes()
+        self._seed_stats()
+
+        logger.info("✅ MongoDB Manager initialized")
+
+    def _connect(self):
+        self.client = MongoClient(self._uri)
+        self.db = self.client[self._db_name]
 
         # Collections
         self.products = self.db["products"]
         self.price_history = self.db["price_history"]  # Separate collection for history
         self.reports = self.db["reports"]
+        self.jobs = self.db["jobs"]  # Background collection jobs
+        self.stats = self.db["stats"]  # Counters behind get_database_stats
+        self.pdf_chunks = self.db["pdf_chunks"]  # Embedded chunks of PDF chat uploads
 
-        # Create indexes for performance
-        self._create_indexes()
+    def reconnect_after_fork(self):
+        """
+        Give a forked child process its own client
 
-        logger.info("✅ MongoDB Manager initialized")
+        A MongoClient's pooled sockets and monitor threads belong to the
+        process that created it, so workers forked from a preloaded app
+        (gunicorn --preload) must not keep using the parent's client.
+        The parent's client is dropped, not closed: closing it here would
+        end sessions the parent still owns.
+        """
+        self._connect()
 
     def _create_indexes(self):
         """Create database indexes for better performance"""
@@ -35,14 +191,42 @@ class MongoDBManager:
             name="unique_product",
         )
 
+        # Batched existence checks in save_products_bulk
+        self.products.create_index("unique_id")
+
+        # Read-back of write receipts (see _after_write); empty between writes
+        self.products.create_index("pending_writes.w", sparse=True)
+
         # Index for querying by category and platform
         self.products.create_index([("category", ASCENDING), ("platform", ASCENDING)])
 
-        # Index for price history queries
+        # Keyset pagination in query_products: equality filters, then (updated_at, _id)
+        keyset = [("updated_at", DESCENDING), ("_id", DESCENDING)]
+        self.products.create_index(keyset)
+        self.products.create_index([("platform", ASCENDING), ("category", ASCENDING)] + keyset)
+        self.products.create_index([("category", ASCENDING)] + keyset)
+        self.products.create_index([("price_trend", ASCENDING)] + keyset)
+        self.products.create_index([("platform", ASCENDING)] + keyset)
+        # "trending" view: rating first
+        self.products.create_index([("current_rating", DESCENDING)] + keyset)
+
+        # Index for price history range queries
         self.price_history.create_index(
             [("unique_id", ASCENDING), ("timestamp", DESCENDING)]
         )
 
+        # Job lookups by state, and expiry of finished jobs
+        self.jobs.create_index([("state", ASCENDING), ("updated_at", ASCENDING)])
+        self.jobs.create_index(
+            "finished_at", expireAfterSeconds=settings.job_ttl_seconds
+        )
+
+        # PDF chat sessions: chunks in order, gone after pdf_session_ttl_seconds
+        self.pdf_chunks.create_index([("session_id", ASCENDING), ("i", ASCENDING)])
+        self.pdf_chunks.create_index(
+            "created_at", expireAfterSeconds=settings.pdf_session_ttl_seconds
+        )
+
         logger.info("✅ Database indexes created")
 
     def upsert_product(self, product_data: Dict) -> Dict:
@@ -64,33 +248,53 @@ class MongoDBManager:
 
         # Create unique identifier
         unique_id = f"{platform}_{product_id}"
+        timestamp = _now()
+        write_id = ObjectId()
+
+        if settings.product_upsert_mode == "pipeline":
+            # Single atomic write, no read-before-write; returns its own receipt
+            doc = self.products.find_one_and_update(
+                {"platform": platform, "product_id": product_id},
+                self._upsert_pipeline(product_data, unique_id, timestamp, write_id),
+                projection=write_receipt_fields(write_id),
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            receipts = doc.get("pending_writes") or [{}]
+            action = "inserted" if receipts[0].get("new") else "updated"
+            self._after_write([(unique_id, product_data)], timestamp, write_id, docs=[doc])
+            logger.info(f"✅ Product {action}: {product_data.get('title', 'Unknown')[:50]}")
+            return {"action": action, "unique_id": unique_id}
 
         # Check if product exists
         existing = self.products.find_one(
             {"platform": platform, "product_id": product_id}
         )
 
-        timestamp = datetime.now()
-
         if existing:
             # UPDATE existing product
-            result = self._update_existing_product(existing, product_data, timestamp)
+            spec = self._update_spec(existing, product_data, timestamp, write_id)
+            self.products.update_one({"_id": existing["_id"]}, spec)
             action = "updated"
         else:
             # INSERT new product
-            result = self._insert_new_product(product_data, unique_id, timestamp)
+            self.products.insert_one(
+                self._new_product_doc(product_data, unique_id, timestamp, write_id)
+            )
             action = "inserted"
 
+        self._after_write([(unique_id, product_data)], timestamp, write_id)
         logger.info(f"✅ Product {action}: {product_data.get('title', 'Unknown')[:50]}")
         return {"action": action, "unique_id": unique_id}
 
-    def _insert_new_product(
-        self, product_data: Dict, unique_id: str, timestamp: datetime
-    ) -> str:
-        """Insert a brand new product"""
+    def _new_product_doc(
+        self, product_data: Dict, unique_id: str, timestamp: datetime, write_id: ObjectId
+    ) -> Dict:
+        """Document for a product seen for the first time"""
 
         # Handle None price values
         price = product_data.get("price")
+        rating = product_data.get("rating")
 
         new_product = {
             # Unique identifier
@@ -104,43 +308,52 @@ class MongoDBManager:
             "image_url": product_data.get("image_url"),
             # Current state
             "current_price": price,
-            "current_rating": product_data.get("rating"),
+            "current_rating": rating,
             "current_reviews": product_data.get("reviews"),
             "in_stock": True,
             "last_seen": timestamp,
-            # Historical tracking
             "first_seen": timestamp,
-            "price_history": (
-                [{"timestamp": timestamp, "price": price}] if price is not None else []
-            ),  # Only add if price exists
-            "rating_history": (
-                [{"timestamp": timestamp, "rating": product_data.get("rating")}]
-                if product_data.get("rating") is not None
-                else []
-            ),  # Only add if rating exists
+            # Historical tracking - points live in the price_history collection
+            "price_changed_at": timestamp if price is not None else None,
+            "rating_changed_at": timestamp if rating is not None else None,
             # Computed metrics - handle None values
             "price_trend": "stable",
             "price_change_percent": 0.0,
-            "lowest_price": price if price is not None else None,
-            "highest_price": price if price is not None else None,
-            "average_price": price if price is not None else None,
+            "lowest_price": price,
+            "highest_price": price,
+            "average_price": price,
+            "price_sum": price if price is not None else 0,
+            "price_count": 1 if price is not None else 0,
             "times_scraped": 1,
             # Metadata
             "created_at": timestamp,
             "updated_at": timestamp,
+            "pending_writes": [{
+                "w": write_id,
+                "new": True,
+                "price": price is not None,
+                "rating": rating is not None,
+                "prev": None,
+                "trend": "stable",
+            }],
         }
+        return new_product
 
-        result = self.products.insert_one(new_product)
-        return str(result.inserted_id)
+    def _update_spec(
+        self, existing: Dict, new_data: Dict, timestamp: datetime, write_id: ObjectId
+    ) -> Dict:
+        """
+        Update document merging a new scrape into an existing product
 
-    def _update_existing_product(
-        self, existing: Dict, new_data: Dict, timestamp: datetime
-    ) -> str:
-        """Update an existing product with new scrape data - FIXED for None values"""
+        ``existing`` only needs current_price, current_rating, price_trend,
+        the price metrics and, for documents not yet migrated, the embedded
+        price_history prices. The receipt describes the change relative to
+        ``existing``, so it is only exact if nothing wrote the product since
+        it was read (merge mode is not safe for concurrent writers).
+        """
         updates = {
             "last_seen": timestamp,
             "updated_at": timestamp,
-            "times_scraped": existing.get("times_scraped", 0) + 1,
         }
 
         # Update current state
@@ -153,156 +366,928 @@ class MongoDBManager:
         if new_data.get("url"):
             updates["url"] = new_data["url"]
 
-        # Add to price history if price changed
         old_price = existing.get("current_price")
         new_price = new_data.get("price")
 
         # Only process price updates if new price is not None
         if new_price is not None and old_price != new_price:
-            # Add new price point
-            price_entry = {"timestamp": timestamp, "price": new_price}
-            self.products.update_one(
-                {"_id": existing["_id"]}, {"$push": {"price_history": price_entry}}
-            )
+            updates["price_changed_at"] = timestamp
+            updates["previous_trend"] = existing.get("price_trend")
+
+            # Running metrics; unmigrated documents are seeded from their embedded history
+            price_sum, price_count = existing.get("price_sum"), existing.get("price_count")
+            if price_sum is None or price_count is None:
+                prices = [
+                    p["price"] for p in existing.get("price_history", []) if p.get("price") is not None
+                ]
+                price_sum, price_count = sum(prices), len(prices)
+
+            known = [p for p in (existing.get("lowest_price"), existing.get("highest_price")) if p is not None]
+            updates["lowest_price"] = min(known + [new_price])
+            updates["highest_price"] = max(known + [new_price])
+            updates["price_sum"] = price_sum + new_price
+            updates["price_count"] = price_count + 1
+            updates["average_price"] = updates["price_sum"] / updates["price_count"]
+
+            # Calculate price trend (only if old price exists and is not None)
+            if old_price is not None:
+                if new_price < old_price:
+                    updates["price_trend"] = "down"
+                elif new_price > old_price:
+                    updates["price_trend"] = "up"
+                updates["price_change_percent"] = (
+                    ((new_price - old_price) / old_price) * 100 if old_price else 0.0
+                )
 
-            # Recalculate price metrics - handle None values safely
-            price_history = existing.get("price_history", [])
-            all_prices = [
-                p["price"] for p in price_history if p.get("price") is not None
-            ]
-            all_prices.append(new_price)
-
-            # Filter out any None values (just in case)
-            all_prices = [p for p in all_prices if p is not None]
-
-            if all_prices:  # Only calculate if we have valid prices
-                updates["lowest_price"] = min(all_prices)
-                updates["highest_price"] = max(all_prices)
-                updates["average_price"] = sum(all_prices) / len(all_prices)
-
-                # Calculate price trend (only if old price exists and is not None)
-                if old_price is not None:
-                    if new_price < old_price:
-                        updates["price_trend"] = "down"
-                        updates["price_change_percent"] = (
-                            (new_price - old_price) / old_price
-                        ) * 100
-                    elif new_price > old_price:
-                        updates["price_trend"] = "up"
-                        updates["price_change_percent"] = (
-                            (new_price - old_price) / old_price
-                        ) * 100
-                    else:
-                        updates["price_trend"] = "stable"
-                        updates["price_change_percent"] = 0.0
-
-        # Add to rating history if rating changed
-        old_rating = existing.get("current_rating")
         new_rating = new_data.get("rating")
+        if new_rating is not None and existing.get("current_rating") != new_rating:
+            updates["rating_changed_at"] = timestamp
+
+        spec = {"$set": updates, "$inc": {"times_scraped": 1}}
+        if "price_changed_at" in updates or "rating_changed_at" in updates:
+            spec["$push"] = {"pending_writes": {
+                "w": write_id,
+                "new": False,
+                "price": "price_changed_at" in updates,
+                "rating": "rating_changed_at" in updates,
+                "prev": existing.get("price_trend"),
+                "trend": updates.get("price_trend", existing.get("price_trend")),
+            }}
+        return spec
+
+    def _upsert_pipeline(
+        self, product_data: Dict, unique_id: str, timestamp: datetime, write_id: ObjectId
+    ) -> List[Dict]:
+        """
+        Aggregation-pipeline update that inserts or merges a product in one
+        atomic write, computing the same fields as the read-merge path.
+
+        Extremes use $min/$max, the average comes from running
+        price_sum/price_count, and trend/change percent are derived from
+        the stored current_price on the server. Documents written before
+        the running sums existed are seeded from their price_history once.
+        price_changed_at/rating_changed_at are set to ``timestamp`` when
+        the value changed, and previous_trend keeps the trend it replaced.
+        A write that inserts the product or changes its price or rating also
+        pushes a receipt under ``write_id`` (see write_receipt_fields),
+        computed from the document it actually updated, so callers can tell
+        which history points and stats changes it made even when other
+        writers update the product right after.
+        """
+        price = product_data.get("price")
+        rating = product_data.get("rating")
+        reviews = product_data.get("reviews")
+        url = product_data.get("url")
+
+        def lit(value):
+            return {"$literal": value}
+
+        def on_insert(value, field):
+            # Value for a new document, otherwise keep the stored field
+            return {"$cond": ["$_new", lit(value), f"${field}"]}
+
+        fields = {
+            "unique_id": lit(unique_id),
+            "title": on_insert(product_data.get("title"), "title"),
+            "category": on_insert(product_data.get("category", "uncategorized"), "category"),
+            "image_url": on_insert(product_data.get("image_url"), "image_url"),
+            "in_stock": on_insert(True, "in_stock"),
+            "first_seen": on_insert(timestamp, "first_seen"),
+            "created_at": on_insert(timestamp, "created_at"),
+            "current_price": lit(price) if price is not None else on_insert(None, "current_price"),
+            "current_rating": lit(rating) if rating is not None else on_insert(None, "current_rating"),
+            "current_reviews": lit(reviews) if reviews else on_insert(reviews, "current_reviews"),
+            "url": lit(url) if url else on_insert(url, "url"),
+            "last_seen": lit(timestamp),
+            "updated_at": lit(timestamp),
+            "times_scraped": {"$add": [{"$ifNull": ["$times_scraped", 0]}, 1]},
+            "price_changed_at": on_insert(None, "price_changed_at"),
+            "rating_changed_at": on_insert(None, "rating_changed_at"),
+            "previous_trend": on_insert(None, "previous_trend"),
+            "price_sum": "$_sum",
+            "price_count": "$_count",
+            "lowest_price": on_insert(None, "lowest_price"),
+            "highest_price": on_insert(None, "highest_price"),
+            "average_price": on_insert(None, "average_price"),
+            "price_trend": on_insert("stable", "price_trend"),
+            "price_change_percent": on_insert(0.0, "price_change_percent"),
+        }
+
+        if rating is not None:
+            fields["rating_changed_at"] = {
+                "$cond": ["$_rating_changed", lit(timestamp), "$rating_changed_at"]
+            }
+
+        if price is not None:
+            def if_changed(then, otherwise):
+                return {"$cond": ["$_price_changed", then, otherwise]}
+
+            new_sum = {"$add": ["$_sum", price]}
+            new_count = {"$add": ["$_count", 1]}
+            change = {
+                "$cond": [
+                    {"$gt": ["$_old_price", 0]},
+                    {"$multiply": [{"$divide": [{"$subtract": [price, "$_old_price"]}, "$_old_price"]}, 100]},
+                    0.0,
+                ]
+            }
+            # A changed price differs from the old one, so the trend is up or down
+            has_old = {"$and": ["$_price_changed", {"$ne": ["$_old_price", None]}]}
+
+            fields.update({
+                "price_changed_at": if_changed(lit(timestamp), "$price_changed_at"),
+                "previous_trend": if_changed("$price_trend", "$previous_trend"),
+                "price_sum": if_changed(new_sum, "$_sum"),
+                "price_count": if_changed(new_count, "$_count"),
+                "lowest_price": if_changed({"$min": ["$lowest_price", price]}, "$lowest_price"),
+                "highest_price": if_changed({"$max": ["$highest_price", price]}, "$highest_price"),
+                "average_price": if_changed({"$divide": [new_sum, new_count]}, "$average_price"),
+                "price_trend": {
+                    "$cond": [
+                        has_old,
+                        {"$cond": [{"$lt": [price, "$_old_price"]}, "down", "up"]},
+                        on_insert("stable", "price_trend"),
+                    ]
+                },
+                "price_change_percent": {
+                    "$cond": [has_old, change, on_insert(0.0, "price_change_percent")]
+                },
+            })
+
+        return [
+            {"$set": {
+                "_new": {"$eq": [{"$ifNull": ["$created_at", None]}, None]},
+                "_old_price": {"$ifNull": ["$current_price", None]},
+                "_price_changed": (
+                    {"$ne": [{"$ifNull": ["$current_price", None]}, price]}
+                    if price is not None else {"$literal": False}
+                ),
+                "_rating_changed": (
+                    {"$ne": [{"$ifNull": ["$current_rating", None]}, rating]}
+                    if rating is not None else {"$literal": False}
+                ),
+                "_old_trend": {"$ifNull": ["$price_trend", None]},
+                "_sum": {"$ifNull": ["$price_sum", {"$sum": {"$ifNull": ["$price_history.price", []]}}]},
+                "_count": {"$ifNull": ["$price_count", {"$size": {"$ifNull": ["$price_history", []]}}]},
+            }},
+            {"$set": fields},
+            {"$set": {
+                "pending_writes": {
+                    "$cond": [
+                        {"$or": ["$_new", "$_price_changed", "$_rating_changed"]},
+                        {"$concatArrays": [
+                            {"$ifNull": ["$pending_writes", []]},
+                            # One receipt, built around this write's id
+                            {"$map": {"input": [write_id], "as": "w", "in": {
+                                "w": "$$w",
+                                "new": "$_new",
+                                "price": "$_price_changed",
+                                "rating": "$_rating_changed",
+                                "prev": "$_old_trend",
+                                "trend": "$price_trend",
+                            }}},
+                        ]},
+                        {"$ifNull": ["$pending_writes", []]},
+                    ]
+                },
+            }},
+            {"$project": {
+                "_new": 0, "_old_price": 0, "_price_changed": 0, "_rating_changed": 0,
+                "_old_trend": 0, "_sum": 0, "_count": 0,
+            }},
+        ]
+
+    # ── Price / rating history ────────────────────────────────────────────────
+    def _history_point(
+        self, unique_id: str, product_data: Dict, timestamp: datetime, receipt: Dict
+    ) -> Optional[Dict]:
+        """History document for the values a write changed (per its receipt), or None"""
+        point = {"unique_id": unique_id, "timestamp": timestamp}
+        if receipt.get("price"):
+            point["price"] = product_data["price"]
+        if receipt.get("rating"):
+            point["rating"] = product_data["rating"]
+        return point if len(point) > 2 else None
+
+    def _record_history(self, points: List[Optional[Dict]]):
+        points = [p for p in points if p]
+        if points:
+            self.price_history.insert_many(points, ordered=False)
+
+    def get_price_history(
+        self, unique_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Price points of a product, oldest first
+
+        Args:
+            unique_id: "<platform>_<product_id>"
+            start: Inclusive lower bound on timestamp
+            end: Exclusive upper bound on timestamp
+
+        Returns:
+            [{"timestamp", "price"}] for each recorded price change
+        """
+        return self._history(unique_id, "price", start, end)
+
+    def get_rating_history(
+        self, unique_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict]:
+        """Rating points of a product, oldest first (same bounds as get_price_history)"""
+        return self._history(unique_id, "rating", start, end)
+
+    def _history(
+        self, unique_id: str, field: str, start: Optional[datetime], end: Optional[datetime]
+    ) -> List[Dict]:
+        query = {"unique_id": unique_id, field: {"$exists": True}}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gte"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        return list(
+            self.price_history.find(query, {"_id": 0, "timestamp": 1, field: 1}).sort(
+                "timestamp", ASCENDING
+            )
+        )
 
-        if new_rating is not None and old_rating != new_rating:
-            rating_entry = {"timestamp": timestamp, "rating": new_rating}
-            self.products.update_one(
-                {"_id": existing["_id"]}, {"$push": {"rating_history": rating_entry}}
+    def migrate_embedded_history(self, batch_size: int = 500) -> Dict:
+        """
+        Move embedded price_history/rating_history arrays into the
+        price_history collection, a batch of products at a time.
+
+        Safe to run while scrapers are writing, and to re-run after an
+        interruption: migrated points get deterministic _ids, so points
+        already copied are skipped, and a product's arrays are only
+        removed once its points are stored.
+
+        Returns:
+            {"products": migrated products, "points": history points copied}
+        """
+        totals = {"products": 0, "points": 0}
+        last_id = None
+
+        while True:
+            query = {
+                "$or": [
+                    {"price_history": {"$exists": True}},
+                    {"rating_history": {"$exists": True}},
+                ]
+            }
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = list(
+                self.products.find(
+                    query,
+                    {"unique_id": 1, "price_history": 1, "rating_history": 1, "price_sum": 1, "price_count": 1},
+                )
+                .sort("_id", ASCENDING)
+                .limit(batch_size)
             )
+            if not docs:
+                break
+            last_id = docs[-1]["_id"]
+
+            points = []
+            operations = []
+            for doc in docs:
+                unique_id = doc["unique_id"]
+                prices = []
+                for entry in doc.get("price_history") or []:
+                    if entry.get("price") is None:
+                        continue
+                    prices.append(entry["price"])
+                    points.append({
+                        "_id": f"{unique_id}|price|{entry['timestamp'].isoformat()}",
+                        "unique_id": unique_id,
+                        "timestamp": entry["timestamp"],
+                        "price": entry["price"],
+                    })
+                for entry in doc.get("rating_history") or []:
+                    if entry.get("rating") is None:
+                        continue
+                    points.append({
+                        "_id": f"{unique_id}|rating|{entry['timestamp'].isoformat()}",
+                        "unique_id": unique_id,
+                        "timestamp": entry["timestamp"],
+                        "rating": entry["rating"],
+                    })
 
-        # Apply all updates
-        self.products.update_one({"_id": existing["_id"]}, {"$set": updates})
+                unset = {"$unset": {"price_history": "", "rating_history": ""}}
+                if doc.get("price_sum") is None or doc.get("price_count") is None:
+                    # Seed the running sums unless a concurrent write already
+                    # did (from the same history plus its new price)
+                    operations.append(UpdateOne(
+                        {"_id": doc["_id"], "price_sum": {"$exists": False}},
+                        {**unset, "$set": {"price_sum": sum(prices), "price_count": len(prices)}},
+                    ))
+                    operations.append(UpdateOne({"_id": doc["_id"], "price_sum": {"$exists": True}}, unset))
+                else:
+                    operations.append(UpdateOne({"_id": doc["_id"]}, unset))
 
-        return str(existing["_id"])
+            if points:
+                try:
+                    self.price_history.insert_many(points, ordered=False)
+                except BulkWriteError as e:
+                    # Duplicate keys are points copied by an earlier, interrupted run
+                    other = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+                    if other:
+                        raise
+            self.products.bulk_write(operations, ordered=False)
+
+            totals["products"] += len(docs)
+            totals["points"] += len(points)
+            logger.info(f"📦 Migrated history of {totals['products']} products ({totals['points']} points)")
+
+        if totals["products"]:
+            self._apply_stat_deltas({"version:products": 1})
+        return totals
 
     def save_products_bulk(self, products: List[Dict]) -> Dict:
         """
-        Save multiple products (uses upsert for each)
+        Save multiple products with one unordered bulk write per round
+
+        In "pipeline" mode (settings.product_upsert_mode) each product is a
+        read-free pipeline upsert. In "merge" mode existing documents are
+        first fetched in a single ``$in`` query on unique_id. A product
+        repeated within the batch is applied in a later round so it merges
+        onto the earlier copy, as if saved one by one.
 
         Returns:
             Statistics about the operation
         """
         results = {"inserted": 0, "updated": 0, "errors": 0}
 
+        pending = []
         for product in products:
+            if not product.get("platform") or not product.get("product_id"):
+                logger.error("Missing platform or product_id")
+                results["errors"] += 1
+                continue
+            pending.append((f"{product['platform']}_{product['product_id']}", product))
+
+        while pending:
+            batch, seen, pending_next = [], set(), []
+            for unique_id, product in pending:
+                if unique_id in seen:
+                    pending_next.append((unique_id, product))
+                else:
+                    seen.add(unique_id)
+                    batch.append((unique_id, product))
+            pending = pending_next
+
             try:
-                result = self.upsert_product(product)
-                if "error" in result:
-                    results["errors"] += 1
-                elif result["action"] == "inserted":
-                    results["inserted"] += 1
-                elif result["action"] == "updated":
-                    results["updated"] += 1
+                round_stats = self._bulk_upsert_round(batch)
             except Exception as e:
-                logger.error(f"Error upserting product: {e}")
-                results["errors"] += 1
+                logger.error(f"Error in bulk upsert: {e}")
+                round_stats = {"inserted": 0, "updated": 0, "errors": len(batch)}
+            for key in results:
+                results[key] += round_stats[key]
 
         logger.info(
             f"📊 Bulk save: {results['inserted']} new, {results['updated']} updated, {results['errors']} errors"
         )
         return results
 
-    def get_products_by_category(self, category: str) -> List[Dict]:
-        """Get all products in a category"""
-        products = list(self.products.find({"category": category}))
+    def _bulk_upsert_round(self, batch: List) -> Dict:
+        """One unordered bulk_write (plus $in reads) for products with distinct unique_ids"""
+        timestamp = _now()
+        write_id = ObjectId()
+
+        if settings.product_upsert_mode == "pipeline":
+            operations = [
+                UpdateOne(
+                    {"platform": product["platform"], "product_id": product["product_id"]},
+                    self._upsert_pipeline(product, unique_id, timestamp, write_id),
+                    upsert=True,
+                )
+                for unique_id, product in batch
+            ]
+        else:
+            existing = {
+                doc["unique_id"]: doc
+                for doc in self.products.find(
+                    {"unique_id": {"$in": [unique_id for unique_id, _ in batch]}},
+                    {
+                        "unique_id": 1,
+                        "current_price": 1,
+                        "current_rating": 1,
+                        "price_trend": 1,
+                        "lowest_price": 1,
+                        "highest_price": 1,
+                        "price_sum": 1,
+                        "price_count": 1,
+                        "price_history.price": 1,
+                    },
+                )
+            }
+
+            operations = []
+            for unique_id, product in batch:
+                doc = existing.get(unique_id)
+                if doc:
+                    operations.append(
+                        UpdateOne({"_id": doc["_id"]}, self._update_spec(doc, product, timestamp, write_id))
+                    )
+                else:
+                    # $setOnInsert: a concurrent insert of the same product becomes a no-op
+                    operations.append(
+                        UpdateOne(
+                            {"platform": product["platform"], "product_id": product["product_id"]},
+                            {"$setOnInsert": self._new_product_doc(product, unique_id, timestamp, write_id)},
+                            upsert=True,
+                        )
+                    )
+
+        stats = self._bulk_write_stats(operations)
+        self._after_write(batch, timestamp, write_id)
+        return stats
+
+    def _after_write(
+        self, batch: List, timestamp: datetime, write_id: ObjectId, docs: Optional[List[Dict]] = None
+    ):
+        """
+        Record history points and stats counter changes for one write round
+
+        Each write in the round that changed a product pushed a receipt
+        tagged ``write_id`` into its pending_writes, atomically with the
+        change itself. One read collects this round's receipts and one
+        update pulls them, so what is recorded is exactly what this round
+        did, even if other writers updated the same products in between.
+        ``docs`` skips the read when the write already returned them.
+        """
+        if docs is None:
+            docs = list(self.products.find({"pending_writes.w": write_id}, write_receipt_fields(write_id)))
+        products = dict(batch)
+        receipts = {
+            doc["unique_id"]: dict(doc["pending_writes"][0], platform=doc.get("platform"), category=doc.get("category"))
+            for doc in docs
+            if doc and doc.get("pending_writes")
+        }
+        if receipts:
+            self.products.update_many(
+                {"pending_writes.w": write_id}, {"$pull": {"pending_writes": {"w": write_id}}}
+            )
+
+        self._record_history([
+            self._history_point(unique_id, products[unique_id], timestamp, receipt)
+            for unique_id, receipt in receipts.items()
+        ])
+        deltas = self._stat_deltas(receipts.values())
+        deltas["version:products"] = 1
+        self._apply_stat_deltas(deltas)
+
+    def _bulk_write_stats(self, operations: List[UpdateOne]) -> Dict:
+        try:
+            result = self.products.bulk_write(operations, ordered=False)
+            return {
+                "inserted": result.upserted_count,
+                # Every save stamps last_seen, so a matched product is modified
+                "updated": result.modified_count,
+                "errors": 0,
+            }
+        except BulkWriteError as e:
+            details = e.details
+            for error in details.get("writeErrors", [])[:5]:
+                logger.error(f"Error upserting product: {error.get('errmsg')}")
+            return {
+                "inserted": details.get("nUpserted", 0),
+                "updated": details.get("nModified", 0),
+                "errors": len(details.get("writeErrors", [])),
+            }
+
+    def save_products_stream(
+        self,
+        products: Iterable[Dict],
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        on_batch: Optional[Callable[[int, Dict], None]] = None,
+    ) -> Dict:
+        """
+        Save products from an iterator in micro-batches as they arrive
+
+        A batch is written once it holds ``batch_size`` products or its
+        oldest product has waited ``flush_seconds``, so early products are
+        queryable while the rest are still being scraped. ``products`` is
+        drained by a feeder thread, so the time limit holds even while the
+        next product is slow to arrive (e.g. a page fetch in progress).
+
+        Args:
+            products: Any iterable of product dicts, e.g. scraper.iter_products()
+            batch_size: Max products per write (default settings.ingest_batch_size)
+            flush_seconds: Max buffering time (default settings.ingest_flush_seconds)
+            on_batch: Called with (products saved so far, running stats) after each write
+
+        Returns:
+            Statistics about the operation, summed over batches
+        """
+        batch_size = batch_size or settings.ingest_batch_size
+        flush_seconds = settings.ingest_flush_seconds if flush_seconds is None else flush_seconds
+        totals = {"inserted": 0, "updated": 0, "errors": 0}
+        batch: List[Dict] = []
+        batch_started = 0.0
+        end = object()
+        feed: "queue.Queue" = queue.Queue(maxsize=batch_size * 4)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    feed.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feeder():
+            try:
+                for product in products:
+                    if not put(product):
+                        return
+            except Exception as e:
+                put(e)
+            put(end)
+
+        def flush():
+            stats = self.save_products_bulk(batch)
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+            batch.clear()
+            if on_batch:
+                # Products that failed to write are in totals["errors"], not saved
+                on_batch(totals["inserted"] + totals["updated"], dict(totals))
+
+        threading.Thread(target=feeder, name="ingest-feeder", daemon=True).start()
+        try:
+            while True:
+                timeout = None
+                if batch:
+                    timeout = max(0.0, batch_started + flush_seconds - time.monotonic())
+                try:
+                    item = feed.get(timeout=timeout)
+                except queue.Empty:
+                    flush()
+                    continue
+                if item is end:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(item)
+                if len(batch) >= batch_size or time.monotonic() - batch_started >= flush_seconds:
+                    flush()
+            if batch:
+                flush()
+        finally:
+            # Unblock the feeder if a write failed
+            stop.set()
+
+        return totals
+
+    def get_products_by_category(self, category: str, profile: str = "full") -> List[Dict]:
+        """Get all products in a category (fields per projection profile)"""
+        products = list(self.products.find({"category": category}, projection(profile)))
         return products
 
-    def get_products_by_platform(self, platform: str) -> List[Dict]:
-        """Get all products from a platform"""
-        products = list(self.products.find({"platform": platform}))
+    def get_products_by_platform(self, platform: str, profile: str = "full") -> List[Dict]:
+        """Get all products from a platform (fields per projection profile)"""
+        products = list(self.products.find({"platform": platform}, projection(profile)))
         return products
 
-    def get_product_by_id(self, platform: str, product_id: str) -> Optional[Dict]:
+    def get_product_by_id(self, platform: str, product_id: str, profile: str = "full") -> Optional[Dict]:
         """Get a specific product"""
-        return self.products.find_one({"platform": platform, "product_id": product_id})
+        return self.products.find_one(
+            {"platform": platform, "product_id": product_id}, projection(profile)
+        )
 
-    def get_price_drops(self, min_percent: float = 10.0) -> List[Dict]:
+    def get_price_drops(self, min_percent: float = 10.0, profile: str = "full") -> List[Dict]:
         """Get products with recent price drops"""
         products = list(
             self.products.find(
-                {"price_trend": "down", "price_change_percent": {"$lt": -min_percent}}
+                {"price_trend": "down", "price_change_percent": {"$lt": -min_percent}},
+                projection(profile),
             ).sort("price_change_percent", ASCENDING)
         )
         return products
 
-    def get_trending_products(self, limit: int = 10) -> List[Dict]:
+    def get_trending_products(self, limit: int = 10, profile: str = "full") -> List[Dict]:
         """Get products with best ratings and recent activity"""
         products = list(
-            self.products.find({"current_rating": {"$gte": 4.0}})
+            self.products.find({"current_rating": {"$gte": 4.0}}, projection(profile))
             .sort([("current_rating", DESCENDING), ("last_seen", DESCENDING)])
             .limit(limit)
         )
         return products
 
-    def get_all_products(self, limit: int = 100) -> List[Dict]:
+    def get_all_products(self, limit: int = 100, profile: str = "full") -> List[Dict]:
         """Get all products with optional limit"""
         products = list(
-            self.products.find().sort("updated_at", DESCENDING).limit(limit)
+            self.products.find({}, projection(profile)).sort("updated_at", DESCENDING).limit(limit)
         )
         return products
 
-    def get_database_stats(self) -> Dict:
-        """Get statistics about the database"""
-        total_products = self.products.count_documents({})
-        total_reports = self.reports.count_documents({
-            "report_type": {"$in": ["quick_analysis", "deep_analysis"]}
-        })
+    @staticmethod
+    def _product_query(
+        platform: Optional[str],
+        category: Optional[str],
+        view: str,
+        min_price: Optional[float],
+        max_price: Optional[float],
+        min_rating: Optional[float],
+    ) -> Dict:
+        """Filter for query_products/iter_products (arguments as there)"""
+        if view not in PRODUCT_VIEWS:
+            raise ValueError(f"Unknown view '{view}', expected one of {sorted(PRODUCT_VIEWS)}")
+
+        query = dict(PRODUCT_VIEWS[view])
+        if platform:
+            query["platform"] = platform
+        if category:
+            query["category"] = category
+        if min_price is not None or max_price is not None:
+            query["current_price"] = {}
+            if min_price is not None:
+                query["current_price"]["$gte"] = min_price
+            if max_price is not None:
+                query["current_price"]["$lte"] = max_price
+        if min_rating is not None:
+            # "trending" already sets a rating floor; keep the stricter one
+            floor = query.get("current_rating", {}).get("$gte", min_rating)
+            query["current_rating"] = {"$gte": max(floor, min_rating)}
+        return query
+
+    def query_products(
+        self,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+        view: str = "all",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        profile: str = "table",
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of products, most recently updated first ("trending":
+        highest rated first, then most recent)
+
+        All filters run in a single query; paging is keyset-based on
+        (updated_at, _id), after the view's PRODUCT_VIEW_SORTS fields, so
+        every page costs the same however deep it is.
+
+        Args:
+            platform, category: Exact matches (lowercase, as stored)
+            view: "all", "price_drops" or "trending" (see PRODUCT_VIEWS)
+            min_price, max_price: Bounds on current_price
+            min_rating: Lower bound on current_rating
+            limit: Page size
+            cursor: next_cursor from the previous page
+            profile: Projection profile for the returned products
 
-        platforms = self.products.distinct("platform")
-        categories = self.products.distinct("category")
+        Returns:
+            (products, next_cursor), next_cursor None on the last page
+        """
+        query = self._product_query(platform, category, view, min_price, max_price, min_rating)
+        lead = PRODUCT_VIEW_SORTS.get(view, [])
+        keys = lead + ["updated_at", "_id"]
+        if cursor:
+            updated_at, last_id, lead_values = decode_cursor(cursor, lead)
+            values = lead_values + [updated_at, last_id]
+            # Rows after the cursor: equal on a prefix of the keys, lower on the next one
+            query["$or"] = [
+                {**dict(zip(keys[:n], values[:n])), keys[n]: {"$lt": values[n]}}
+                for n in range(len(keys))
+            ]
+
+        fields = projection(profile)
+        if fields is not None:
+            # Keyset fields are always read; dropped again if the profile excludes them
+            fields = dict(fields, **{key: 1 for key in keys})
+        products = list(
+            self.products.find(query, fields)
+            .sort([(key, DESCENDING) for key in keys])
+            .limit(limit + 1)
+        )
+
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = encode_cursor(products[-1], lead)
+
+        if fields is not None:
+            requested = projection(profile)
+            dropped = [key for key in keys if not requested.get(key, key == "_id")]
+            for product in products:
+                for key in dropped:
+                    product.pop(key, None)
+        return products, next_cursor
+
+    # ── Dashboard stats ───────────────────────────────────────────────────────
+    # One small document per counter in the stats collection, _id "<kind>:<name>":
+    #   total:products, total:reports, platform:<name>, category:<name>, trend:<name>
+    # Writes adjust them with $inc; rebuild_stats() recomputes them from scratch,
+    # and runs at startup on a database without counters (see _seed_stats).
+    # version:<collection> counters only ever go up, once per write; they
+    # are the data versions behind the API's ETags and response cache keys
+    # (see data_version).
+
+    def iter_products(
+        self,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+        view: str = "all",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        fields: Optional[Dict] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict]:
+        """
+        Every product matching the query_products filters, most recently
+        updated first, streamed from the cursor ``batch_size`` at a time
+        (for exports; memory use does not grow with the result)
+        """
+        query = self._product_query(platform, category, view, min_price, max_price, min_rating)
+        return iter(
+            self.products.find(query, fields)
+            .sort([("updated_at", DESCENDING), ("_id", DESCENDING)])
+            .batch_size(batch_size)
+        )
 
-        price_drops = self.products.count_documents({"price_trend": "down"})
-        price_increases = self.products.count_documents({"price_trend": "up"})
+    def iter_history(
+        self,
+        unique_id: Optional[str] = None,
+        platform: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[Dict] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict]:
+        """
+        Price/rating history points by product, newest first (the
+        history index order, so nothing is sorted in memory), streamed
+        from the cursor ``batch_size`` at a time
+
+        Args:
+            unique_id: One product only
+            platform: Products of one platform (unique_id prefix)
+            start, end: Inclusive/exclusive bounds on timestamp
+        """
+        query: Dict = {}
+        if unique_id:
+            query["unique_id"] = unique_id
+        elif platform:
+            # Anchored prefix: still an index range scan
+            query["unique_id"] = {"$regex": f"^{re.escape(platform)}_"}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gte"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        return iter(
+            self.price_history.find(query, fields)
+            .sort([("unique_id", ASCENDING), ("timestamp", DESCENDING)])
+            .batch_size(batch_size)
+        )
+
+    def _stat_deltas(self, receipts: Iterable[Dict]) -> Dict[str, int]:
+        """Counter changes implied by write receipts (plus the product's platform/category)"""
+        deltas: Dict[str, int] = {}
+
+        def inc(key, by=1):
+            deltas[key] = deltas.get(key, 0) + by
+
+        for receipt in receipts:
+            trend = receipt.get("trend")
+            if receipt.get("new"):
+                inc("total:products")
+                inc(f"platform:{receipt.get('platform')}")
+                inc(f"category:{receipt.get('category')}")
+                inc(f"trend:{trend}")
+            elif receipt.get("price") and receipt.get("prev") != trend:
+                if receipt.get("prev"):
+                    inc(f"trend:{receipt['prev']}", -1)
+                inc(f"trend:{trend}")
+        return {key: n for key, n in deltas.items() if n}
+
+    def _apply_stat_deltas(self, deltas: Dict[str, int]):
+        if not deltas:
+            return
+        self.stats.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": key},
+                    {"$inc": {"count": n}, "$setOnInsert": {"kind": key.split(":", 1)[0]}},
+                    upsert=True,
+                )
+                for key, n in deltas.items()
+            ],
+            ordered=False,
+        )
+
+    def _seed_stats(self):
+        """
+        Build the stats counters if this database has none yet
+
+        Writes only $inc the counters, so on a database that predates them
+        (or whose stats were dropped) they must be seeded from the
+        collections before the first write, not on the first stats read.
+        """
+        if self.stats.find_one({"_id": "total:products"}, {"_id": 1}) is None:
+            self.rebuild_stats()
+
+    def rebuild_stats(self) -> Dict:
+        """
+        Recompute every stats counter from the collections
+
+        Products are counted in one $facet aggregation. Use this to
+        reconcile drift (e.g. after manual edits); normal writes keep the
+        counters current on their own.
+        """
+        facets = next(self.products.aggregate([
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "platform": [{"$group": {"_id": "$platform", "n": {"$sum": 1}}}],
+                "category": [{"$group": {"_id": "$category", "n": {"$sum": 1}}}],
+                "trend": [{"$group": {"_id": "$price_trend", "n": {"$sum": 1}}}],
+            }}
+        ]), {})
+
+        counts = {
+            "total:products": facets["total"][0]["n"] if facets.get("total") else 0,
+            "total:reports": self.reports.count_documents(
+                {"report_type": {"$in": list(ANALYSIS_REPORT_TYPES)}}
+            ),
+        }
+        for kind in ("platform", "category", "trend"):
+            for group in facets.get(kind, []):
+                counts[f"{kind}:{group['_id']}"] = group["n"]
+
+        # Zero counters that no longer match anything
+        for doc in self.stats.find(
+            {"_id": {"$nin": list(counts)}, "kind": {"$ne": "version"}}, {"_id": 1}
+        ):
+            counts[doc["_id"]] = 0
+
+        self.stats.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": key},
+                    {"$set": {"count": n, "kind": key.split(":", 1)[0]}},
+                    upsert=True,
+                )
+                for key, n in counts.items()
+            ],
+            ordered=False,
+        )
+        self._apply_stat_deltas({"version:stats": 1})
+        logger.info(f"📊 Rebuilt stats: {counts['total:products']} products")
+        return self._stats_from_counts(counts)
+
+    @staticmethod
+    def _stats_from_counts(counts: Dict[str, int]) -> Dict:
+        def names(kind):
+            prefix = f"{kind}:"
+            return sorted(
+                key[len(prefix):] for key, n in counts.items()
+                if key.startswith(prefix) and n > 0 and key[len(prefix):] != "None"
+            )
 
         return {
-            "total_products": total_products,
-            "total_reports": total_reports,
-            "platforms": platforms,
-            "categories": categories,
-            "price_drops": price_drops,
-            "price_increases": price_increases,
+            "total_products": counts.get("total:products", 0),
+            "total_reports": counts.get("total:reports", 0),
+            "platforms": names("platform"),
+            "categories": names("category"),
+            "price_drops": counts.get("trend:down", 0),
+            "price_increases": counts.get("trend:up", 0),
         }
 
+    def data_version(self, *collections: str) -> Tuple[int, ...]:
+        """
+        Write counters of ``collections`` ("products", "reports", "stats")
+        in one _id lookup; any write to one of them changes the tuple
+        """
+        keys = [f"version:{name}" for name in collections]
+        found = {doc["_id"]: doc.get("count", 0) for doc in self.stats.find({"_id": {"$in": keys}})}
+        return tuple(found.get(key, 0) for key in keys)
+
+    def get_database_stats(self) -> Dict:
+        """Get statistics about the database (one read of the stats counters)"""
+        counts = {doc["_id"]: doc.get("count", 0) for doc in self.stats.find({}, {"count": 1})}
+        return self._stats_from_counts(counts)
+
     def save_report(self, report_data: Dict) -> str:
         """Save AI-generated analysis report"""
         report_data["generated_at"] = datetime.now()
         result = self.reports.insert_one(report_data)
+        if report_data.get("report_type") in ANALYSIS_REPORT_TYPES:
+            self._apply_stat_deltas({"total:reports": 1, "version:reports": 1})
+        else:
+            self._apply_stat_deltas({"version:reports": 1})
         logger.info("Report saved to database")
         return str(result.inserted_id)
 
@@ -312,10 +1297,103 @@ class MongoDBManager:
         report = self.reports.find_one(query, sort=[("generated_at", DESCENDING)])
         return report
 
+    def create_job(self, job_type: str, params: Dict) -> str:
+        """Persist a new queued job and return its id"""
+        timestamp = datetime.now()
+        result = self.jobs.insert_one({
+            "type": job_type,
+            "state": "queued",
+            "params": params,
+            "progress": {},
+            "timings": {},
+            "result": None,
+            "error": None,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+        })
+        return str(result.inserted_id)
+
+    def claim_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Atomically move a queued job to running.
+
+        Returns:
+            The claimed job, or None if another worker already has it
+        """
+        timestamp = datetime.now()
+        return self.jobs.find_one_and_update(
+            {"_id": ObjectId(job_id), "state": "queued"},
+            {"$set": {"state": "running", "started_at": timestamp, "updated_at": timestamp}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def update_job(self, job_id: str, fields: Dict):
+        """Set fields on a job (dotted paths allowed, e.g. progress.scraped)"""
+        fields["updated_at"] = datetime.now()
+        if fields.get("state") in ("succeeded", "failed"):
+            fields["finished_at"] = fields["updated_at"]
+        self.jobs.update_one({"_id": ObjectId(job_id)}, {"$set": fields})
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id"""
+        return self.jobs.find_one({"_id": ObjectId(job_id)})
+
+    def requeue_stale_jobs(self, stale_seconds: int) -> List[str]:
+        """
+        Put jobs orphaned by a restart back in the queue.
+
+        A running job whose last update is older than ``stale_seconds`` is
+        assumed to have died with its worker process.
+
+        Returns:
+            Ids of every queued job, including the requeued ones
+        """
+        cutoff = datetime.now() - timedelta(seconds=stale_seconds)
+        result = self.jobs.update_many(
+            {"state": "running", "updated_at": {"$lt": cutoff}},
+            {"$set": {"state": "queued", "updated_at": datetime.now()}},
+        )
+        if result.modified_count:
+            logger.warning(f"♻️ Requeued {result.modified_count} interrupted jobs")
+
+        queued = self.jobs.find({"state": "queued"}, {"_id": 1}).sort("created_at", ASCENDING)
+        return [str(job["_id"]) for job in queued]
+
+    def save_pdf_chunks(self, session_id: str, info: Dict, chunks: List[Dict]):
+        """
+        Store the embedded chunks of an uploaded PDF so any worker can answer
+
+        Args:
+            session_id: PDF chat session the chunks belong to
+            info: Session metadata copied onto every chunk (filename, page_count, ...)
+            chunks: {"text", "metadata", "embedding"} dicts, in document order
+        """
+        timestamp = datetime.now()
+        self.pdf_chunks.insert_many(
+            [
+                dict(info, session_id=session_id, i=i, created_at=timestamp, **chunk)
+                for i, chunk in enumerate(chunks)
+            ],
+            ordered=False,
+        )
+
+    def get_pdf_chunks(self, session_id: str) -> List[Dict]:
+        """Chunks of a PDF chat session in document order; empty once it expired"""
+        return list(
+            self.pdf_chunks.find({"session_id": session_id}, {"_id": 0}).sort("i", ASCENDING)
+        )
+
+    def delete_pdf_chunks(self, session_id: str) -> bool:
+        """Drop a PDF chat session. Returns True if it existed."""
+        return self.pdf_chunks.delete_many({"session_id": session_id}).deleted_count > 0
+
     def clean_database(self):
-        """Remove all products (use with caution!)"""
+        """Remove all products and their history (use with caution!)"""
         result = self.products.delete_many({})
+        self.price_history.delete_many({})
         logger.warning(f"⚠️ Deleted {result.deleted_count} products")
+        self._apply_stat_deltas({"version:products": 1})
+        self.rebuild_stats()
         return result.deleted_count
 
     def close(self):
@@ -326,3 +1404,4 @@ class MongoDBManager:
 
 # Global instance
 db_manager = MongoDBManager()
+os.register_at_fork(after_in_child=db_manager.reconnect_after_fork)
@@ -0,0 +1,13 @@
+# src/scrapers/__init__.py
+SUPPORTED_PLATFORMS = ("amazon", "flipkart")
+
+
+def make_scraper(platform: str):
+    """Return a scraper for the platform, or None if it is not supported."""
+    if platform == "amazon":
+        from src.scrapers.amazon_scraper import AmazonScraper
+        return AmazonScraper()
+    if platform == "flipkart":
+        from src.scrapers.flipkart_scraper import FlipkartScraper
+        return FlipkartScraper()
+    return None
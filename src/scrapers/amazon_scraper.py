@@ -1,68 +1,56 @@
 # src/scrapers/amazon_scraper.py
+from bs4 import SoupStrainer
 from src.scrapers.base_scraper import BaseScraper
-from src.utils.helpers import clean_price, clean_rating, extract_product_id
-from typing import List, Dict, Optional
+from src.scrapers.extraction import ExtractionSpec, Rule, text_of
+from src.utils.helpers import clean_price, clean_rating
+from typing import Dict, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Field rules for a search-result card, compiled once
+CARD_SPEC = ExtractionSpec([
+    Rule("title", tag="h2", value=text_of),
+    Rule("link", tag="a", within="h2"),
+    Rule("price", tag="span", cls="a-price-whole", value=text_of),
+    Rule("rating", tag="span", cls="a-icon-alt", value=text_of),
+    Rule("reviews", tag="span", cls="a-size-base", attrs={"dir": "auto"}, value=text_of),
+    Rule("image", tag="img", cls="s-image"),
+])
+
 
 class AmazonScraper(BaseScraper):
     """Scraper specifically for Amazon India"""
 
+    content_markers = ("s-search-result",)
+
+    ready_selector = 'div[data-component-type="s-search-result"]'
+    ready_min_count = 4
+    no_results_text = ("No results for",)
+    card_strainer = SoupStrainer("div", attrs={"data-component-type": "s-search-result"})
+    results_per_page = 16
+
+    # Amazon's own ad / telemetry beacons
+    extra_blocked_urls = ("*aax-eu.amazon*", "*fls-eu.amazon*", "*unagi.amazon*")
+
     def __init__(self):
         super().__init__()
         self.base_url = "https://www.amazon.in"
         self.platform = "amazon"
 
-    def search_products(self, query: str, max_results: int = 10) -> List[Dict]:
-        """
-        Search for products on Amazon
-
-        Args:
-            query: Search term (e.g., "samsung phone")
-            max_results: How many products to scrape
-
-        Returns:
-            List of product dictionaries
-        """
-        search_url = f"{self.base_url}/s?k={query.replace(' ', '+')}"
-        logger.info(f"Searching Amazon for: {query}")
-
-        # Fetch the search results page
-        html = self.fetch_with_selenium(search_url)
+    def build_search_url(self, query: str, page: int = 1) -> str:
+        """Search results URL for a query and 1-based page number"""
+        url = f"{self.base_url}/s?k={query.replace(' ', '+')}"
+        return url if page == 1 else f"{url}&page={page}"
 
-        if not html:
-            logger.error("Failed to fetch Amazon search results")
-            return []
-
-        soup = self.parse_html(html)
-        products = []
-
-        # Find all product containers
-        product_divs = soup.find_all("div", {"data-component-type": "s-search-result"})
-        logger.info(f"Found {len(product_divs)} products on page")
-
-        for div in product_divs[:max_results]:
-            product = self._extract_product_info(div)
-            if product:
-                products.append(product)
-
-        logger.info(f"✅ Successfully scraped {len(products)} products")
-        return products
+    def find_product_cards(self, soup) -> list:
+        """Find all product containers on a results page"""
+        return soup.find_all("div", {"data-component-type": "s-search-result"})
 
     def _extract_product_info(self, product_div) -> Optional[Dict]:
         """Extract information from a single product card - UPDATED FOR NEW SCHEMA"""
         try:
-            # Product title
-            title_element = product_div.find("h2")
-            title = title_element.get_text(strip=True) if title_element else None
-
-            if not title:
-                logger.debug("No title found, skipping product")
-                return None
-
             # Product ID (ASIN) - CRITICAL for unique tracking
             asin = product_div.get("data-asin", None)
 
@@ -70,45 +58,29 @@ class AmazonScraper(BaseScraper):
                 logger.debug("No ASIN found, skipping product")
                 return None
 
-            # Price
-            price_whole = product_div.find("span", class_="a-price-whole")
-            price = None
+            # One walk over the card fills every field
+            fields = CARD_SPEC.extract(product_div)
 
-            if price_whole:
-                price_text = price_whole.get_text(strip=True)
-                price = clean_price(price_text)
-
-            # Rating
-            rating_element = product_div.find("span", class_="a-icon-alt")
-            rating = (
-                clean_rating(rating_element.get_text(strip=True))
-                if rating_element
-                else None
-            )
+            title = fields.get("title")
+            if not title:
+                logger.debug("No title found, skipping product")
+                return None
 
-            # Number of reviews
-            reviews_element = product_div.find(
-                "span", {"class": "a-size-base", "dir": "auto"}
-            )
-            reviews_text = (
-                reviews_element.get_text(strip=True) if reviews_element else "0"
-            )
+            price = clean_price(fields["price"]) if "price" in fields else None
+            rating = clean_rating(fields["rating"]) if "rating" in fields else None
+            reviews_text = fields.get("reviews", "0")
 
-            # Product URL
-            link_element = (
-                product_div.find("h2").find("a") if product_div.find("h2") else None
-            )
+            link_element = fields.get("link")
             url = (
                 self.base_url + link_element["href"]
-                if link_element and "href" in link_element.attrs
+                if link_element is not None and "href" in link_element.attrs
                 else None
             )
 
-            # Image
-            img_element = product_div.find("img", class_="s-image")
+            img_element = fields.get("image")
             image_url = (
                 img_element["src"]
-                if img_element and "src" in img_element.attrs
+                if img_element is not None and "src" in img_element.attrs
                 else None
             )
 
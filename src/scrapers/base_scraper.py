@@ -1,35 +1,490 @@
 # src/scrapers/base_scraper.py
+import math
+import os
 import time
+import atexit
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from config.settings import settings
-from src.utils.helpers import random_delay
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.utils.helpers import backoff_delay
+from src.utils.rate_limiter import get_rate_limiter
+from src.scrapers.snapshot_store import get_snapshot_store
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class DriverPool:
+    """
+    Bounded, thread-safe pool of warm Chrome drivers.
+
+    Drivers are created lazily up to ``max_size``, health-checked on every
+    checkout and recycled after ``max_pages`` page loads or when a fetch
+    crashes, so a browser process is not spawned for every search.
+    """
+
+    def __init__(
+        self,
+        factory: Callable,
+        max_size: int = 2,
+        max_pages: int = 50,
+        checkout_timeout: float = 60.0,
+    ):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: List[Dict] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recycled = 0
+        self._crashed = 0
+
+    def _is_healthy(self, entry: Dict) -> bool:
+        """Cheap liveness probe - a dead Chrome raises on any command"""
+        try:
+            entry["driver"].execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _destroy(self, entry: Dict):
+        try:
+            entry["driver"].quit()
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {e}")
+
+    def acquire(self) -> Dict:
+        """Borrow a driver entry, creating one if the pool is not full"""
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+
+                if self._created < self.max_size:
+                    self._created += 1
+                    entry = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out after {self.checkout_timeout}s waiting for a driver"
+                    )
+                self._cond.wait(remaining)
+
+        # Health-check / create outside the lock - both talk to Chrome
+        if entry is not None and not self._is_healthy(entry):
+            logger.warning("♻️ Discarding unhealthy Chrome driver")
+            self._destroy(entry)
+            entry = None
+            with self._cond:
+                self._crashed += 1
+
+        if entry is None:
+            try:
+                entry = {"driver": self.factory(), "pages": 0, "created_at": time.time()}
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        return entry
+
+    def release(self, entry: Dict, broken: bool = False):
+        """Return a driver to the pool, recycling it if broken or worn out"""
+        entry["pages"] += 1
+        recycle = broken or (self.max_pages and entry["pages"] >= self.max_pages)
+
+        if recycle or self._closed:
+            self._destroy(entry)
+
+        with self._cond:
+            if recycle or self._closed:
+                self._created -= 1
+                if broken:
+                    self._crashed += 1
+                else:
+                    self._recycled += 1
+            else:
+                self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self):
+        """Context manager that lends a driver and returns it afterwards"""
+        entry = self.acquire()
+        broken = False
+        try:
+            yield entry["driver"]
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(entry, broken=broken)
+
+    def stats(self) -> Dict:
+        """Pool size and checkout-wait metrics"""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "checkouts": self._checkouts,
+                "avg_wait_seconds": (
+                    self._wait_total / self._checkouts if self._checkouts else 0.0
+                ),
+                "max_wait_seconds": self._wait_max,
+                "recycled": self._recycled,
+                "crashed": self._crashed,
+            }
+
+    def close(self):
+        """Quit every idle driver; in-use drivers are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._destroy(entry)
+
+
+# One pool per platform, shared by every scraper instance in the process
+_driver_pools: Dict[str, DriverPool] = {}
+_driver_pools_lock = threading.Lock()
+
+
+def get_driver_pool_stats() -> Dict[str, Dict]:
+    """Metrics for every active driver pool, keyed by platform"""
+    with _driver_pools_lock:
+        pools = dict(_driver_pools)
+    return {platform: pool.stats() for platform, pool in pools.items()}
+
+
+@atexit.register
+def close_driver_pools():
+    """Shut down all pooled Chrome processes"""
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# ── HTTP tier ─────────────────────────────────────────────────────────────────
+# A single keep-alive session shared across scrapers and threads
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+# Fetch tier that last succeeded per domain:
+#   domain -> {"tier", "since", "last_probe" (last HTTP re-probe), "successes"}
+TIER_REQUESTS = "requests"
+TIER_SELENIUM = "selenium"
+_domain_tiers: Dict[str, Dict] = {}
+_domain_tiers_lock = threading.Lock()
+
+# Markers of bot-check / captcha / access-denied pages
+BLOCK_MARKERS = (
+    "captcha",
+    "robot check",
+    "are you a human",
+    "access denied",
+    "enter the characters you see below",
+    "unusual traffic",
+)
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled HTTP session, creating it on first use"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            # No adapter-level retries: fetch() owns retries, backoff and the
+            # circuit breaker, so attempts don't multiply
+            adapter = HTTPAdapter(
+                pool_connections=settings.http_pool_connections,
+                pool_maxsize=settings.http_pool_maxsize,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_preferred_tier(domain: str) -> str:
+    """Fetch tier to start with for a domain"""
+    with _domain_tiers_lock:
+        record = _domain_tiers.get(domain)
+        if not record:
+            return TIER_REQUESTS
+        # Periodically re-probe the cheap tier in case the block has lifted;
+        # the caller claims the probe, so one fetch per window tries HTTP
+        now = time.time()
+        if (
+            record["tier"] == TIER_SELENIUM
+            and now - record["last_probe"] > settings.http_tier_reprobe_seconds
+        ):
+            record["last_probe"] = now
+            return TIER_REQUESTS
+        return record["tier"]
+
+
+def record_tier(domain: str, tier: str):
+    """Remember which tier succeeded for a domain"""
+    with _domain_tiers_lock:
+        now = time.time()
+        record = _domain_tiers.get(domain)
+        if record and record["tier"] == tier:
+            record["successes"] += 1
+            if now - record["last_probe"] > settings.http_tier_reprobe_seconds:
+                # Still needed after the re-probe window: wait a full window again
+                record["last_probe"] = now
+        else:
+            _domain_tiers[domain] = {"tier": tier, "since": now, "last_probe": now, "successes": 1}
+
+
+def get_fetch_tier_stats() -> Dict[str, Dict]:
+    """Current tier per domain"""
+    with _domain_tiers_lock:
+        return {domain: dict(record) for domain, record in _domain_tiers.items()}
+
+
+# ── Resource blocking ─────────────────────────────────────────────────────────
+# Extractors only read HTML attributes and text, never the bytes behind them
+BLOCKED_RESOURCE_PATTERNS = (
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Media
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    # Stylesheets
+    "*.css",
+    # Third-party trackers / ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*scorecardresearch.com*", "*omtrdc.net*",
+)
+
+
+# ── HTML parsing ──────────────────────────────────────────────────────────────
+# lxml is an optional C-accelerated tree builder; fall back to the stdlib parser
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+PARSER_BACKENDS = ("html.parser", "lxml")
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """BeautifulSoup tree builder to use, honouring settings.html_parser"""
+    name = name or settings.html_parser
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+    if name == "lxml" and not LXML_AVAILABLE:
+        logger.warning("lxml not installed, falling back to html.parser")
+        return "html.parser"
+    return name
+
+
+# ── Pagination ────────────────────────────────────────────────────────────────
+# Page fetches run here; per-domain semaphores cap how many hit one site at once
+_page_executor = ThreadPoolExecutor(
+    max_workers=settings.page_fetch_workers, thread_name_prefix="page"
+)
+_domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+_domain_slots_lock = threading.Lock()
+
+
+def get_domain_slots(domain: str) -> threading.BoundedSemaphore:
+    """Semaphore limiting concurrent fetches to one domain"""
+    with _domain_slots_lock:
+        slots = _domain_slots.get(domain)
+        if slots is None:
+            slots = threading.BoundedSemaphore(settings.per_domain_concurrency)
+            _domain_slots[domain] = slots
+        return slots
+
+
+# ── Parse stage ───────────────────────────────────────────────────────────────
+# Parsing + extraction is CPU-bound, so paginated searches hand fetched HTML
+# to worker processes instead of parsing in the fetching thread under the GIL
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+# Scraper instances reused inside each parse worker process
+_worker_scrapers: Dict[type, "BaseScraper"] = {}
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared parse worker pool, or None when settings.parse_workers <= 1"""
+    global _parse_pool
+    if settings.parse_workers <= 1:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn, not fork: the parent holds driver/HTTP/executor threads
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=settings.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started {settings.parse_workers} parse workers")
+        return _parse_pool
+
+
+def extract_page_in_worker(scraper_cls: type, html: str) -> Tuple[int, List[Dict]]:
+    """Parse-pool entry point: run scraper_cls.extract_page on one page"""
+    scraper = _worker_scrapers.get(scraper_cls)
+    if scraper is None:
+        scraper = _worker_scrapers[scraper_cls] = scraper_cls()
+    return scraper.extract_page(html)
+
+
+# ── Page-readiness metrics ────────────────────────────────────────────────────
+# The fixed post-load sleep this replaced was random_delay(3, 5)
+FIXED_WAIT_BASELINE = 4.0
+_ready_timings: Dict[str, deque] = {}
+_ready_timings_lock = threading.Lock()
+
+
+def record_ready_time(platform: str, seconds: float, timed_out: bool):
+    with _ready_timings_lock:
+        timings = _ready_timings.setdefault(platform, deque(maxlen=500))
+        timings.append((seconds, timed_out))
+
+
+def get_page_ready_stats() -> Dict[str, Dict]:
+    """p50/p95 wait-for-ready latency and time saved versus the fixed sleep"""
+    with _ready_timings_lock:
+        snapshot = {platform: list(t) for platform, t in _ready_timings.items()}
+
+    stats = {}
+    for platform, timings in snapshot.items():
+        waits = sorted(t for t, _ in timings)
+        n = len(waits)
+        stats[platform] = {
+            "samples": n,
+            "p50_seconds": waits[n // 2],
+            "p95_seconds": waits[min(n - 1, int(n * 0.95))],
+            "timeouts": sum(1 for _, timed_out in timings if timed_out),
+            "avg_saved_seconds": sum(max(0.0, FIXED_WAIT_BASELINE - t) for t in waits) / n,
+        }
+    return stats
+
+
+def _reset_after_fork():
+    """
+    Drop process-owned resources in a forked child (e.g. gunicorn --preload
+    workers): Chrome drivers, the parse pool and pooled sockets belong to
+    the parent, so the child forgets them without closing them and creates
+    its own on first use.
+    """
+    global _http_session, _page_executor, _parse_pool
+    _driver_pools.clear()
+    _http_session = None
+    _parse_pool = None
+    _page_executor = ThreadPoolExecutor(
+        max_workers=settings.page_fetch_workers, thread_name_prefix="page"
+    )
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 class BaseScraper:
     """Base class for all web scrapers"""
 
+    platform = "generic"
+
+    # Substrings that only appear once results are server-rendered. A page
+    # that has none of them is a client-side-rendered shell and needs Chrome.
+    content_markers: tuple = ()
+
+    # CSS selector and card count that mean the results grid has rendered
+    ready_selector: Optional[str] = None
+    ready_min_count: int = 1
+
+    # Text the site shows instead of a grid when a search matches nothing
+    no_results_text: tuple = ()
+
+    # Restricts parsing of results pages to the product-card subtrees
+    card_strainer: Optional[SoupStrainer] = None
+
+    # Bump when extraction output changes so cached page extractions are ignored
+    extractor_version: int = 1
+
+    # Typical cards per search results page, used to size pagination
+    results_per_page: int = 20
+
+    # URL patterns to block on top of BLOCKED_RESOURCE_PATTERNS
+    extra_blocked_urls: tuple = ()
+
     def __init__(self):
         self.delay = settings.scrape_delay
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept-Language": "en-US,en;q=0.9",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
         }
 
     # NOTE: For production use, replace Selenium with a dedicated scraping API
     # such as ScraperAPI or Bright Data. Headless Chrome can still be detected
     # and blocked despite these mitigations.
-    def setup_driver(self):
+    def blocked_url_patterns(self) -> List[str]:
+        """URL patterns Chrome should never download for this platform"""
+        return list(BLOCKED_RESOURCE_PATTERNS) + list(self.extra_blocked_urls)
+
+    def setup_driver(self, block_resources: Optional[bool] = None):
         """Setup Selenium WebDriver with Chrome with anti-detection measures."""
+        if block_resources is None:
+            block_resources = settings.block_resources
+
         chrome_options = Options()
         chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
@@ -39,6 +494,18 @@ class BaseScraper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
         chrome_options.add_experimental_option("useAutomationExtension", False)
 
+        # Return from driver.get() at DOMContentLoaded; wait_until_ready()
+        # decides when the page is actually usable
+        chrome_options.page_load_strategy = "eager"
+
+        if block_resources:
+            # Skip image decoding entirely; CDP below also stops the download
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
         # Random realistic viewport so all requests don't look identical
         import random
         viewports = [(1366, 768), (1440, 900), (1536, 864), (1920, 1080)]
@@ -67,40 +534,459 @@ class BaseScraper:
                 """
             })
 
+            if block_resources:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": self.blocked_url_patterns()}
+                )
+
             logger.info("✅ Chrome driver initialized successfully")
             return driver
         except Exception as e:
             logger.error(f"Error setting up Chrome driver: {e}")
             raise
 
-    def fetch_with_requests(self, url: str) -> str:
-        """Fetch page using requests (faster, but may be blocked)"""
+    def driver_pool(self) -> DriverPool:
+        """Return the shared driver pool for this scraper's platform"""
+        with _driver_pools_lock:
+            pool = _driver_pools.get(self.platform)
+            if pool is None:
+                pool = DriverPool(
+                    self.setup_driver,
+                    max_size=settings.driver_pool_size,
+                    max_pages=settings.driver_max_pages,
+                    checkout_timeout=settings.driver_checkout_timeout,
+                )
+                _driver_pools[self.platform] = pool
+            return pool
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Fetch a page, retrying failures with jittered exponential backoff.
+
+        Each domain has a circuit breaker: after repeated failures (errors
+        or block pages) fetches to it return None immediately until a
+        half-open probe succeeds, instead of tying up a worker and a browser.
+
+        Each attempt holds one of the domain's concurrency slots; backoff
+        sleeps don't, so other fetches to the domain can run meanwhile.
+        """
+        domain = urlparse(url).netloc
+        breaker = get_circuit_breaker(domain)
+
+        for attempt in range(settings.max_retries + 1):
+            if not breaker.allow():
+                logger.warning(f"⚡ Circuit open for {domain}, skipping {url}")
+                return None
+
+            with get_domain_slots(domain):
+                html = self.fetch_once(url)
+            if html:
+                breaker.record_success()
+                return html
+            breaker.record_failure()
+
+            if attempt < settings.max_retries:
+                delay = backoff_delay(
+                    attempt, settings.retry_backoff_base, settings.retry_backoff_max
+                )
+                logger.info(f"🔁 Retrying {url} in {delay:.1f}s ({attempt + 1}/{settings.max_retries})")
+                time.sleep(delay)
+
+        logger.error(f"❌ Giving up on {url} after {settings.max_retries + 1} attempts")
+        return None
+
+    def fetch_once(self, url: str) -> Optional[str]:
+        """
+        Fetch a page through the cheapest tier that works for its domain.
+
+        Tries the pooled HTTP session first and escalates to Selenium only
+        when the response is a block/captcha page or a CSR-only shell; the
+        domain then starts on Selenium until it is re-probed. Transport
+        errors and ordinary HTTP errors are not escalated: they return None
+        and are retried by fetch().
+
+        Returns:
+            HTML, or None if the fetch failed or was blocked
+        """
+        domain = urlparse(url).netloc
+        tier = get_preferred_tier(domain)
+
+        if tier == TIER_REQUESTS:
+            html = self.fetch_with_requests(url)
+            if not html:
+                return None
+            if self.is_usable_page(html):
+                record_tier(domain, TIER_REQUESTS)
+                return html
+            logger.info(f"⤴️ Escalating {domain} to Selenium")
+
+        html = self.fetch_with_selenium(url)
+        if not html:
+            return None
+        if self.is_blocked_page(html):
+            logger.warning(f"🚫 Selenium was served a block page for {url}")
+            return None
+        record_tier(domain, TIER_SELENIUM)
+        return html
+
+    def is_blocked_page(self, html: str) -> bool:
+        """Detect bot-check, captcha and access-denied pages"""
+        head = html[:20000].lower()
+        return any(marker in head for marker in BLOCK_MARKERS)
+
+    def is_usable_page(self, html: str) -> bool:
+        """True if the HTML can be parsed without a browser"""
+        if self.is_blocked_page(html):
+            logger.warning("🚫 Block/captcha page detected")
+            return False
+        if self.content_markers and not any(m in html for m in self.content_markers):
+            logger.info("Page looks like a client-rendered shell")
+            return False
+        return True
+
+    def wait_for_slot(self, url: str) -> float:
+        """Block until the per-domain rate limit allows a request to url"""
+        rate, burst = settings.rate_limits.get(self.platform) or settings.rate_limits.get(
+            "default", (0.5, 1)
+        )
+        waited = get_rate_limiter().acquire(urlparse(url).netloc, rate, burst)
+        if waited:
+            logger.debug(f"Rate limited {urlparse(url).netloc} for {waited:.2f}s")
+        return waited
+
+    def fetch_with_requests(self, url: str) -> Optional[str]:
+        """
+        Fetch page using the pooled keep-alive session (faster, but may be blocked)
+
+        Error responses are returned only when they are block/captcha pages
+        (e.g. a 503 robot check), so fetch_once can escalate them; other
+        HTTP and transport errors return None.
+        """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            random_delay(1, 2)
-            return response.text
+            self.wait_for_slot(url)
+            response = get_http_session().get(
+                url, headers=self.headers, timeout=settings.http_timeout
+            )
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
+        if response.status_code >= 400:
+            if self.is_blocked_page(response.text):
+                return response.text
+            logger.error(f"HTTP {response.status_code} fetching {url}")
+            return None
+        return response.text
 
     def fetch_with_selenium(self, url: str) -> str:
-        """Fetch page using Selenium (slower, but more reliable)"""
-        driver = None
+        """Fetch page using a pooled Selenium driver (slower, but more reliable)"""
         try:
-            driver = self.setup_driver()
-            driver.get(url)
-            random_delay(3, 5)  # longer wait for JS-heavy pages
-            html = driver.page_source
+            self.wait_for_slot(url)
+            with self.driver_pool().checkout() as driver:
+                driver.get(url)
+                self.wait_until_ready(driver)
+                html = driver.page_source
             logger.info(f"✅ Successfully fetched {url}")
             return html
         except Exception as e:
             logger.error(f"Error with Selenium {url}: {e}")
             return None
+
+    def wait_until_ready(self, driver) -> float:
+        """
+        Block until the page is usable instead of sleeping a fixed time.
+
+        Waits for ``ready_min_count`` elements matching ``ready_selector``
+        (or for document.readyState when no selector is declared), up to
+        ``settings.page_ready_timeout`` seconds. Pages that will never reach
+        ``ready_min_count`` return early too: a loaded page showing
+        ``no_results_text``, and a sparse or last page whose loaded card
+        count held steady between two polls.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        timed_out = False
+        last_count = [-1]
+
+        def loaded(d):
+            return d.execute_script("return document.readyState") == "complete"
+
+        def condition(d):
+            if not self.ready_selector:
+                return loaded(d)
+            count = len(d.find_elements(By.CSS_SELECTOR, self.ready_selector))
+            if count >= self.ready_min_count:
+                return True
+            steady, last_count[0] = count == last_count[0], count
+            if count == 0:
+                return bool(self.no_results_text) and loaded(d) and d.execute_script(
+                    "const text = document.body ? document.body.innerText : '';"
+                    "return arguments[0].some(marker => text.includes(marker));",
+                    list(self.no_results_text),
+                )
+            return steady and loaded(d)
+
+        try:
+            WebDriverWait(
+                driver,
+                settings.page_ready_timeout,
+                poll_frequency=settings.page_ready_poll,
+            ).until(condition)
+        except TimeoutException:
+            timed_out = True
+            logger.warning(
+                f"⏱️ Page not ready after {settings.page_ready_timeout}s, using what rendered"
+            )
+
+        waited = time.monotonic() - start
+        record_ready_time(self.platform, waited, timed_out)
+        logger.info(
+            f"Page ready in {waited:.2f}s "
+            f"(saved {max(0.0, FIXED_WAIT_BASELINE - waited):.2f}s vs fixed wait)"
+        )
+        return waited
+
+    # ── Search / pagination ───────────────────────────────────────────────────
+    def build_search_url(self, query: str, page: int = 1) -> str:
+        """URL of results page ``page`` (1-based) for a query"""
+        raise NotImplementedError
+
+    def find_product_cards(self, soup) -> list:
+        """All product card elements on a parsed results page"""
+        raise NotImplementedError
+
+    def _extract_product_info(self, product_div) -> Optional[Dict]:
+        """Extract a product dict from one card, or None if it is unusable"""
+        raise NotImplementedError
+
+    def fetch_pages(self, query: str, pages_hint: int) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Yield ``(page, html)`` in page order, fetching ahead concurrently.
+
+        The first ``pages_hint`` pages are fetched in parallel (bounded by
+        the per-domain limit); beyond that pages are fetched one at a time,
+        only if the caller keeps iterating. Closing the generator cancels
+        any fetches that have not started.
+        """
+        window = max(1, settings.per_domain_concurrency)
+        max_pages = max(1, settings.max_search_pages)
+        futures = {}
+        next_page = 1
+
+        try:
+            for page in range(1, max_pages + 1):
+                prefetch_to = min(max_pages, max(min(pages_hint, page + window - 1), page))
+                while next_page <= prefetch_to:
+                    futures[next_page] = _page_executor.submit(
+                        self.fetch, self.build_search_url(query, next_page)
+                    )
+                    next_page += 1
+                yield page, futures.pop(page).result()
         finally:
-            if driver:
-                driver.quit()
+            for future in futures.values():
+                future.cancel()
+
+    def extract_page(self, html: str) -> Tuple[int, List[Dict]]:
+        """
+        Parse a results page and extract its products, in card order.
+
+        Returns:
+            (number of product cards on the page, valid products)
+        """
+        product_divs = self.find_product_cards(self.parse_results_page(html))
+        products = []
+        for div in product_divs:
+            product = self._extract_product_info(div)
+            if product:
+                products.append(product)
+        return len(product_divs), products
+
+    @property
+    def extractor_key(self) -> str:
+        """Names cached extractions in the snapshot store"""
+        return f"{self.platform}.v{self.extractor_version}"
+
+    def _snapshot(self, store, query: str, page: int, html: str) -> Tuple[str, Optional[Tuple]]:
+        """Store a fetched page; return its digest and any cached extraction"""
+        digest, unchanged = store.save(
+            self.platform, query, page, self.build_search_url(query, page), html
+        )
+        cached = store.load_extraction(self.extractor_key, digest) if unchanged else None
+        if cached is not None:
+            logger.info(f"Page {page} unchanged since last snapshot, skipping parse")
+        return digest, cached
+
+    def parsed_pages(
+        self, query: str, pages_hint: int
+    ) -> Iterator[Tuple[int, Optional[Tuple[int, List[Dict]]]]]:
+        """
+        Fetch stage -> parse stage pipeline over results pages.
+
+        Yields ``(page, extract_page result)`` in page order, or
+        ``(page, None)`` once a page fails to fetch. Multi-page searches
+        parse in the process pool while later pages are still downloading;
+        single-page searches parse inline to skip the IPC round trip.
+
+        Every fetched page is written to the snapshot store (when enabled);
+        a page identical to the last snapshot of the same query page reuses
+        that snapshot's extraction instead of being parsed again.
+        """
+        pool = get_parse_pool() if pages_hint > 1 else None
+        store = get_snapshot_store()
+        window = max(1, settings.parse_workers)
+        pending = deque()  # (page, digest, future)
+        failed_page = None
+
+        def finish(page, digest, future):
+            result = future.result()
+            if store and digest:
+                store.save_extraction(self.extractor_key, digest, result)
+            return page, result
+
+        with closing(self.fetch_pages(query, pages_hint)) as pages:
+            try:
+                for page, html in pages:
+                    if not html:
+                        failed_page = page
+                        break
+
+                    digest, cached = self._snapshot(store, query, page, html) if store else (None, None)
+                    if cached is not None:
+                        future = Future()
+                        future.set_result(cached)
+                        digest = None  # already cached
+                    elif pool is not None:
+                        future = pool.submit(extract_page_in_worker, type(self), html)
+                    else:
+                        future = Future()
+                        future.set_result(self.extract_page(html))
+                    pending.append((page, digest, future))
+
+                    # Hand back finished pages early, in order
+                    while pending and (pending[0][2].done() or len(pending) > window):
+                        yield finish(*pending.popleft())
+
+                while pending:
+                    yield finish(*pending.popleft())
+                if failed_page is not None:
+                    yield failed_page, None
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+    def replay_snapshots(
+        self, query: Optional[str] = None, since: Optional[datetime] = None
+    ) -> Iterator[Tuple[Dict, Tuple[int, List[Dict]]]]:
+        """
+        Re-run extraction over stored snapshots of this platform, offline.
+
+        Each distinct page is parsed once (in the parse pool when enabled)
+        and its cached extraction is refreshed, so later live fetches of an
+        unchanged page pick up fixed or new fields.
+
+        Yields:
+            (snapshot index record, extract_page result)
+        """
+        store = get_snapshot_store()
+        if store is None:
+            raise RuntimeError("Snapshot store is disabled (settings.snapshot_enabled)")
+
+        pool = get_parse_pool()
+        window = max(1, settings.parse_workers)
+        pending = deque()  # (record, future)
+        seen = set()
+
+        def finish(record, future):
+            result = future.result()
+            store.save_extraction(self.extractor_key, record["sha256"], result)
+            return record, result
+
+        for record in store.iter_records(platform=self.platform, query=query, since=since):
+            if record["sha256"] in seen:
+                continue
+            seen.add(record["sha256"])
+
+            html = store.load(record["sha256"])
+            if pool is not None:
+                future = pool.submit(extract_page_in_worker, type(self), html)
+            else:
+                future = Future()
+                future.set_result(self.extract_page(html))
+            pending.append((record, future))
+
+            while pending and (pending[0][1].done() or len(pending) > window):
+                yield finish(*pending.popleft())
+
+        while pending:
+            yield finish(*pending.popleft())
+
+    def iter_products(self, query: str, max_results: int = 10) -> Iterator[Dict]:
+        """
+        Yield products one at a time as each results page is extracted.
+
+        Pages are fetched and parsed lazily, so only the page in flight is
+        held in memory; closing the generator early cancels pending fetches.
+
+        Args:
+            query: Search term (e.g., "samsung phone")
+            max_results: Stop after this many unique products
+        """
+        logger.info(f"Searching {self.platform.title()} for: {query}")
+
+        pages_hint = math.ceil(max_results / self.results_per_page)
+        seen = set()
+
+        with closing(self.parsed_pages(query, pages_hint)) as pages:
+            for page, parsed in pages:
+                if parsed is None:
+                    logger.error(f"Failed to fetch {self.platform.title()} results page {page}")
+                    break
+
+                card_count, page_products = parsed
+                logger.info(f"Found {card_count} products on page {page}")
+                if not card_count:
+                    break  # past the last page of results
+
+                for product in page_products:
+                    # Sponsored cards repeat across pages
+                    if product["product_id"] in seen:
+                        continue
+                    seen.add(product["product_id"])
+                    yield product
+                    if len(seen) >= max_results:
+                        return
+
+    def search_products(self, query: str, max_results: int = 10) -> List[Dict]:
+        """
+        Search for products, paginating until max_results valid products
+
+        Args:
+            query: Search term (e.g., "samsung phone")
+            max_results: How many products to scrape
+
+        Returns:
+            List of product dictionaries
+        """
+        products = list(self.iter_products(query, max_results))
+        logger.info(f"✅ Successfully scraped {len(products)} products")
+        return products
+
+    def parse_html(
+        self,
+        html: str,
+        parser: Optional[str] = None,
+        parse_only: Optional[SoupStrainer] = None,
+    ) -> BeautifulSoup:
+        """Parse HTML with BeautifulSoup using the configured backend"""
+        return BeautifulSoup(html, resolve_parser(parser), parse_only=parse_only)
 
-    def parse_html(self, html: str) -> BeautifulSoup:
-        """Parse HTML with BeautifulSoup"""
-        return BeautifulSoup(html, "html.parser")
+    def parse_results_page(self, html: str, parser: Optional[str] = None) -> BeautifulSoup:
+        """
+        Parse a search results page, building only the product-card subtrees
+        when the platform declares a card_strainer and settings.parse_only_cards
+        is on. Extractors see the same Tag objects either way.
+        """
+        parse_only = self.card_strainer if settings.parse_only_cards else None
+        return self.parse_html(html, parser=parser, parse_only=parse_only)
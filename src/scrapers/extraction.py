@@ -0,0 +1,138 @@
+# src/scrapers/extraction.py
+"""
+Declarative product-card extraction.
+
+Each platform describes the fields it wants as a list of Rules. Rules are
+compiled once, when the scraper class is defined, and an ExtractionSpec
+fills every field in a single document-order walk over the card instead of
+one find()/find_all() scan per field.
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Union
+from bs4 import NavigableString, Tag
+
+AttrMatch = Union[bool, str, Pattern]
+
+
+class Rule:
+    """
+    How to find one field inside a product card.
+
+    A rule matches either an element (``tag``/``cls``/``attrs``/``within``)
+    or a text node (``text``). The first match in document order whose
+    ``value`` passes ``accept`` wins, which mirrors ``card.find(...)``.
+
+    Args:
+        field: Name of the field this rule fills
+        tag: Element name to match
+        cls: CSS class the element must carry
+        attrs: attribute -> True (present), exact string, or compiled regex
+        within: Element name the match must be nested inside (within the card)
+        text: Regex searched in each text node
+        value: Turns the matched node into the field value (default: the node)
+        accept: Predicate on the value; rejected matches keep the walk going
+    """
+
+    __slots__ = ("field", "tag", "cls", "attrs", "within", "text", "value", "accept")
+
+    def __init__(
+        self,
+        field: str,
+        tag: Optional[str] = None,
+        cls: Optional[str] = None,
+        attrs: Optional[Dict[str, AttrMatch]] = None,
+        within: Optional[str] = None,
+        text: Optional[Union[str, Pattern]] = None,
+        value: Optional[Callable] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ):
+        if (tag is None) == (text is None):
+            raise ValueError(f"Rule '{field}' needs exactly one of tag or text")
+        self.field = field
+        self.tag = tag
+        self.cls = cls
+        self.attrs = attrs or {}
+        self.within = within
+        self.text = re.compile(text) if isinstance(text, str) else text
+        self.value = value
+        self.accept = accept
+
+    def matches_tag(self, node: Tag, card: Tag) -> bool:
+        if self.cls and self.cls not in (node.get("class") or ()):
+            return False
+        for name, expected in self.attrs.items():
+            actual = node.get(name)
+            if actual is None:
+                return False
+            if expected is True:
+                continue
+            if isinstance(expected, str):
+                if actual != expected:
+                    return False
+            elif not expected.search(actual):
+                return False
+        if self.within:
+            for parent in node.parents:
+                if parent is card:
+                    return False
+                if parent.name == self.within:
+                    break
+            else:
+                return False
+        return True
+
+
+class ExtractionSpec:
+    """A compiled set of Rules for one platform's product cards."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self.fields = {rule.field for rule in rules}
+        self._text_rules = [rule for rule in rules if rule.text is not None]
+        self._tag_rules: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            if rule.tag is not None:
+                self._tag_rules.setdefault(rule.tag, []).append(rule)
+
+    def extract(self, card: Tag) -> Dict[str, Any]:
+        """
+        Walk the card once and return {field: value} for every field found.
+        Fields with no match are absent from the result.
+        """
+        found: Dict[str, Any] = {}
+        remaining = len(self.fields)
+        tag_rules = self._tag_rules
+        text_rules = self._text_rules
+
+        for node in card.descendants:
+            if isinstance(node, Tag):
+                rules = tag_rules.get(node.name)
+                if not rules:
+                    continue
+                candidates = [r for r in rules if r.field not in found and r.matches_tag(node, card)]
+            elif isinstance(node, NavigableString):
+                if not text_rules:
+                    continue
+                candidates = [r for r in text_rules if r.field not in found and r.text.search(node)]
+            else:
+                continue
+
+            for rule in candidates:
+                try:
+                    value = rule.value(node) if rule.value else node
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                if rule.accept and not rule.accept(value):
+                    continue
+                found[rule.field] = value
+                remaining -= 1
+
+            if not remaining:
+                break
+
+        return found
+
+
+def text_of(node) -> str:
+    """Stripped text of an element or text node"""
+    return node.get_text(strip=True) if isinstance(node, Tag) else node.strip()
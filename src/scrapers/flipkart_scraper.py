@@ -1,57 +1,62 @@
 # src/scrapers/flipkart_scraper.py
+from bs4 import SoupStrainer
 from src.scrapers.base_scraper import BaseScraper
-from src.utils.helpers import clean_price, clean_rating
-from typing import List, Dict, Optional
+from src.scrapers.extraction import ExtractionSpec, Rule
+from src.utils.helpers import clean_price
+from typing import Dict, Optional
 import logging
 import re
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Field rules for a search-result card, compiled once
+CARD_SPEC = ExtractionSpec([
+    Rule("link", tag="a", attrs={"href": re.compile(r"/p/")}),
+    Rule("image", tag="img", attrs={"src": re.compile(r"rukminim|flixcart")}),
+    # Price — first ₹ text worth more than delivery charges etc.
+    Rule(
+        "price",
+        text=r"₹",
+        value=lambda s: clean_price(s.strip()),
+        accept=lambda price: price is not None and price > 100,
+    ),
+    # Rating — a text node that is exactly like "4.2"
+    Rule("rating", text=r"^\d\.\d$", value=lambda s: float(s.strip())),
+    # Reviews — text like "1,234 Ratings"
+    Rule(
+        "reviews",
+        text=r"\d[\d,]+\s*(Ratings|Reviews|ratings|reviews)",
+        value=lambda s: s.strip(),
+    ),
+])
+TITLE_FROM_URL = re.compile(r"/([^/]+)/p/")
+
 
 class FlipkartScraper(BaseScraper):
     """Scraper specifically for Flipkart India"""
 
+    content_markers = ("data-id=",)
+
+    ready_selector = "div[data-id]"
+    ready_min_count = 4
+    no_results_text = ("Sorry, no results found",)
+    card_strainer = SoupStrainer("div", attrs={"data-id": True})
+    results_per_page = 24
+
     def __init__(self):
         super().__init__()
         self.base_url = "https://www.flipkart.com"
         self.platform = "flipkart"
 
-    def search_products(self, query: str, max_results: int = 10) -> List[Dict]:
-        """
-        Search for products on Flipkart
-
-        Args:
-            query: Search term (e.g., "wireless headphones")
-            max_results: How many products to scrape
-
-        Returns:
-            List of product dictionaries
-        """
-        search_url = f"{self.base_url}/search?q={query.replace(' ', '+')}"
-        logger.info(f"Searching Flipkart for: {query}")
-
-        # Fetch the search results page
-        html = self.fetch_with_selenium(search_url)
+    def build_search_url(self, query: str, page: int = 1) -> str:
+        """Search results URL for a query and 1-based page number"""
+        url = f"{self.base_url}/search?q={query.replace(' ', '+')}"
+        return url if page == 1 else f"{url}&page={page}"
 
-        if not html:
-            logger.error("Failed to fetch Flipkart search results")
-            return []
-
-        soup = self.parse_html(html)
-        products = []
-
-        # Find all product containers (using data-id attribute)
-        product_divs = soup.find_all("div", {"data-id": True})
-        logger.info(f"Found {len(product_divs)} products on page")
-
-        for div in product_divs[:max_results]:
-            product = self._extract_product_info(div)
-            if product:
-                products.append(product)
-
-        logger.info(f"✅ Successfully scraped {len(products)} products")
-        return products
+    def find_product_cards(self, soup) -> list:
+        """Find all product containers on a results page"""
+        return soup.find_all("div", {"data-id": True})
 
     def _extract_product_info(self, product_div) -> Optional[Dict]:
         """Extract information from a single product card using stable structural selectors"""
@@ -61,61 +66,39 @@ class FlipkartScraper(BaseScraper):
             if not product_id:
                 return None
 
-            # Product link — find any <a> that contains /p/ in href (stable URL pattern)
-            link_element = product_div.find("a", href=re.compile(r"/p/"))
-            if not link_element:
+            # One walk over the card fills every field
+            fields = CARD_SPEC.extract(product_div)
+
+            # Product link — any <a> that contains /p/ in href (stable URL pattern)
+            link_element = fields.get("link")
+            if link_element is None:
                 return None
 
             url = self.base_url + link_element["href"] if link_element.get("href") else None
 
             # Title — from image alt text (most reliable) or parsed from URL
             title = None
-            img_element = product_div.find("img", src=re.compile(r"rukminim|flixcart"))
-            if img_element and img_element.get("alt"):
+            img_element = fields.get("image")
+            if img_element is not None and img_element.get("alt"):
                 title = img_element["alt"]
 
             if not title and url:
-                match = re.search(r"/([^/]+)/p/", url)
+                match = TITLE_FROM_URL.search(url)
                 if match:
                     title = match.group(1).replace("-", " ").title()
 
             if not title:
                 return None
 
-            image_url = img_element["src"] if img_element and img_element.get("src") else None
-
-            # Price — find text nodes containing ₹ symbol
-            price = None
-            for tag in product_div.find_all(string=re.compile(r"₹")):
-                cleaned = clean_price(tag.strip())
-                if cleaned and cleaned > 100:  # ignore delivery charges etc.
-                    price = cleaned
-                    break
-
-            # Rating — find a tag whose text looks like a rating (e.g. "4.2")
-            rating = None
-            for tag in product_div.find_all(string=re.compile(r"^\d\.\d$")):
-                try:
-                    rating = float(tag.strip())
-                    break
-                except ValueError:
-                    continue
-
-            # Reviews — find text like "(1,234)" or "1,234 Ratings"
-            reviews = "0"
-            reviews_match = product_div.find(
-                string=re.compile(r"\d[\d,]+\s*(Ratings|Reviews|ratings|reviews)")
-            )
-            if reviews_match:
-                reviews = reviews_match.strip()
+            image_url = img_element["src"] if img_element is not None and img_element.get("src") else None
 
             return {
                 "platform": self.platform,
                 "product_id": product_id,
                 "title": title,
-                "price": price,
-                "rating": rating,
-                "reviews": reviews,
+                "price": fields.get("price"),
+                "rating": fields.get("rating"),
+                "reviews": fields.get("reviews", "0"),
                 "url": url,
                 "image_url": image_url,
                 "category": None,
@@ -0,0 +1,341 @@
+# src/scrapers/snapshot_store.py
+"""
+Content-addressed store of raw search-result HTML.
+
+Layout under ``settings.snapshot_dir``::
+
+    blobs/<ab>/<sha256>.html.gz|.html.zst    compressed page, stored once per content
+    blobs/<ab>/<sha256>.<extractor>.json.gz  products extracted from that page
+    index/<platform>/<query>.jsonl           one line per fetch: page, timestamp, sha256, url
+    index/<platform>/<query>.latest.json     {page: sha256} of the most recent fetch
+
+Pages are kept so selectors can be fixed, or fields added, by re-running
+extraction offline (see replay_snapshots.py) instead of re-scraping live.
+Retention is bounded by ``snapshot_max_age_days`` and ``snapshot_max_bytes``:
+prune() drops expired index records and the blobs no record still uses. It
+runs from save() every ``snapshot_prune_interval`` seconds and on demand via
+``replay_snapshots.py --prune``.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# zstd is optional; gzip is always available
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+def _slug(query: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-") or "_"
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    """Compressed, content-hash-addressed snapshots of fetched pages"""
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None):
+        self.root = root or settings.snapshot_dir
+        codec = codec or settings.snapshot_codec
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed, snapshots fall back to gzip")
+            codec = "gzip"
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    # ── Paths ─────────────────────────────────────────────────────────────
+    def _blob_dir(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2])
+
+    def _index_base(self, platform: str, query: str) -> str:
+        return os.path.join(self.root, "index", platform, _slug(query))
+
+    def _find_blob(self, digest: str) -> Optional[str]:
+        for ext in (".html.zst", ".html.gz"):
+            path = os.path.join(self._blob_dir(digest), digest + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    # ── Compression ───────────────────────────────────────────────────────
+    def _compress(self, data: bytes) -> Tuple[bytes, str]:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=6).compress(data), ".html.zst"
+        return gzip.compress(data, compresslevel=6), ".html.gz"
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    # ── Write path ────────────────────────────────────────────────────────
+    def last_digest(self, platform: str, query: str, page: int) -> Optional[str]:
+        """sha256 of the most recent snapshot for this query page"""
+        path = self._index_base(platform, query) + ".latest.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get(str(page))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, platform: str, query: str, page: int, url: str, html: str) -> Tuple[str, bool]:
+        """
+        Store a fetched page and index it under platform/query/page/timestamp.
+
+        Returns:
+            (sha256 of the page, True if it matches the last snapshot of this query page)
+        """
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            unchanged = self.last_digest(platform, query, page) == digest
+
+            if self._find_blob(digest) is None:
+                blob, ext = self._compress(data)
+                os.makedirs(self._blob_dir(digest), exist_ok=True)
+                _write_atomic(os.path.join(self._blob_dir(digest), digest + ext), blob)
+
+            base = self._index_base(platform, query)
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            record = {
+                "platform": platform,
+                "query": query,
+                "page": page,
+                "url": url,
+                "sha256": digest,
+                "timestamp": datetime.now().isoformat(),
+            }
+            with open(base + ".jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+            if not unchanged:
+                latest_path = base + ".latest.json"
+                try:
+                    with open(latest_path, encoding="utf-8") as f:
+                        latest = json.load(f)
+                except (OSError, ValueError):
+                    latest = {}
+                latest[str(page)] = digest
+                _write_atomic(latest_path, json.dumps(latest).encode("utf-8"))
+
+        if settings.snapshot_prune_interval and (
+            time.monotonic() - self._last_prune >= settings.snapshot_prune_interval
+        ):
+            self._last_prune = time.monotonic()
+            try:
+                self.prune()
+            except OSError as e:
+                logger.warning(f"⚠️ Snapshot prune failed: {e}")
+
+        return digest, unchanged
+
+    def save_extraction(self, extractor: str, digest: str, result: Tuple[int, List[Dict]]):
+        """
+        Cache extract_page() output for a page so identical pages skip parsing.
+        ``extractor`` names the platform and extractor version that produced it.
+        """
+        card_count, products = result
+        payload = json.dumps({"card_count": card_count, "products": products}).encode("utf-8")
+        os.makedirs(self._blob_dir(digest), exist_ok=True)
+        path = os.path.join(self._blob_dir(digest), f"{digest}.{extractor}.json.gz")
+        _write_atomic(path, gzip.compress(payload))
+
+    def load_extraction(self, extractor: str, digest: str) -> Optional[Tuple[int, List[Dict]]]:
+        """Cached extract_page() output for a page, if any"""
+        path = os.path.join(self._blob_dir(digest), f"{digest}.{extractor}.json.gz")
+        try:
+            with open(path, "rb") as f:
+                payload = json.loads(gzip.decompress(f.read()))
+        except (OSError, ValueError):
+            return None
+        return payload["card_count"], payload["products"]
+
+    # ── Read path ─────────────────────────────────────────────────────────
+    def load(self, digest: str) -> str:
+        """Decompressed HTML of a snapshot"""
+        path = self._find_blob(digest)
+        if path is None:
+            raise KeyError(f"No snapshot with sha256 {digest}")
+        with open(path, "rb") as f:
+            return self._decompress(path, f.read()).decode("utf-8")
+
+    def iter_records(
+        self,
+        platform: Optional[str] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> Iterator[Dict]:
+        """Index records (platform, query, page, url, sha256, timestamp), oldest first per query"""
+        index_root = os.path.join(self.root, "index")
+        if not os.path.isdir(index_root):
+            return
+
+        platforms = [platform] if platform else sorted(os.listdir(index_root))
+        for plat in platforms:
+            plat_dir = os.path.join(index_root, plat)
+            if not os.path.isdir(plat_dir):
+                continue
+            names = (
+                [_slug(query) + ".jsonl"]
+                if query
+                else sorted(n for n in os.listdir(plat_dir) if n.endswith(".jsonl"))
+            )
+            for name in names:
+                path = os.path.join(plat_dir, name)
+                if not os.path.exists(path):
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        if since and datetime.fromisoformat(record["timestamp"]) < since:
+                            continue
+                        yield record
+
+    # ── Retention ─────────────────────────────────────────────────────────
+    def _index_files(self) -> Iterator[str]:
+        index_root = os.path.join(self.root, "index")
+        if not os.path.isdir(index_root):
+            return
+        for plat in sorted(os.listdir(index_root)):
+            plat_dir = os.path.join(index_root, plat)
+            if os.path.isdir(plat_dir):
+                for name in sorted(os.listdir(plat_dir)):
+                    if name.endswith(".jsonl"):
+                        yield os.path.join(plat_dir, name)
+
+    def _blob_files(self) -> Iterator[Tuple[str, str, int]]:
+        """(sha256, path, size) of every page and extraction blob"""
+        blob_root = os.path.join(self.root, "blobs")
+        if not os.path.isdir(blob_root):
+            return
+        for prefix in os.listdir(blob_root):
+            blob_dir = os.path.join(blob_root, prefix)
+            for name in os.listdir(blob_dir):
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(blob_dir, name)
+                yield name.split(".", 1)[0], path, os.path.getsize(path)
+
+    def prune(
+        self, max_age_days: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Drop index records older than ``max_age_days``, then the oldest pages
+        until the blobs fit in ``max_bytes``, and delete unreferenced blobs.
+
+        Args:
+            max_age_days: Record age limit (default settings.snapshot_max_age_days; 0 keeps all)
+            max_bytes: Blob size limit (default settings.snapshot_max_bytes; 0 is unlimited)
+
+        Returns:
+            Counts of removed records and blobs, and bytes freed
+        """
+        max_age_days = settings.snapshot_max_age_days if max_age_days is None else max_age_days
+        max_bytes = settings.snapshot_max_bytes if max_bytes is None else max_bytes
+        cutoff = datetime.now() - timedelta(days=max_age_days) if max_age_days else None
+
+        with self._lock:
+            # Records still in retention, and the newest fetch of each page
+            indexes: Dict[str, List[Dict]] = {}
+            newest: Dict[str, str] = {}
+            removed_records = 0
+            for path in self._index_files():
+                kept = []
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        if cutoff and datetime.fromisoformat(record["timestamp"]) < cutoff:
+                            removed_records += 1
+                            continue
+                        kept.append(record)
+                        newest[record["sha256"]] = max(
+                            newest.get(record["sha256"], ""), record["timestamp"]
+                        )
+                indexes[path] = kept
+
+            blobs = list(self._blob_files())
+            sizes: Dict[str, int] = {}
+            for digest, _, size in blobs:
+                sizes[digest] = sizes.get(digest, 0) + size
+            live = {digest for digest in sizes if digest in newest}
+
+            total = sum(sizes[digest] for digest in live)
+            if max_bytes and total > max_bytes:
+                for digest in sorted(live, key=newest.get):
+                    if total <= max_bytes:
+                        break
+                    live.discard(digest)
+                    total -= sizes[digest]
+
+            freed = removed_blobs = 0
+            for digest, path, size in blobs:
+                if digest not in live:
+                    os.remove(path)
+                    freed += size
+                    removed_blobs += 1
+
+            for path, records in indexes.items():
+                kept = [r for r in records if r["sha256"] in live]
+                removed_records += len(records) - len(kept)
+                base = path[: -len(".jsonl")]
+                if not kept:
+                    os.remove(path)
+                    if os.path.exists(base + ".latest.json"):
+                        os.remove(base + ".latest.json")
+                    continue
+                if len(kept) < len(records):
+                    data = "".join(json.dumps(r) + "\n" for r in kept)
+                    _write_atomic(path, data.encode("utf-8"))
+                try:
+                    with open(base + ".latest.json", encoding="utf-8") as f:
+                        latest = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                current = {page: d for page, d in latest.items() if d in live}
+                if current != latest:
+                    _write_atomic(base + ".latest.json", json.dumps(current).encode("utf-8"))
+
+        if removed_records or removed_blobs:
+            logger.info(
+                f"🧹 Pruned {removed_records} snapshot records, {removed_blobs} blobs "
+                f"({freed / 1e6:.1f} MB)"
+            )
+        return {"records": removed_records, "blobs": removed_blobs, "bytes": freed}
+
+
+# Process-wide store used by the scrapers
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Shared snapshot store, or None when settings.snapshot_enabled is off"""
+    global _store
+    if not settings.snapshot_enabled:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
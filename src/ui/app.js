@@ -83,16 +83,31 @@ document.querySelectorAll('.nav-item').forEach(item => {
 });
 
 // ── API ────────────────────────────────────────────────────────────────────
+// Last ETag and body per GET path; the server answers 304 while they are current
+const etagCache = new Map();
+
 async function apiFetch(path, opts = {}) {
+  const isGet = !opts.method || opts.method.toUpperCase() === 'GET';
+  const cached = isGet ? etagCache.get(path) : null;
   const res = await fetch(API + path, {
-    headers: { 'Content-Type': 'application/json' },
     ...opts,
+    headers: {
+      'Content-Type': 'application/json',
+      ...(cached ? { 'If-None-Match': cached.etag } : {}),
+      ...opts.headers,
+    },
+    // Revalidation is handled here, not by the browser's HTTP cache
+    ...(isGet ? { cache: 'no-store' } : {}),
   });
+  if (res.status === 304 && cached) return cached.data;
   if (!res.ok) {
     const err = await res.json().catch(() => ({ error: res.statusText }));
     throw new Error(err.error || res.statusText);
   }
-  return res.json();
+  const data = await res.json();
+  const etag = res.headers.get('ETag');
+  if (isGet && etag) etagCache.set(path, { etag, data });
+  return data;
 }
 
 // ── Sidebar / health ───────────────────────────────────────────────────────
@@ -162,11 +177,18 @@ async function startCollection() {
   result.className = '';
   result.innerHTML = spinner(`Scraping ${platform.toUpperCase()} for "${query}"…`);
   try {
-    const data = await apiFetch('/api/collect', {
+    const job = await apiFetch('/api/collect', {
       method: 'POST',
       body: JSON.stringify({ search_query: query, platform, category, max_results: max }),
     });
-    if (data.error) throw new Error(data.error);
+    if (job.error) throw new Error(job.error);
+    const data = await waitForJob(job.job_id, j => {
+      const stage = (j.progress && j.progress.stage) || j.state;
+      const scraped = (j.progress && j.progress.scraped) || 0;
+      const saved = (j.progress && j.progress.saved) || 0;
+      result.innerHTML = spinner(`${platform.toUpperCase()} "${query}" — ${stage} (${scraped} scraped, ${saved} saved)…`);
+    });
+    if (!data.total) throw new Error('No products found');
     const products = data.products || [];
     const stats = data.stats || {};
     result.innerHTML = `
@@ -202,6 +224,17 @@ async function startCollection() {
   }
 }
 
+// Poll a background job until it finishes; resolves with the job result
+async function waitForJob(jobId, onProgress, intervalMs = 1000) {
+  while (true) {
+    const job = await apiFetch(`/api/jobs/${jobId}`);
+    if (job.state === 'succeeded') return job.result || {};
+    if (job.state === 'failed') throw new Error(job.error || 'Job failed');
+    if (onProgress) onProgress(job);
+    await new Promise(r => setTimeout(r, intervalMs));
+  }
+}
+
 // ── Explorer — Multi-search ────────────────────────────────────────────────
 async function runMultiSearch() {
   const query = $('ms-query').value.trim();
@@ -262,46 +295,72 @@ async function runMultiSearch() {
 }
 
 // ── Explorer — Browse ──────────────────────────────────────────────────────
-async function loadBrowse() {
-  const platform = $('br-platform').value;
-  const view = $('br-view').value;
+let browseQuery  = '';     // filters of the pages shown in Browse
+let browseCursor = null;   // next_cursor of the last page, null once all are shown
+
+const browseRow = p => `<tr>
+  <td class="td-title">${p.title || '—'}</td>
+  <td>${platformBadge((p.platform || '?').toUpperCase())}</td>
+  <td>${fmtPrice(p.current_price)}</td>
+  <td>${p.current_rating ? p.current_rating.toFixed(1) : '—'}</td>
+  <td>${trendBadge(p.price_trend || 'stable')}</td>
+  <td>${p.price_change_percent != null ? p.price_change_percent.toFixed(1) + '%' : '0%'}</td>
+  <td class="dimmed">${p.times_scraped || 0}</td>
+</tr>`;
+
+function renderBrowse() {
+  $('browseResult').innerHTML = `
+    <div class="card">
+      <div class="card-title">Results — ${allProducts.length}${browseCursor ? '+' : ''} products</div>
+      <div class="tbl-wrap">
+        <table>
+          <thead><tr><th>Product</th><th>Platform</th><th>Price</th><th>Rating</th><th>Trend</th><th>Change</th><th>Scrapes</th></tr></thead>
+          <tbody>${allProducts.map(browseRow).join('')}</tbody>
+        </table>
+      </div>
+      ${browseCursor ? `<div class="mt-4"><button class="btn btn-secondary btn-sm" id="btnBrowseMore" onclick="loadBrowse(true)">Load more</button></div>` : ''}
+    </div>`;
+}
+
+// more = append the next page of the current results instead of starting over
+async function loadBrowse(more = false) {
   const result = $('browseResult');
-  result.innerHTML = spinner('Loading products…');
+  if (more) {
+    const btn = $('btnBrowseMore');
+    btn.disabled = true;
+    btn.textContent = 'Loading…';
+  } else {
+    browseQuery = `platform=${$('br-platform').value}&view=${$('br-view').value}`;
+    browseCursor = null;
+    result.innerHTML = spinner('Loading products…');
+  }
+  const query = browseQuery;
   try {
-    const products = await apiFetch(`/api/products?platform=${platform}&view=${view}&limit=100`);
-    allProducts = products;
+    const cursor = more ? `&cursor=${encodeURIComponent(browseCursor)}` : '';
+    const { products, next_cursor } = await apiFetch(`/api/products?${query}&limit=100${cursor}`);
+    if (query !== browseQuery) return;   // filters changed while this page loaded
+    allProducts = more ? allProducts.concat(products) : products;
+    browseCursor = next_cursor;
     updateCompareSelects();
-    if (!products.length) {
+    if (!allProducts.length) {
       result.innerHTML = notice('info', 'No products found for the selected filters.');
       return;
     }
-    result.innerHTML = `
-      <div class="card">
-        <div class="card-title">Results — ${products.length} products</div>
-        <div class="tbl-wrap">
-          <table>
-            <thead><tr><th>Product</th><th>Platform</th><th>Price</th><th>Rating</th><th>Trend</th><th>Change</th><th>Scrapes</th></tr></thead>
-            <tbody>${products.map(p => `<tr>
-              <td class="td-title">${p.title || '—'}</td>
-              <td>${platformBadge((p.platform || '?').toUpperCase())}</td>
-              <td>${fmtPrice(p.current_price)}</td>
-              <td>${p.current_rating ? p.current_rating.toFixed(1) : '—'}</td>
-              <td>${trendBadge(p.price_trend || 'stable')}</td>
-              <td>${p.price_change_percent != null ? p.price_change_percent.toFixed(1) + '%' : '0%'}</td>
-              <td class="dimmed">${p.times_scraped || 0}</td>
-            </tr>`).join('')}</tbody>
-          </table>
-        </div>
-      </div>`;
+    renderBrowse();
   } catch (e) {
-    result.innerHTML = notice('error', e.message);
+    if (more) {
+      toast(e.message, 'error');
+      renderBrowse();
+    } else {
+      result.innerHTML = notice('error', e.message);
+    }
   }
 }
 
 // ── Explorer — Compare Selects ─────────────────────────────────────────────
 async function loadCompareSelects() {
   try {
-    if (!allProducts.length) allProducts = await apiFetch('/api/products?limit=200');
+    if (!allProducts.length) allProducts = (await apiFetch('/api/products?limit=200')).products;
     updateCompareSelects();
   } catch { /* ignore */ }
 }
@@ -0,0 +1,105 @@
+# src/utils/circuit_breaker.py
+"""
+Per-domain circuit breakers for scraper fetches.
+
+closed     requests flow; consecutive failures are counted
+open       requests fail fast until the cooldown has passed
+half_open  one probe request is let through; success closes the
+           breaker, failure re-opens it for another cooldown
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from config.settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Trips after ``failure_threshold`` consecutive failures"""
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started: Optional[float] = None
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self.probe_started = None
+
+            if self.state == CLOSED:
+                return True
+            # Half-open: a single probe at a time (a stuck probe is replaced after a cooldown)
+            if self.state == HALF_OPEN and (
+                self.probe_started is None or now - self.probe_started >= self.cooldown
+            ):
+                self.probe_started = now
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probe_started = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in_seconds": retry_in,
+            }
+
+
+# Process-wide breakers keyed by domain
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(domain: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(domain)
+        if breaker is None:
+            breaker = _breakers[domain] = CircuitBreaker(
+                settings.breaker_failure_threshold, settings.breaker_cooldown_seconds
+            )
+        return breaker
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict]:
+    """Breaker state per domain"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {domain: breaker.stats() for domain, breaker in breakers.items()}
@@ -0,0 +1,177 @@
+# src/utils/exporters.py
+"""
+Streaming NDJSON / CSV / Parquet encoders for data exports.
+
+Each encoder consumes an iterator of documents and yields encoded chunks
+of ``batch_size`` rows, so an export of any size holds at most one batch
+in memory. Parquet chunks are row groups, flushed to the response as soon
+as they are written.
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.utils import serialization
+
+# pyarrow is optional; NDJSON and CSV are always available
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# (column, type) in export order; type is one of string/float/int/bool/timestamp
+PRODUCT_COLUMNS: List[Tuple[str, str]] = [
+    ("unique_id", "string"),
+    ("platform", "string"),
+    ("product_id", "string"),
+    ("title", "string"),
+    ("category", "string"),
+    ("current_price", "float"),
+    ("current_rating", "float"),
+    ("current_reviews", "string"),
+    ("in_stock", "bool"),
+    ("price_trend", "string"),
+    ("price_change_percent", "float"),
+    ("lowest_price", "float"),
+    ("highest_price", "float"),
+    ("average_price", "float"),
+    ("times_scraped", "int"),
+    ("first_seen", "timestamp"),
+    ("last_seen", "timestamp"),
+    ("updated_at", "timestamp"),
+    ("url", "string"),
+    ("image_url", "string"),
+]
+
+PRICE_HISTORY_COLUMNS: List[Tuple[str, str]] = [
+    ("unique_id", "string"),
+    ("timestamp", "timestamp"),
+    ("price", "float"),
+    ("rating", "float"),
+]
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_CASTS = {"string": str, "float": float, "int": int, "bool": bool, "timestamp": lambda v: v}
+
+
+def fields_for(columns: List[Tuple[str, str]]) -> Dict:
+    """MongoDB projection reading exactly ``columns``"""
+    return {"_id": 0, **{name: 1 for name, _ in columns}}
+
+
+def _cast(value, kind: str):
+    if value is None or value == "":
+        return None
+    try:
+        return _CASTS[kind](value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _batches(docs: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(docs: Iterable[Dict], columns, batch_size: int) -> Iterator[bytes]:
+    for batch in _batches(docs, batch_size):
+        yield b"".join(serialization.dumps(doc) + b"\n" for doc in batch)
+
+
+def csv_chunks(docs: Iterable[Dict], columns, batch_size: int) -> Iterator[bytes]:
+    names = [name for name, _ in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in _batches(docs, batch_size):
+        for doc in batch:
+            row = []
+            for name in names:
+                value = doc.get(name)
+                row.append(value.isoformat() if isinstance(value, datetime) else value)
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: empty export
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes out in chunks"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so count what was drained too
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_chunks(docs: Iterable[Dict], columns, batch_size: int) -> Iterator[bytes]:
+    """One Parquet row group per batch"""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    arrow_types = {
+        "string": pa.string(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("ms"),
+    }
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in _batches(docs, batch_size):
+            table = pa.Table.from_pydict(
+                {name: [_cast(doc.get(name), kind) for doc in batch] for name, kind in columns},
+                schema=schema,
+            )
+            writer.write_table(table, row_group_size=len(batch))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {"ndjson": ndjson_chunks, "csv": csv_chunks, "parquet": parquet_chunks}
+
+
+def export_chunks(docs: Iterable[Dict], columns, fmt: str, batch_size: int) -> Iterator[bytes]:
+    """Encoded chunks of ``docs`` in ``fmt`` (see EXPORT_FORMATS)"""
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {sorted(ENCODERS)}")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet export needs pyarrow, which is not installed")
+    return ENCODERS[fmt](docs, columns, max(1, batch_size))
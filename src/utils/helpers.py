@@ -56,6 +56,21 @@ def random_delay(min_seconds: float = 1, max_seconds: float = 3):
     time.sleep(random.uniform(min_seconds, max_seconds))
 
 
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter
+
+    Args:
+        attempt: Retry number, starting at 0
+        base: Delay scale in seconds
+        cap: Upper bound on the delay
+
+    Returns:
+        Seconds to sleep, uniform in [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
 def extract_product_id(url: str, platform: str) -> Optional[str]:
     """Extract product ID from URL"""
     if platform == "amazon":
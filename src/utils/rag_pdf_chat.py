@@ -3,25 +3,32 @@
 Ephemeral RAG engine for user-uploaded PDFs.
 
 Design constraints:
-  - Fully in-memory: no ChromaDB is persisted to disk, no data saved to MongoDB.
   - Each uploaded PDF gets its own session keyed by a UUID.
-  - Sessions expire (LRU eviction) after MAX_SESSIONS uploads to avoid memory bloat.
+  - The embedded chunks are stored in MongoDB (pdf_chunks, expired after
+    settings.pdf_session_ttl_seconds), so any server worker can answer a
+    session, whichever worker ingested it. Nothing is written to disk.
+  - Each process keeps the Chroma vectorstores of its MAX_SESSIONS most recently
+    used sessions in memory (LRU); an evicted or unseen session is rebuilt from
+    the stored embeddings without calling the embedding API again.
   - Uses LangChain + GoogleGenerativeAI embeddings + Chroma in-memory vectorstore.
   - Query side uses Gemini 2.5-flash via the google-genai client (same as the existing
     chat.py so we reuse the same API key).
 """
 
-import io
+import os
 import uuid
 import logging
+import threading
 from collections import OrderedDict
 from typing import Optional
 
+import chromadb
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
+from src.database.mongo_manager import db_manager
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -30,17 +37,97 @@ logger = logging.getLogger(__name__)
 CHUNK_SIZE    = 800
 CHUNK_OVERLAP = 150
 TOP_K         = 5
-MAX_SESSIONS  = 10          # keep at most 10 in-memory sessions
+MAX_SESSIONS  = 10          # keep at most 10 vectorstores in memory per process
 
-# ── Session store: session_id → { vectorstore, filename, page_count } ─────────
+# ── Session cache: session_id → { vectorstore, filename, page_count, chunk_count }
 _sessions: "OrderedDict[str, dict]" = OrderedDict()
+_sessions_lock = threading.Lock()  # request threads share the cache
+
+
+def _reset_after_fork():
+    # Vectorstores (and their clients) belong to the parent process; the
+    # child rebuilds the sessions it is asked about from MongoDB
+    global _sessions_lock
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _embeddings() -> GoogleGenerativeAIEmbeddings:
+    return GoogleGenerativeAIEmbeddings(
+        model="models/gemini-embedding-001",
+        google_api_key=settings.gemini_api_key,
+    )
+
+
+def _build_vectorstore(session_id: str, chunks: list) -> Chroma:
+    """In-memory Chroma collection over already embedded chunks"""
+    client = chromadb.EphemeralClient()
+    collection_name = f"pdf-{session_id}"
+    collection = client.get_or_create_collection(collection_name)
+    collection.add(
+        ids=[str(i) for i in range(len(chunks))],
+        documents=[c["text"] for c in chunks],
+        metadatas=[c["metadata"] for c in chunks],
+        embeddings=[c["embedding"] for c in chunks],
+    )
+    return Chroma(
+        client=client,
+        collection_name=collection_name,
+        embedding_function=_embeddings(),
+    )
+
+
+def _cache_session(session_id: str, sess: dict) -> dict:
+    """Add a session to this process's LRU; returns the cached entry"""
+    evicted = []
+    with _sessions_lock:
+        if session_id in _sessions:
+            # Another thread rebuilt it first; keep theirs
+            evicted.append(sess)
+            sess = _sessions[session_id]
+        else:
+            _sessions[session_id] = sess
+            # Evict oldest sessions if we're over the cap
+            while len(_sessions) > MAX_SESSIONS:
+                evicted_id, old = _sessions.popitem(last=False)
+                evicted.append(old)
+                logger.info(f"RAG: evicted session {evicted_id} from memory (cap reached)")
+        _sessions.move_to_end(session_id)
+    for old in evicted:
+        old["vectorstore"].delete_collection()
+    return sess
+
+
+def _load_session(session_id: str) -> Optional[dict]:
+    """Cached session, rebuilt from MongoDB if this process doesn't hold it"""
+    with _sessions_lock:
+        sess = _sessions.get(session_id)
+        if sess is not None:
+            # Touch to keep it fresh (move to end of LRU)
+            _sessions.move_to_end(session_id)
+            return sess
+
+    chunks = db_manager.get_pdf_chunks(session_id)
+    if not chunks:
+        return None
+    logger.info(f"RAG: loading session {session_id} ({len(chunks)} chunks) from MongoDB")
+    return _cache_session(session_id, {
+        "vectorstore": _build_vectorstore(session_id, chunks),
+        "filename":    chunks[0]["filename"],
+        "page_count":  chunks[0]["page_count"],
+        "chunk_count": chunks[0]["chunk_count"],
+    })
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
 def ingest_pdf(pdf_bytes: bytes, filename: str) -> str:
     """
-    Chunk + embed a PDF file and store the vectorstore in memory.
+    Chunk + embed a PDF file, store the chunks in MongoDB and cache the
+    vectorstore in memory.
 
     Args:
         pdf_bytes:  Raw bytes of the uploaded PDF.
@@ -52,11 +139,6 @@ def ingest_pdf(pdf_bytes: bytes, filename: str) -> str:
     Raises:
         ValueError  If the PDF contains no extractable text.
     """
-    # Evict oldest session if we're at the cap
-    while len(_sessions) >= MAX_SESSIONS:
-        evicted_id, _ = _sessions.popitem(last=False)
-        logger.info(f"RAG: evicted session {evicted_id} (cap reached)")
-
     # Write bytes to a NamedTemporaryFile so PyPDFLoader can open it
     import tempfile, os
     with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
@@ -91,25 +173,18 @@ def ingest_pdf(pdf_bytes: bytes, filename: str) -> str:
 
     logger.info(f"RAG: '{filename}' → {len(pages)} pages, {len(chunks)} chunks")
 
-    # Build in-memory Chroma (no persist_directory = stays in RAM)
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/gemini-embedding-001",
-        google_api_key=settings.gemini_api_key,
-    )
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-    )
+    # Embed once; the vectors are stored so other workers skip this step
+    texts = [chunk.page_content for chunk in chunks]
+    vectors = _embeddings().embed_documents(texts)
+    stored = [
+        {"text": text, "metadata": chunk.metadata, "embedding": vector}
+        for text, chunk, vector in zip(texts, chunks, vectors)
+    ]
+    info = {"filename": filename, "page_count": len(pages), "chunk_count": len(chunks)}
 
     session_id = str(uuid.uuid4())
-    _sessions[session_id] = {
-        "vectorstore": vectorstore,
-        "filename":    filename,
-        "page_count":  len(pages),
-        "chunk_count": len(chunks),
-    }
-    # Move to end (most recently used)
-    _sessions.move_to_end(session_id)
+    db_manager.save_pdf_chunks(session_id, info, stored)
+    _cache_session(session_id, dict(info, vectorstore=_build_vectorstore(session_id, stored)))
 
     logger.info(f"RAG: new session {session_id} for '{filename}'")
     return session_id
@@ -117,7 +192,7 @@ def ingest_pdf(pdf_bytes: bytes, filename: str) -> str:
 
 def get_session_info(session_id: str) -> Optional[dict]:
     """Return metadata about a session (filename, page_count) or None."""
-    sess = _sessions.get(session_id)
+    sess = _load_session(session_id)
     if not sess:
         return None
     return {"filename": sess["filename"], "page_count": sess["page_count"], "chunk_count": sess["chunk_count"]}
@@ -136,16 +211,13 @@ def answer(session_id: str, question: str, history: list) -> str:
         The AI's reply string.
 
     Raises:
-        KeyError   If session_id is not found.
+        KeyError   If session_id is not found (deleted or expired).
         Exception  On Gemini or retrieval error.
     """
-    if session_id not in _sessions:
+    sess = _load_session(session_id)
+    if sess is None:
         raise KeyError(f"Session '{session_id}' not found. The PDF may have been cleared.")
 
-    sess = _sessions[session_id]
-    # Touch to keep it fresh (move to end of LRU)
-    _sessions.move_to_end(session_id)
-
     vectorstore: Chroma = sess["vectorstore"]
 
     # ── Retrieve top-k chunks ─────────────────────────────────────────────
@@ -199,9 +271,13 @@ Assistant:"""
 
 
 def delete_session(session_id: str) -> bool:
-    """Remove a session from memory. Returns True if it existed."""
-    if session_id in _sessions:
-        del _sessions[session_id]
+    """Remove a session from memory and MongoDB. Returns True if it existed."""
+    with _sessions_lock:
+        sess = _sessions.pop(session_id, None)
+    if sess is not None:
+        sess["vectorstore"].delete_collection()
+    existed = db_manager.delete_pdf_chunks(session_id)
+    if existed:
         logger.info(f"RAG: deleted session {session_id}")
         return True
     return False
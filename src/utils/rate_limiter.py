@@ -0,0 +1,110 @@
+# src/utils/rate_limiter.py
+"""
+Per-domain token-bucket rate limiter shared by every scraper thread and
+asyncio task in the process.
+
+Callers reserve a token under a lock and then sleep outside it, so waiters
+are served in arrival order and idle domains are never delayed.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 1e-6)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, possibly one not yet refilled; return seconds to wait for it"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def current_wait(self) -> float:
+        """Seconds a new request would wait right now"""
+        self._refill(time.monotonic())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by domain, with wait-time metrics"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, domain: str, rate: float, burst: int) -> float:
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None or (bucket.rate, bucket.burst) != (rate, burst):
+                bucket = self._buckets[domain] = TokenBucket(rate, burst)
+            wait = bucket.reserve()
+
+            m = self._metrics.setdefault(
+                domain, {"requests": 0, "waited": 0, "total_wait": 0.0, "max_wait": 0.0}
+            )
+            m["requests"] += 1
+            m["last_wait"] = wait
+            if wait > 0:
+                m["waited"] += 1
+                m["total_wait"] += wait
+                m["max_wait"] = max(m["max_wait"], wait)
+        return wait
+
+    def acquire(self, domain: str, rate: float, burst: int) -> float:
+        """Block the calling thread until a request to ``domain`` is allowed"""
+        wait = self._reserve(domain, rate, burst)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, domain: str, rate: float, burst: int) -> float:
+        """Await until a request to ``domain`` is allowed"""
+        wait = self._reserve(domain, rate, burst)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-domain rate, burst, current wait and wait history"""
+        with self._lock:
+            out = {}
+            for domain, bucket in self._buckets.items():
+                m = self._metrics.get(domain, {})
+                out[domain] = {
+                    "rate_per_second": bucket.rate,
+                    "burst": bucket.burst,
+                    "current_wait_seconds": round(bucket.current_wait(), 3),
+                    "requests": m.get("requests", 0),
+                    "delayed_requests": m.get("waited", 0),
+                    "avg_wait_seconds": (
+                        round(m["total_wait"] / m["requests"], 3) if m.get("requests") else 0.0
+                    ),
+                    "max_wait_seconds": round(m.get("max_wait", 0.0), 3),
+                }
+            return out
+
+
+# Process-wide limiter shared by all scrapers
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,192 @@
+# src/utils/response_cache.py
+"""
+Cache of rendered API responses, invalidated by data version counters.
+
+Keys combine the route, its normalized query args and a data version: the
+write counters of the collections the route reads, kept in MongoDB
+(MongoDBManager.data_version). Every write bumps them, whichever process
+made it, so every entry cached before the write stops matching at once in
+every worker; stale entries then age out via LRU/TTL instead of being
+deleted one by one.
+
+Entries are plain dicts: {"status", "mimetype", "headers", "body"}, the
+body as bytes. Rebuilding a response from one needs no code from the cache.
+
+Backends:
+    memory  per-process LRU with a TTL (default)
+    redis   entries shared by every worker process; needs the redis
+            package and settings.response_cache_redis_url
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings
+from src.utils import serialization
+import logging
+
+logger = logging.getLogger(__name__)
+
+# redis is optional; the in-memory backend is always available
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryCacheBackend:
+    """Thread-safe LRU of at most ``max_entries`` values, each living ``ttl`` seconds"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+def _encode_entry(entry: Dict) -> bytes:
+    """Redis form of an entry: one JSON line of metadata, then the raw body"""
+    meta = {k: v for k, v in entry.items() if k != "body"}
+    return serialization.dumps(meta) + b"\n" + entry["body"]
+
+
+def _decode_entry(data: bytes) -> Dict:
+    # JSON escapes newlines, so the first one ends the metadata
+    meta, _, body = data.partition(b"\n")
+    return dict(serialization.loads(meta), body=body)
+
+
+class RedisCacheBackend:
+    """
+    Entries in Redis, shared across processes. Stored as data (JSON
+    metadata plus body bytes), never pickled, so a value in Redis cannot
+    run code when it is read.
+    """
+
+    def __init__(self, url: str, ttl: float):
+        self.client = redis.Redis.from_url(url)
+        self.ttl = max(1, int(ttl))
+        self.evictions = 0  # Redis evicts on its own
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.client.get(f"response_cache:{key}")
+        return _decode_entry(data) if data is not None else None
+
+    def set(self, key: str, value: Dict):
+        self.client.set(f"response_cache:{key}", _encode_entry(value), ex=self.ttl)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class ResponseCache:
+    """Versioned response cache with per-route hit/miss metrics"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(route: str, args, version: Tuple[int, ...]) -> str:
+        """
+        ``args`` is a list of (name, value) pairs; order and blanks don't
+        matter. ``version`` is the data version the response is valid for.
+        """
+        query = "&".join(f"{k}={v}" for k, v in sorted(args) if v != "")
+        return f"v{'.'.join(map(str, version))}:{route}?{query}"
+
+    def _count(self, route: str, outcome: str):
+        with self._lock:
+            m = self._metrics.setdefault(route, {"hits": 0, "misses": 0, "errors": 0})
+            m[outcome] += 1
+
+    def get(self, route: str, args, version: Tuple[int, ...]) -> tuple:
+        """(key, cached value or None) for a request at a data version"""
+        key = self.make_key(route, args, version)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            # A broken shared backend must not take the API down
+            logger.warning(f"⚠️ Response cache unavailable: {e}")
+            self._count(route, "errors")
+            return None, None
+        self._count(route, "hits" if value is not None else "misses")
+        return key, value
+
+    def set(self, key: Optional[str], value: Any):
+        if key is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache unavailable: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            routes = {route: dict(m) for route, m in self._metrics.items()}
+        hits = sum(m["hits"] for m in routes.values())
+        misses = sum(m["misses"] for m in routes.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "evictions": self.backend.evictions,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "routes": routes,
+        }
+
+
+# Process-wide cache used by the API
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Shared response cache, or None when settings.response_cache_enabled is off"""
+    global _cache
+    if not settings.response_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            backend = None
+            if settings.response_cache_backend == "redis":
+                if REDIS_AVAILABLE and settings.response_cache_redis_url:
+                    backend = RedisCacheBackend(
+                        settings.response_cache_redis_url, settings.response_cache_ttl_seconds
+                    )
+                else:
+                    logger.warning("redis not configured, response cache falls back to memory")
+            if backend is None:
+                backend = MemoryCacheBackend(
+                    settings.response_cache_max_entries, settings.response_cache_ttl_seconds
+                )
+            _cache = ResponseCache(backend)
+        return _cache
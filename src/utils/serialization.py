@@ -0,0 +1,73 @@
+# src/utils/serialization.py
+"""
+JSON encoding of MongoDB documents for API responses.
+
+One encoder for every endpoint: ObjectId and datetime are handled by a
+``default`` hook called only for values JSON has no type for, so a whole
+list of documents (nested dicts and lists included) is encoded in a
+single pass, without copying it into JSON-safe dicts first.
+
+orjson is used when installed; the stdlib json module is the fallback.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional; stdlib json is always available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any) -> Any:
+    """JSON form of the BSON types json and orjson don't know"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    if type(value).__module__.startswith("bson"):
+        # Decimal128, Binary, Timestamp, ...
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """UTF-8 JSON of documents, lists of documents or any JSON-like value"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj, default=_default, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Copy of ``obj`` with only JSON types (ObjectId/datetime become strings)"""
+    return loads(dumps(obj))
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider so jsonify() takes raw MongoDB documents"""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys)).decode("utf-8")
+
+    def loads(self, s, **kwargs) -> Any:
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps(obj, sort_keys=self.sort_keys), mimetype=self.mimetype
+        )
@@ -0,0 +1,205 @@
+# tests/test_driver_pool.py
+import time
+from types import SimpleNamespace
+
+import pytest
+from config.settings import settings
+from src.scrapers import base_scraper
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.base_scraper import BLOCKED_RESOURCE_PATTERNS, BaseScraper, DriverPool
+
+
+class FakeDriver:
+    """Stand-in for a Chrome WebDriver"""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverPool:
+    """Test the pooled Chrome driver lifecycle"""
+
+    def test_driver_is_reused(self):
+        """Test that a released driver is handed out again"""
+        pool = DriverPool(FakeDriver, max_size=1)
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+        assert first is second
+        assert pool.stats()["checkouts"] == 2
+
+    def test_recycle_after_max_pages(self):
+        """Test that a driver is replaced after max_pages loads"""
+        pool = DriverPool(FakeDriver, max_size=1, max_pages=2)
+        drivers = []
+        for _ in range(3):
+            with pool.checkout() as driver:
+                drivers.append(driver)
+        assert drivers[0] is drivers[1]
+        assert drivers[2] is not drivers[0]
+        assert drivers[0].quit_called
+        assert pool.stats()["recycled"] == 1
+
+    def test_crash_discards_driver(self):
+        """Test that an exception during a fetch recycles the driver"""
+        pool = DriverPool(FakeDriver, max_size=1)
+        with pytest.raises(ValueError):
+            with pool.checkout() as driver:
+                raise ValueError("boom")
+        assert driver.quit_called
+        assert pool.stats()["crashed"] == 1
+        assert pool.stats()["size"] == 0
+
+    def test_unhealthy_driver_replaced(self):
+        """Test that a dead idle driver fails the health check"""
+        pool = DriverPool(FakeDriver, max_size=1)
+        with pool.checkout() as driver:
+            pass
+        driver.alive = False
+        with pool.checkout() as replacement:
+            pass
+        assert replacement is not driver
+
+    def test_checkout_timeout(self):
+        """Test that a full pool times out instead of blocking forever"""
+        pool = DriverPool(FakeDriver, max_size=1, checkout_timeout=0.05)
+        entry = pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+        pool.release(entry)
+
+
+class RenderingDriver:
+    """Driver whose results grid renders ``counts[i]`` cards on the i-th poll"""
+
+    def __init__(self, counts, state="complete", text=""):
+        self.counts = list(counts)
+        self.state = state
+        self.text = text
+        self.polls = 0
+
+    def find_elements(self, by, selector):
+        count = self.counts[min(self.polls, len(self.counts) - 1)]
+        self.polls += 1
+        return [object()] * count
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            return self.state
+        return any(marker in self.text for marker in args[0])
+
+
+class GridScraper(BaseScraper):
+    platform = "grid"
+    ready_selector = "div.card"
+    ready_min_count = 4
+    no_results_text = ("No results for",)
+
+
+class TestWaitUntilReady:
+    """Test waiting for the results grid instead of a fixed sleep"""
+
+    @pytest.fixture(autouse=True)
+    def fast_polls(self, monkeypatch):
+        monkeypatch.setattr(settings, "page_ready_timeout", 0.5)
+        monkeypatch.setattr(settings, "page_ready_poll", 0.01)
+        base_scraper._ready_timings.clear()
+
+    def timed_out(self):
+        return [timed_out for _, timed_out in base_scraper._ready_timings["grid"]]
+
+    def test_returns_once_enough_cards_render(self):
+        """Test that reaching ready_min_count ends the wait"""
+        driver = RenderingDriver([0, 2, 6], state="interactive")
+        assert GridScraper().wait_until_ready(driver) < 0.3
+        assert driver.polls == 3
+        assert self.timed_out() == [False]
+
+    def test_times_out_while_nothing_renders(self):
+        """Test that a page that never shows cards waits the full timeout"""
+        start = time.monotonic()
+        GridScraper().wait_until_ready(RenderingDriver([0], state="loading"))
+        assert time.monotonic() - start >= 0.5
+        assert self.timed_out() == [True]
+
+    def test_no_results_page_returns_early(self):
+        """Test that a loaded page with the no-results text is ready at once"""
+        driver = RenderingDriver([0], text='No results for "zzxq".')
+        assert GridScraper().wait_until_ready(driver) < 0.3
+        assert driver.polls == 1
+        assert self.timed_out() == [False]
+
+    def test_empty_page_without_marker_keeps_waiting(self):
+        """Test that zero cards alone is not taken as an empty result"""
+        GridScraper().wait_until_ready(RenderingDriver([0], text="Loading..."))
+        assert self.timed_out() == [True]
+
+    def test_sparse_last_page_returns_once_cards_stop_arriving(self):
+        """Test that a loaded page with fewer cards than the minimum is ready when stable"""
+        driver = RenderingDriver([1, 2, 3, 3])
+        assert GridScraper().wait_until_ready(driver) < 0.3
+        assert driver.polls == 4
+        assert self.timed_out() == [False]
+
+    def test_sparse_page_waits_for_load(self):
+        """Test that a steady count does not count while the document is still loading"""
+        GridScraper().wait_until_ready(RenderingDriver([2], state="interactive"))
+        assert self.timed_out() == [True]
+
+
+class CdpDriver:
+    """Chrome stand-in recording the options it was started with and its CDP commands"""
+
+    def __init__(self, service=None, options=None):
+        self.options = options
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+
+class TestResourceBlocking:
+    """Test which requests pooled Chrome drivers refuse to make"""
+
+    @pytest.fixture(autouse=True)
+    def fake_chrome(self, monkeypatch):
+        monkeypatch.setattr(base_scraper.webdriver, "Chrome", CdpDriver)
+        monkeypatch.setattr(base_scraper, "Service", lambda path: None)
+        monkeypatch.setattr(
+            base_scraper, "ChromeDriverManager", lambda: SimpleNamespace(install=lambda: "chromedriver")
+        )
+
+    def test_platform_patterns_extend_the_defaults(self):
+        """Test that a platform's extra patterns are blocked along with every default"""
+        patterns = AmazonScraper().blocked_url_patterns()
+        assert patterns[:len(BLOCKED_RESOURCE_PATTERNS)] == list(BLOCKED_RESOURCE_PATTERNS)
+        assert set(AmazonScraper.extra_blocked_urls) <= set(patterns)
+        assert {"*.png", "*.woff2", "*.css", "*doubleclick.net*"} <= set(patterns)
+        assert BaseScraper().blocked_url_patterns() == list(BLOCKED_RESOURCE_PATTERNS)
+
+    def test_setup_driver_sends_blocked_urls_over_cdp(self):
+        """Test that a blocking driver enables Network and sets the platform's patterns"""
+        scraper = AmazonScraper()
+        driver = scraper.setup_driver(block_resources=True)
+
+        cmds = [cmd for cmd, _ in driver.cdp]
+        assert cmds.index("Network.enable") < cmds.index("Network.setBlockedURLs")
+        assert dict(driver.cdp)["Network.setBlockedURLs"] == {"urls": scraper.blocked_url_patterns()}
+        prefs = driver.options.experimental_options["prefs"]
+        assert prefs["profile.managed_default_content_settings.images"] == 2
+
+    def test_setup_driver_without_blocking(self):
+        """Test that block_resources=False leaves the network and images alone"""
+        driver = AmazonScraper().setup_driver(block_resources=False)
+        assert [cmd for cmd, _ in driver.cdp] == ["Page.addScriptToEvaluateOnNewDocument"]
+        assert "prefs" not in driver.options.experimental_options
@@ -0,0 +1,46 @@
+# tests/test_exporters.py
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from src.utils.exporters import PRICE_HISTORY_COLUMNS, export_chunks
+
+POINTS = [
+    {"unique_id": f"amazon_A{i}", "timestamp": datetime(2026, 1, 1, i), "price": 100.0 + i}
+    for i in range(5)
+]
+
+
+class TestExporters:
+    """Test the streaming export encoders"""
+
+    def test_ndjson_chunks_per_batch(self):
+        """Test that NDJSON is emitted one batch per chunk"""
+        chunks = list(export_chunks(iter(POINTS), PRICE_HISTORY_COLUMNS, "ndjson", 2))
+        assert len(chunks) == 3
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        assert rows[4] == {"unique_id": "amazon_A4", "timestamp": "2026-01-01T04:00:00", "price": 104.0}
+
+    def test_csv_header_once_and_empty_export(self):
+        """Test that CSV has a single header and missing values are blank"""
+        data = b"".join(export_chunks(iter(POINTS), PRICE_HISTORY_COLUMNS, "csv", 2)).decode()
+        rows = list(csv.reader(io.StringIO(data)))
+        assert rows[0] == ["unique_id", "timestamp", "price", "rating"]
+        assert rows[1] == ["amazon_A0", "2026-01-01T00:00:00", "100.0", ""]
+        assert len(rows) == 6
+
+        empty = b"".join(export_chunks(iter([]), PRICE_HISTORY_COLUMNS, "csv", 2)).decode()
+        assert empty.strip() == "unique_id,timestamp,price,rating"
+
+    def test_parquet_row_groups(self):
+        """Test that each batch becomes one Parquet row group"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        data = b"".join(export_chunks(iter(POINTS), PRICE_HISTORY_COLUMNS, "parquet", 2))
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.read().column("price").to_pylist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            export_chunks(iter(POINTS), PRICE_HISTORY_COLUMNS, "xml", 2)
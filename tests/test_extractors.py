@@ -0,0 +1,157 @@
+# tests/test_extractors.py
+import os
+import pickle
+import pytest
+from bs4 import BeautifulSoup
+from config.settings import settings
+from src.scrapers import base_scraper
+from src.scrapers.extraction import ExtractionSpec, Rule, text_of
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.flipkart_scraper import FlipkartScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(params=[
+    (AmazonScraper, "amazon_search.html", 22),
+    (FlipkartScraper, "flipkart_search.html", 24),
+], ids=["amazon", "flipkart"])
+def platform_page(request):
+    scraper_cls, fixture, expected = request.param
+    return scraper_cls(), load_fixture(fixture), expected
+
+
+def extract_all(scraper, soup):
+    return [scraper._extract_product_info(card) for card in scraper.find_product_cards(soup)]
+
+
+class TestExtractors:
+    """Test product extraction against saved search pages"""
+
+    def test_extracts_every_card(self, platform_page):
+        """Test that every fixture card yields a complete product"""
+        scraper, html, expected = platform_page
+        products = extract_all(scraper, scraper.parse_results_page(html))
+        assert len(products) == expected
+        for product in products:
+            assert product["product_id"]
+            assert product["title"]
+            assert product["price"] > 100
+            assert 1.0 <= product["rating"] <= 5.0
+            assert product["url"].startswith(scraper.base_url)
+
+    def test_strained_parse_matches_full_parse(self, platform_page):
+        """Test that card-only parsing extracts the same products"""
+        scraper, html, _ = platform_page
+        full = extract_all(scraper, scraper.parse_html(html, parser="html.parser"))
+        strained = extract_all(scraper, scraper.parse_results_page(html))
+        assert strained == full
+
+
+class TestExtractionSpec:
+    """Test single-pass rule matching"""
+
+    CARD = BeautifulSoup(
+        '<div><a href="/x">outside</a><h2><a href="/p/1">Title</a></h2>'
+        "<span>₹40</span><span>₹1,299</span><b>4.1</b><b>3.9</b></div>",
+        "html.parser",
+    ).div
+
+    def test_first_match_in_document_order(self):
+        """Test that the first matching node wins, like find()"""
+        fields = ExtractionSpec([Rule("rating", text=r"^\d\.\d$", value=float)]).extract(self.CARD)
+        assert fields == {"rating": 4.1}
+
+    def test_accept_skips_rejected_values(self):
+        """Test that rejected candidates keep the walk going"""
+        spec = ExtractionSpec([
+            Rule("price", text="₹", value=lambda s: float(s.strip("₹").replace(",", "")),
+                 accept=lambda p: p > 100),
+        ])
+        assert spec.extract(self.CARD) == {"price": 1299.0}
+
+    def test_within_restricts_to_ancestor(self):
+        """Test that within only matches nodes nested in that element"""
+        fields = ExtractionSpec([Rule("link", tag="a", within="h2")]).extract(self.CARD)
+        assert fields["link"]["href"] == "/p/1"
+        assert text_of(fields["link"]) == "Title"
+
+    def test_missing_fields_are_absent(self):
+        """Test that unmatched rules leave no key behind"""
+        assert ExtractionSpec([Rule("image", tag="img")]).extract(self.CARD) == {}
+
+
+@pytest.fixture
+def parse_workers(monkeypatch):
+    """Set settings.parse_workers for one test; any pool it starts is shut down after"""
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+    monkeypatch.setattr(base_scraper, "_parse_pool", None)
+
+    def set_workers(n):
+        monkeypatch.setattr(settings, "parse_workers", n)
+
+    yield set_workers
+    if base_scraper._parse_pool is not None:
+        base_scraper._parse_pool.shutdown(wait=True)
+
+
+def serve_pages(scraper, pages):
+    """Make scraper.fetch_pages yield (page, html) from ``pages``"""
+    def fetch_pages(query, pages_hint):
+        yield from pages
+    scraper.fetch_pages = fetch_pages
+
+
+class TestParsePool:
+    """Test multi-page parsing in spawned worker processes"""
+
+    def test_worker_payload_pickles(self, platform_page):
+        """Test that what crosses the process boundary survives pickling"""
+        scraper, html, expected = platform_page
+        scraper_cls, page = pickle.loads(pickle.dumps((type(scraper), html)))
+        assert scraper_cls is type(scraper)
+
+        result = base_scraper.extract_page_in_worker(scraper_cls, page)
+        assert result[0] == expected
+        assert pickle.loads(pickle.dumps(result)) == scraper.extract_page(html)
+
+    def test_pool_results_match_inline_in_page_order(self, parse_workers):
+        """Test that pages parsed in a spawn pool come back in order, as parsed inline"""
+        parse_workers(2)
+        amazon = AmazonScraper()
+        html = {"a": load_fixture("amazon_search.html"), "b": "<html><body></body></html>"}
+        pages = [(1, html["a"]), (2, html["b"]), (3, html["a"]), (4, html["b"]), (5, html["a"])]
+        serve_pages(amazon, pages)
+
+        results = list(amazon.parsed_pages("phone", pages_hint=len(pages)))
+
+        pool = base_scraper._parse_pool
+        assert pool is not None and pool._mp_context.get_start_method() == "spawn"
+        assert [page for page, _ in results] == [1, 2, 3, 4, 5]
+        assert [result for _, result in results] == [amazon.extract_page(h) for _, h in pages]
+
+    def test_failed_page_comes_last(self, parse_workers):
+        """Test that a page that failed to fetch ends the stream after earlier pages"""
+        parse_workers(2)
+        amazon = AmazonScraper()
+        serve_pages(amazon, [(1, load_fixture("amazon_search.html")), (2, None), (3, "<p></p>")])
+
+        results = list(amazon.parsed_pages("phone", pages_hint=3))
+        assert [page for page, _ in results] == [1, 2]
+        assert results[0][1][0] == 22 and results[1][1] is None
+
+    @pytest.mark.parametrize("workers, pages_hint", [(0, 3), (1, 3), (2, 1)])
+    def test_parses_inline_without_pool(self, parse_workers, workers, pages_hint):
+        """Test that the pool is off for <= 1 worker and skipped for single-page searches"""
+        parse_workers(workers)
+        amazon = AmazonScraper()
+        html = load_fixture("amazon_search.html")
+        serve_pages(amazon, [(1, html)])
+
+        assert list(amazon.parsed_pages("phone", pages_hint=pages_hint)) == [(1, amazon.extract_page(html))]
+        assert base_scraper._parse_pool is None
@@ -0,0 +1,194 @@
+# tests/test_fetch_tiers.py
+import time
+from config.settings import settings
+from src.scrapers import base_scraper
+from src.scrapers.base_scraper import BaseScraper, TIER_REQUESTS, TIER_SELENIUM
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import get_circuit_breaker
+
+
+class StubScraper(BaseScraper):
+    """Scraper whose tiers return canned HTML"""
+
+    platform = "stub"
+    content_markers = ("s-search-result",)
+
+    def __init__(self, http_html, browser_html="<div class='s-search-result'></div>"):
+        super().__init__()
+        self.http_html = http_html
+        self.browser_html = browser_html
+        self.selenium_calls = 0
+
+    def fetch_with_requests(self, url):
+        return self.http_html
+
+    def fetch_with_selenium(self, url):
+        self.selenium_calls += 1
+        return self.browser_html
+
+
+class TestFetchTiers:
+    """Test HTTP-first fetching with escalation to Selenium"""
+
+    def setup_method(self):
+        base_scraper._domain_tiers.clear()
+        circuit_breaker._breakers.clear()
+
+    def test_server_rendered_page_stays_on_http(self):
+        """Test that a usable page is served by the HTTP tier"""
+        scraper = StubScraper("<div class='s-search-result'>x</div>")
+        assert scraper.fetch("https://shop.test/s?k=a")
+        assert scraper.selenium_calls == 0
+        assert base_scraper.get_preferred_tier("shop.test") == TIER_REQUESTS
+
+    def test_captcha_escalates(self):
+        """Test that a captcha page escalates and is remembered per domain"""
+        scraper = StubScraper("<title>Robot Check</title>")
+        assert scraper.fetch("https://shop.test/s?k=a")
+        assert scraper.selenium_calls == 1
+        assert base_scraper.get_preferred_tier("shop.test") == TIER_SELENIUM
+
+    def test_csr_shell_escalates(self):
+        """Test that a page without server-rendered results escalates"""
+        scraper = StubScraper("<div id='root'></div>")
+        scraper.fetch("https://shop.test/s?k=a")
+        assert scraper.selenium_calls == 1
+
+    def test_failed_reprobe_keeps_selenium_for_another_window(self, monkeypatch):
+        """Test that a domain falling back to Selenium is not re-probed on every fetch"""
+        clock = [1000.0]
+        monkeypatch.setattr(base_scraper.time, "time", lambda: clock[0])
+        base_scraper.record_tier("shop.test", TIER_SELENIUM)
+
+        clock[0] += settings.http_tier_reprobe_seconds + 1
+        base_scraper.record_tier("shop.test", TIER_SELENIUM)
+        assert base_scraper.get_preferred_tier("shop.test") == TIER_SELENIUM
+
+        clock[0] += settings.http_tier_reprobe_seconds + 1
+        assert base_scraper.get_preferred_tier("shop.test") == TIER_REQUESTS
+        # The probe is claimed: concurrent fetches stay on Selenium
+        assert base_scraper.get_preferred_tier("shop.test") == TIER_SELENIUM
+
+    def test_transport_failure_does_not_escalate(self, monkeypatch):
+        """Test that a failed HTTP fetch is retried, not sent to Selenium"""
+        monkeypatch.setattr(settings, "max_retries", 0)
+        scraper = StubScraper(None)
+        assert scraper.fetch("https://shop.test/s?k=a") is None
+        assert scraper.selenium_calls == 0
+        assert "shop.test" not in base_scraper._domain_tiers
+
+    def test_only_block_error_pages_are_returned(self, monkeypatch):
+        """Test that a 503 captcha is handed on for escalation but a plain 500 is not"""
+        class Response:
+            def __init__(self, status_code, text):
+                self.status_code, self.text = status_code, text
+
+        class Session:
+            response = None
+
+            def get(self, url, **kwargs):
+                return self.response
+
+        session = Session()
+        monkeypatch.setattr(base_scraper, "get_http_session", lambda: session)
+        monkeypatch.setattr(BaseScraper, "wait_for_slot", lambda self, url: 0.0)
+        scraper = BaseScraper()
+
+        session.response = Response(503, "<title>Robot Check</title>")
+        assert "Robot Check" in scraper.fetch_with_requests("https://shop.test/s")
+        session.response = Response(500, "Internal Server Error")
+        assert scraper.fetch_with_requests("https://shop.test/s") is None
+
+
+class FlakyScraper(BaseScraper):
+    """Scraper whose single fetch attempt fails a set number of times"""
+
+    platform = "stub"
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def fetch_once(self, url):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return None
+        return "<html>ok</html>"
+
+
+class TestRetryAndBreaker:
+    """Test retries with backoff and the per-domain circuit breaker"""
+
+    def setup_method(self):
+        circuit_breaker._breakers.clear()
+
+    def test_retries_until_success(self, monkeypatch):
+        """Test that transient failures are retried with backoff"""
+        monkeypatch.setattr(settings, "max_retries", 3)
+        monkeypatch.setattr(settings, "retry_backoff_base", 0.001)
+        scraper = FlakyScraper(failures=2)
+        assert scraper.fetch("https://flaky.test/s") == "<html>ok</html>"
+        assert scraper.calls == 3
+        assert get_circuit_breaker("flaky.test").state == circuit_breaker.CLOSED
+
+    def test_domain_slot_is_free_during_backoff(self, monkeypatch):
+        """Test that a fetch holds its domain slot only while fetching, not while backing off"""
+        monkeypatch.setattr(settings, "max_retries", 2)
+        monkeypatch.setattr(settings, "per_domain_concurrency", 1)
+        monkeypatch.setattr(base_scraper, "_domain_slots", {})
+        slots = base_scraper.get_domain_slots("slots.test")
+        held = []
+
+        class SlotScraper(FlakyScraper):
+            def fetch_once(self, url):
+                held.append(not slots.acquire(blocking=False))
+                return super().fetch_once(url)
+
+        def sleep(seconds):
+            # Another fetch to the domain can take the only slot meanwhile
+            assert slots.acquire(blocking=False)
+            slots.release()
+
+        monkeypatch.setattr(base_scraper.time, "sleep", sleep)
+        scraper = SlotScraper(failures=2)
+        assert scraper.fetch("https://slots.test/s") == "<html>ok</html>"
+        assert held == [True, True, True]
+        assert slots.acquire(blocking=False)
+
+    def test_breaker_fails_fast_when_open(self, monkeypatch):
+        """Test that a tripped domain is skipped without fetching"""
+        monkeypatch.setattr(settings, "max_retries", 1)
+        monkeypatch.setattr(settings, "retry_backoff_base", 0.001)
+        monkeypatch.setattr(settings, "breaker_failure_threshold", 2)
+        scraper = FlakyScraper(failures=100)
+        assert scraper.fetch("https://down.test/s") is None
+        assert get_circuit_breaker("down.test").state == circuit_breaker.OPEN
+
+        calls = scraper.calls
+        assert scraper.fetch("https://down.test/s") is None
+        assert scraper.calls == calls
+
+    def test_half_open_probe(self):
+        """Test that one probe is allowed after the cooldown and closes on success"""
+        breaker = circuit_breaker.CircuitBreaker(failure_threshold=1, cooldown=0.01)
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.02)
+        assert breaker.allow()
+        assert breaker.state == circuit_breaker.HALF_OPEN
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == circuit_breaker.CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed half-open probe re-opens the breaker"""
+        breaker = circuit_breaker.CircuitBreaker(failure_threshold=3, cooldown=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == circuit_breaker.OPEN
+        assert breaker.stats()["trips"] == 2
@@ -0,0 +1,740 @@
+# tests/test_mongo_integration.py
+"""
+MongoDBManager against a live mongod.
+
+Uses TEST_MONGODB_URI (or MONGODB_URI) and a throwaway database per test;
+skipped when no server answers. Run with: pytest -m integration
+"""
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def mongo_uri():
+    """URI of a reachable mongod, or skip"""
+    uri = os.getenv("TEST_MONGODB_URI") or os.getenv("MONGODB_URI")
+    if not uri:
+        pytest.skip("TEST_MONGODB_URI / MONGODB_URI not set")
+    client = MongoClient(uri, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        pytest.skip(f"mongod not reachable: {e}")
+    finally:
+        client.close()
+    return uri
+
+
+@pytest.fixture(params=["pipeline", "merge"])
+def upsert_mode(request, monkeypatch):
+    """Run a test under both settings.product_upsert_mode write paths"""
+    from config.settings import settings
+
+    monkeypatch.setattr(settings, "product_upsert_mode", request.param)
+    return request.param
+
+
+@pytest.fixture
+def manager(mongo_uri):
+    """MongoDBManager on a fresh database, dropped afterwards"""
+    from src.database.mongo_manager import MongoDBManager
+
+    db_name = f"retail_intelligence_test_{uuid.uuid4().hex[:8]}"
+    manager = MongoDBManager(mongo_uri, db_name=db_name)
+    yield manager
+    manager.client.drop_database(db_name)
+
+
+def make_product(product_id, price, platform="amazon", category="electronics", rating=4.0):
+    return {
+        "platform": platform,
+        "product_id": product_id,
+        "title": f"Product {product_id}",
+        "price": price,
+        "rating": rating,
+        "category": category,
+        "url": f"https://example.test/{product_id}",
+    }
+
+
+def stored_counts(manager):
+    """Stats counters as currently stored, without version counters or zeros"""
+    return {
+        doc["_id"]: doc["count"]
+        for doc in manager.stats.find({"kind": {"$ne": "version"}})
+        if doc["count"]
+    }
+
+
+class TestUpsertPaths:
+    """Test inserting and updating products one at a time and in bulk"""
+
+    def test_single_insert_then_update(self, manager, upsert_mode):
+        """Test that the second save of a product updates it in place"""
+        assert manager.upsert_product(make_product("P1", 100.0))["action"] == "inserted"
+        assert manager.upsert_product(make_product("P1", 90.0))["action"] == "updated"
+
+        doc = manager.products.find_one({"unique_id": "amazon_P1"})
+        assert manager.products.count_documents({}) == 1
+        assert doc["times_scraped"] == 2
+        assert doc["current_price"] == 90.0
+        assert doc["first_seen"] < doc["last_seen"]
+
+    def test_bulk_insert_update_and_repeats(self, manager, upsert_mode):
+        """Test bulk counts, and that a product repeated in a batch merges in order"""
+        first = manager.save_products_bulk([make_product("B1", 10.0), make_product("B2", 20.0)])
+        assert (first["inserted"], first["updated"]) == (2, 0)
+
+        second = manager.save_products_bulk([
+            make_product("B1", 11.0),
+            make_product("B3", 30.0),
+            make_product("B1", 12.0),
+            {"title": "no ids"},
+        ])
+        assert (second["inserted"], second["updated"], second["errors"]) == (1, 2, 1)
+
+        doc = manager.products.find_one({"unique_id": "amazon_B1"})
+        assert doc["current_price"] == 12.0
+        assert doc["times_scraped"] == 3
+
+    def test_partial_bulk_failure_counts_modified_products(self, manager, monkeypatch):
+        """Test that a failed bulk write reports modified, not merely matched, products"""
+        from pymongo.errors import BulkWriteError
+
+        def failing_bulk_write(operations, ordered):
+            raise BulkWriteError({
+                "nUpserted": 1, "nMatched": 3, "nModified": 2,
+                "writeErrors": [{"index": 4, "code": 11000, "errmsg": "duplicate key"}],
+            })
+
+        monkeypatch.setattr(manager.products, "bulk_write", failing_bulk_write)
+        assert manager._bulk_write_stats([]) == {"inserted": 1, "updated": 2, "errors": 1}
+
+
+class CountingCollection:
+    """Collection wrapper that records which methods were called"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.calls = []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return getattr(self._collection, name)
+
+
+class TestBulkRoundTrips:
+    """Test that a bulk save costs one write per round, not one per product"""
+
+    def test_one_read_and_one_write_per_batch(self, manager, upsert_mode):
+        """Test collection calls for a batch of new and existing products"""
+        manager.save_products_bulk([make_product(f"R{i}", 10.0) for i in range(5)])
+        manager.products = CountingCollection(manager.products)
+
+        stats = manager.save_products_bulk([make_product(f"R{i}", 20.0) for i in range(10)])
+        assert (stats["inserted"], stats["updated"]) == (5, 5)
+        calls = manager.products.calls
+        assert calls.count("bulk_write") == 1
+        # merge mode reads existing documents once; both modes read back changes once
+        assert calls.count("find") == (2 if upsert_mode == "merge" else 1)
+        assert not {"find_one", "update_one", "insert_one"} & set(calls)
+
+
+class TestPriceMetrics:
+    """Test lowest/highest/average price and price_trend maintenance"""
+
+    def test_metrics_follow_price_changes(self, manager, upsert_mode):
+        """Test running extremes, average, trend and change percent"""
+        for price in (100.0, 80.0, 120.0):
+            manager.upsert_product(make_product("M1", price))
+
+        doc = manager.products.find_one({"unique_id": "amazon_M1"})
+        assert (doc["lowest_price"], doc["highest_price"]) == (80.0, 120.0)
+        assert doc["average_price"] == pytest.approx(100.0)
+        assert doc["price_trend"] == "up"
+        assert doc["previous_trend"] == "down"
+        assert doc["price_change_percent"] == pytest.approx(50.0)
+        assert [p["price"] for p in manager.get_price_history("amazon_M1")] == [100.0, 80.0, 120.0]
+
+    def test_unchanged_price_adds_no_history(self, manager, upsert_mode):
+        """Test that a rescrape at the same price leaves metrics and history alone"""
+        manager.upsert_product(make_product("M2", 50.0))
+        manager.save_products_bulk([make_product("M2", 50.0)])
+
+        doc = manager.products.find_one({"unique_id": "amazon_M2"})
+        assert doc["price_trend"] == "stable"
+        assert doc["price_count"] == 1
+        assert doc["average_price"] == pytest.approx(50.0)
+        assert len(manager.get_price_history("amazon_M2")) == 1
+
+
+class TestHistoryCollection:
+    """Test the price_history collection and the embedded-history migration"""
+
+    def legacy_product(self, manager, product_id, prices):
+        start = datetime(2026, 1, 1)
+        manager.products.insert_one({
+            **make_product(product_id, prices[-1]),
+            "unique_id": f"amazon_{product_id}",
+            "current_price": prices[-1],
+            "created_at": start,
+            "updated_at": start,
+            "price_history": [
+                {"price": p, "timestamp": start + timedelta(hours=i)} for i, p in enumerate(prices)
+            ],
+        })
+
+    def test_migration_moves_points_and_seeds_sums(self, manager):
+        """Test that embedded arrays become history documents and running sums"""
+        self.legacy_product(manager, "L1", [100.0, 90.0])
+
+        assert manager.migrate_embedded_history() == {"products": 1, "points": 2}
+        assert manager.migrate_embedded_history() == {"products": 0, "points": 0}
+        doc = manager.products.find_one({"unique_id": "amazon_L1"})
+        assert "price_history" not in doc
+        assert (doc["price_sum"], doc["price_count"]) == (190.0, 2)
+        assert [p["price"] for p in manager.get_price_history("amazon_L1")] == [100.0, 90.0]
+
+    def test_migration_keeps_sums_seeded_by_a_concurrent_write(self, manager, monkeypatch):
+        """Test that sums written between the migration's read and write survive"""
+        self.legacy_product(manager, "L2", [100.0, 90.0])
+        bulk_write = manager.products.bulk_write
+
+        def write_first(operations, **kwargs):
+            manager.products.update_one(
+                {"unique_id": "amazon_L2"}, {"$set": {"price_sum": 270.0, "price_count": 3}}
+            )
+            return bulk_write(operations, **kwargs)
+
+        monkeypatch.setattr(manager.products, "bulk_write", write_first)
+        manager.migrate_embedded_history()
+        monkeypatch.undo()
+
+        doc = manager.products.find_one({"unique_id": "amazon_L2"})
+        assert (doc["price_sum"], doc["price_count"]) == (270.0, 3)
+        assert "price_history" not in doc
+
+    def test_clean_database_clears_history(self, manager):
+        """Test that no history points outlive their products"""
+        manager.upsert_product(make_product("C1", 10.0))
+        manager.upsert_product(make_product("C1", 12.0))
+
+        assert manager.clean_database() == 1
+        assert manager.price_history.count_documents({}) == 0
+        assert manager.get_database_stats()["total_products"] == 0
+
+
+class TestProjectionProfiles:
+    """Test that product reads return only their profile's fields"""
+
+    def test_lean_profiles_limit_fields(self, manager):
+        """Test summary/table/full reads of the same product"""
+        from src.database.mongo_manager import PRODUCT_PROJECTIONS
+
+        manager.upsert_product(make_product("J1", 10.0))
+        for profile in ("summary", "table"):
+            doc = manager.get_product_by_id("amazon", "J1", profile=profile)
+            wanted = {field for field, keep in PRODUCT_PROJECTIONS[profile].items() if keep}
+            assert set(doc) <= wanted
+            assert "_id" not in doc
+        assert "price_sum" in manager.get_product_by_id("amazon", "J1")
+
+    def test_query_products_pages_with_a_profile_without_keyset_fields(self, manager):
+        """Test that the cursor still works when the profile drops _id and updated_at"""
+        manager.save_products_bulk([make_product(f"J{i}", 10.0) for i in range(3)])
+        page, cursor = manager.query_products(limit=2, profile="summary")
+        assert not {"_id", "updated_at"} & set(page[0])
+        rest, cursor = manager.query_products(limit=2, cursor=cursor, profile="summary")
+        assert cursor is None
+        assert len({p["unique_id"] for p in page + rest}) == 3
+
+    def test_unknown_profile_is_rejected(self, manager):
+        """Test that a typo in a profile name fails loudly"""
+        with pytest.raises(ValueError, match="Unknown projection profile"):
+            manager.get_all_products(profile="slim")
+
+
+class TestStatsCounters:
+    """Test that incremental stat deltas agree with a full rebuild"""
+
+    def test_deltas_match_rebuild(self, manager, upsert_mode):
+        """Test counters after inserts, trend changes and a report"""
+        manager.get_database_stats()
+        manager.save_products_bulk([
+            make_product("D1", 100.0),
+            make_product("D2", 100.0, platform="flipkart", category="audio"),
+            make_product("D3", 100.0, category="audio"),
+        ])
+        manager.upsert_product(make_product("D1", 90.0))
+        manager.upsert_product(make_product("D1", 95.0))
+        manager.save_products_bulk([make_product("D2", 80.0, platform="flipkart"), make_product("D3", 100.0)])
+        manager.save_report({"report_type": "quick_analysis", "summary": "ok"})
+
+        incremental = manager.get_database_stats()
+        counts = stored_counts(manager)
+        assert manager.rebuild_stats() == incremental
+        assert stored_counts(manager) == counts
+        assert incremental["total_products"] == 3
+        assert (incremental["price_drops"], incremental["price_increases"]) == (1, 1)
+        assert incremental["platforms"] == ["amazon", "flipkart"]
+
+
+    def test_counters_seeded_on_existing_database(self, manager):
+        """Test the upgrade path: products stored before the counters existed"""
+        from src.database.mongo_manager import MongoDBManager
+
+        manager.save_products_bulk([make_product("U1", 10.0), make_product("U2", 20.0, platform="flipkart")])
+        manager.upsert_product(make_product("U1", 5.0))
+        manager.stats.drop()
+
+        upgraded = MongoDBManager(manager._uri, db_name=manager._db_name)
+        upgraded.upsert_product(make_product("U3", 30.0))
+        upgraded.upsert_product(make_product("U2", 25.0, platform="flipkart"))
+
+        stats = upgraded.get_database_stats()
+        assert stats["total_products"] == 3
+        assert (stats["price_drops"], stats["price_increases"]) == (1, 1)
+        assert upgraded.rebuild_stats() == stats
+
+
+    def test_interleaved_writer_loses_no_history_or_trend_changes(self, manager, upsert_mode):
+        """Test a write to the same product landing between a bulk write and its read-back"""
+        from src.database.mongo_manager import MongoDBManager
+
+        manager.save_products_bulk([make_product("I1", 100.0)])
+        other = MongoDBManager(manager._uri, db_name=manager._db_name)
+        bulk_write = manager.products.bulk_write
+
+        def then_other_writer(operations, **kwargs):
+            result = bulk_write(operations, **kwargs)
+            other.upsert_product(make_product("I1", 120.0))
+            return result
+
+        manager.products.bulk_write = then_other_writer
+        manager.save_products_bulk([make_product("I1", 80.0)])
+        del manager.products.bulk_write
+
+        assert [p["price"] for p in manager.get_price_history("amazon_I1")] == [100.0, 80.0, 120.0]
+        incremental = manager.get_database_stats()
+        assert (incremental["price_drops"], incremental["price_increases"]) == (0, 1)
+        assert manager.rebuild_stats() == incremental
+        assert not manager.products.find_one({"unique_id": "amazon_I1"}).get("pending_writes")
+
+
+class TestKeysetPaging:
+    """Test cursor pagination in query_products"""
+
+    def test_pages_cover_every_product_once(self, manager):
+        """Test continuity across pages, including updated_at ties within a bulk write"""
+        manager.save_products_bulk([make_product(f"K{i:02d}", 10.0 + i) for i in range(20)])
+        for i in range(5):
+            manager.upsert_product(make_product(f"K{i:02d}", 1.0))
+
+        expected = [
+            doc["unique_id"]
+            for doc in manager.products.find({}, {"unique_id": 1}).sort([("updated_at", -1), ("_id", -1)])
+        ]
+        seen, cursor = [], None
+        while True:
+            page, cursor = manager.query_products(limit=7, cursor=cursor)
+            seen.extend(p["unique_id"] for p in page)
+            if cursor is None:
+                break
+        assert seen == expected
+        assert len(set(seen)) == 20
+
+    def test_filters_apply_on_every_page(self, manager):
+        """Test that a filtered view stays filtered past the first page"""
+        manager.save_products_bulk(
+            [make_product(f"F{i:02d}", 10.0, platform="flipkart" if i % 2 else "amazon") for i in range(10)]
+        )
+        seen, cursor = [], None
+        while True:
+            page, cursor = manager.query_products(platform="flipkart", limit=2, cursor=cursor, profile="full")
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert len(seen) == 5
+        assert {p["platform"] for p in seen} == {"flipkart"}
+
+
+    def test_trending_pages_by_rating_then_recency(self, manager):
+        """Test that the trending view keeps its rating order across pages"""
+        ratings = [4.2, 4.9, 4.5, 4.9, 3.0, 4.0, 4.7]
+        for i, rating in enumerate(ratings):
+            manager.upsert_product(make_product(f"T{i}", 10.0, rating=rating))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = manager.query_products(view="trending", limit=2, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert [p["current_rating"] for p in seen] == [4.9, 4.9, 4.7, 4.5, 4.2, 4.0]
+        # Ties on rating: most recently updated first
+        assert [p["unique_id"] for p in seen[:2]] == ["amazon_T3", "amazon_T1"]
+
+    def test_cursor_from_another_view_is_rejected(self, manager):
+        """Test that a recency cursor is not accepted by the trending view"""
+        manager.save_products_bulk([make_product(f"V{i}", 10.0, rating=4.5) for i in range(3)])
+        _, cursor = manager.query_products(limit=1)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            manager.query_products(view="trending", cursor=cursor)
+
+
+class TestSaveProductsStream:
+    """Test micro-batched ingestion from a product iterator"""
+
+    def test_flushes_on_time_while_producer_is_slow(self, manager):
+        """Test that buffered products are written before the next one arrives"""
+        flushed = []
+        start = time.monotonic()
+
+        def products():
+            yield make_product("S1", 100.0)
+            yield make_product("S2", 200.0)
+            time.sleep(1.0)
+            yield make_product("S3", 300.0)
+
+        stats = manager.save_products_stream(
+            products(),
+            batch_size=100,
+            flush_seconds=0.2,
+            on_batch=lambda saved, _: flushed.append((saved, time.monotonic() - start)),
+        )
+
+        assert stats["inserted"] == 3
+        assert [saved for saved, _ in flushed] == [2, 3]
+        assert flushed[0][1] < 0.8
+
+    def test_saved_count_excludes_failed_products(self, manager):
+        """Test that products that could not be written are not reported as saved"""
+        flushed = []
+        products = [make_product("F1", 10.0), {"title": "no ids"}, make_product("F2", 20.0)]
+
+        stats = manager.save_products_stream(
+            iter(products), batch_size=3, on_batch=lambda saved, _: flushed.append(saved)
+        )
+        assert (stats["inserted"], stats["errors"]) == (2, 1)
+        assert flushed == [2]
+
+    def test_producer_error_propagates(self, manager):
+        """Test that an exception from the iterator reaches the caller"""
+        def products():
+            yield make_product("E1", 100.0)
+            raise RuntimeError("scrape failed")
+
+        with pytest.raises(RuntimeError, match="scrape failed"):
+            manager.save_products_stream(products(), batch_size=100, flush_seconds=5)
+
+
+class TestPdfChunks:
+    """Test the PDF chat chunk store shared by server workers"""
+
+    def test_chunks_are_visible_to_another_worker_until_deleted(self, manager):
+        """Test that a session saved by one manager is read back in order by another"""
+        from src.database.mongo_manager import MongoDBManager
+
+        info = {"filename": "a.pdf", "page_count": 2, "chunk_count": 3}
+        chunks = [
+            {"text": f"chunk {i}", "metadata": {"page": i // 2}, "embedding": [float(i), 1.0]}
+            for i in range(3)
+        ]
+        manager.save_pdf_chunks("S1", info, chunks)
+
+        # Same database, separate client: stands in for another worker process
+        other = MongoDBManager(manager._uri, db_name=manager._db_name)
+        stored = other.get_pdf_chunks("S1")
+        assert [c["text"] for c in stored] == ["chunk 0", "chunk 1", "chunk 2"]
+        assert stored[2]["embedding"] == [2.0, 1.0]
+        assert stored[0]["filename"] == "a.pdf" and stored[0]["chunk_count"] == 3
+
+        assert other.delete_pdf_chunks("S1") is True
+        assert manager.get_pdf_chunks("S1") == []
+        assert manager.delete_pdf_chunks("S1") is False
+
+
+@pytest.fixture
+def api(manager, monkeypatch):
+    """Flask test client reading ``manager``'s database with a fresh response cache"""
+    from config.settings import settings
+    from src.api import app as api_module, conditional
+    from src.utils import response_cache
+
+    monkeypatch.setattr(settings, "response_cache_enabled", True)
+    monkeypatch.setattr(settings, "response_cache_backend", "memory")
+    monkeypatch.setattr(response_cache, "_cache", None)
+    monkeypatch.setattr(api_module, "db_manager", manager)
+    monkeypatch.setattr(conditional, "db_manager", manager)
+    return api_module.app.test_client()
+
+
+class TestConditionalCaching:
+    """Test that ETags and cached bodies always describe the same data"""
+
+    def test_write_from_another_process_changes_tag_and_body(self, manager, api):
+        """Test that a write by another manager is never served under a new tag from cache"""
+        from src.database.mongo_manager import MongoDBManager
+
+        manager.upsert_product(make_product("W1", 10.0))
+        first = api.get("/api/products")
+        again = api.get("/api/products")
+        assert (first.headers["X-Cache"], again.headers["X-Cache"]) == ("MISS", "HIT")
+        assert first.headers["ETag"] == again.headers["ETag"]
+
+        # Same database, separate client: stands in for another worker process
+        other = MongoDBManager(manager._uri, db_name=manager._db_name)
+        other.upsert_product(make_product("W2", 20.0))
+
+        after = api.get("/api/products", headers={"If-None-Match": first.headers["ETag"]})
+        assert after.status_code == 200
+        assert after.headers["X-Cache"] == "MISS"
+        assert after.headers["ETag"] != first.headers["ETag"]
+        assert {p["unique_id"] for p in after.get_json()["products"]} == {"amazon_W1", "amazon_W2"}
+
+        cached = api.get("/api/products", headers={"If-None-Match": after.headers["ETag"]})
+        assert cached.status_code == 304
+
+    def test_stats_tag_and_cache_share_one_version_read(self, manager, api, monkeypatch):
+        """Test that @etag and @cached read the write counters once per request"""
+        reads = []
+        data_version = manager.data_version
+
+        def counting(*collections):
+            reads.append(collections)
+            return data_version(*collections)
+
+        monkeypatch.setattr(manager, "data_version", counting)
+        response = api.get("/api/stats")
+        assert response.status_code == 200 and response.headers["ETag"]
+        assert reads == [("products", "reports", "stats")]
+
+
+class FakeScraper:
+    """Scraper stand-in: optional delay, gate or error before returning products"""
+
+    def __init__(self, platform, delay=0.0, gate=None, error=None):
+        self.platform = platform
+        self.delay = delay
+        self.gate = gate
+        self.error = error
+
+    def search_products(self, search_query, max_results):
+        time.sleep(self.delay)
+        if self.gate is not None:
+            # Held until the test ends; returns nothing so the dropped
+            # database is not written to afterwards
+            self.gate.wait(10)
+            return []
+        if self.error:
+            raise RuntimeError(self.error)
+        return [
+            make_product(f"{self.platform}-{i}", 100.0 + i, platform=self.platform)
+            for i in range(max_results)
+        ]
+
+    def iter_products(self, query, max_results=10):
+        yield from self.search_products(query, max_results)
+
+
+@pytest.fixture
+def scrapers(api, monkeypatch):
+    """platform -> FakeScraper served by make_scraper; gated scrapers are released after"""
+    import threading
+    from src.api import app as api_module
+
+    fakes = {}
+    gate = threading.Event()
+    monkeypatch.setattr(api_module, "make_scraper", lambda platform: fakes[platform])
+    yield fakes, gate
+    gate.set()
+
+
+class TestMultiPlatformSearch:
+    """Test POST /api/products/search fanning out to every platform"""
+
+    def search(self, api, **body):
+        return api.post("/api/products/search", json=dict(search_query="phone", **body))
+
+    def test_platforms_are_scraped_concurrently(self, manager, api, scrapers):
+        """Test that two slow platforms take about as long as one"""
+        fakes, _ = scrapers
+        fakes["amazon"] = FakeScraper("amazon", delay=0.5)
+        fakes["flipkart"] = FakeScraper("flipkart", delay=0.5)
+
+        start = time.monotonic()
+        response = self.search(api, max_results=2)
+        elapsed = time.monotonic() - start
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert elapsed < 0.9
+        assert set(body["results"]) == {"amazon", "flipkart"}
+        assert body["errors"] == {}
+        assert body["summary"]["total"] == 4
+        assert manager.products.count_documents({}) == 4
+
+    def test_deadline_returns_partial_results(self, api, scrapers):
+        """Test that a platform past the deadline is reported and the rest returned"""
+        fakes, gate = scrapers
+        fakes["amazon"] = FakeScraper("amazon")
+        fakes["flipkart"] = FakeScraper("flipkart", gate=gate)
+
+        start = time.monotonic()
+        response = self.search(api, max_results=1, deadline_seconds=0.3)
+        elapsed = time.monotonic() - start
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert elapsed < 2
+        assert list(body["results"]) == ["amazon"]
+        assert body["errors"] == {"flipkart": "Timed out after 0.3s"}
+        assert body["timings"]["flipkart"] == {"timed_out": True}
+
+    def test_failed_platform_is_reported_with_the_others(self, api, scrapers):
+        """Test that one scraper's exception becomes an error entry"""
+        fakes, _ = scrapers
+        fakes["amazon"] = FakeScraper("amazon")
+        fakes["flipkart"] = FakeScraper("flipkart", error="blocked")
+
+        body = self.search(api, max_results=1).get_json()
+        assert list(body["results"]) == ["amazon"]
+        assert body["errors"] == {"flipkart": "blocked"}
+
+    def test_timings_per_platform(self, api, scrapers):
+        """Test that each finished platform reports scrape, save and total seconds"""
+        fakes, _ = scrapers
+        fakes["amazon"] = FakeScraper("amazon", delay=0.1)
+
+        body = self.search(api, max_results=1, platforms=["amazon"]).get_json()
+        timings = body["timings"]["amazon"]
+        assert set(timings) == {"scrape_seconds", "save_seconds", "total_seconds"}
+        assert timings["scrape_seconds"] >= 0.1
+        assert timings["total_seconds"] >= timings["scrape_seconds"]
+
+    @pytest.mark.parametrize("deadline", ["soon", None, 0, -5, "nan"])
+    def test_invalid_deadline_is_rejected(self, api, scrapers, deadline):
+        """Test that a non-numeric or non-positive deadline is a 400"""
+        response = self.search(api, deadline_seconds=deadline)
+        assert response.status_code == 400
+        assert "deadline_seconds" in response.get_json()["error"]
+
+    def test_deadline_is_clamped(self, api, scrapers, monkeypatch):
+        """Test that a huge deadline is cut to settings.search_deadline_max_seconds"""
+        from config.settings import settings
+
+        fakes, gate = scrapers
+        fakes["amazon"] = FakeScraper("amazon", gate=gate)
+        monkeypatch.setattr(settings, "search_deadline_max_seconds", 0.2)
+
+        body = self.search(api, platforms=["amazon"], deadline_seconds=1e9).get_json()
+        assert body["errors"] == {"amazon": "Timed out after 0.2s"}
+
+
+@pytest.fixture
+def job_runner(manager, api, monkeypatch):
+    """(jobs module, fake scrapers, drain) with jobs on ``manager`` and a private pool"""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.api import jobs
+
+    fakes = {}
+    monkeypatch.setattr(jobs, "db_manager", manager)
+    monkeypatch.setattr(jobs, "make_scraper", lambda platform: fakes.get(platform))
+    monkeypatch.setattr(jobs, "_executor", ThreadPoolExecutor(max_workers=1))
+
+    def drain():
+        """Wait for every job handed to the pool so far"""
+        jobs._executor.shutdown(wait=True)
+        monkeypatch.setattr(jobs, "_executor", ThreadPoolExecutor(max_workers=1))
+
+    yield jobs, fakes, drain
+    jobs._executor.shutdown(wait=True)
+
+
+def collect_params(platform="amazon", max_results=3):
+    return {
+        "search_query": "phone",
+        "platform": platform,
+        "max_results": max_results,
+        "category": "phones",
+    }
+
+
+class TestCollectJobs:
+    """Test background collect jobs from submission to GET /api/jobs/<id>"""
+
+    def test_submitted_job_is_claimed_and_completed(self, manager, api, job_runner):
+        """Test that a queued job runs once, saves its products and reports them"""
+        jobs, fakes, drain = job_runner
+        fakes["amazon"] = FakeScraper("amazon")
+
+        job_id = jobs.submit_collect_job(collect_params())
+        drain()
+
+        body = api.get(f"/api/jobs/{job_id}").get_json()
+        assert body["state"] == "succeeded"
+        assert body["progress"]["stage"] == "done"
+        assert body["result"]["total"] == 3
+        assert body["result"]["stats"]["inserted"] == 3
+        assert body["started_at"] and body["finished_at"]
+        assert {"queued_seconds", "collect_seconds", "total_seconds"} <= set(body["timings"])
+        assert manager.products.count_documents({"category": "phones"}) == 3
+
+        # Already claimed: running it again does nothing
+        jobs._run_job(job_id)
+        assert manager.products.count_documents({}) == 3
+        assert manager.get_job(job_id)["state"] == "succeeded"
+
+    def test_failed_scrape_marks_job_failed(self, api, job_runner):
+        """Test that a scraper exception ends the job as failed with its message"""
+        jobs, fakes, drain = job_runner
+        fakes["amazon"] = FakeScraper("amazon", error="captcha")
+
+        job_id = jobs.submit_collect_job(collect_params())
+        unknown_id = jobs.submit_collect_job(collect_params(platform="ebay"))
+        drain()
+
+        body = api.get(f"/api/jobs/{job_id}").get_json()
+        assert (body["state"], body["error"]) == ("failed", "captcha")
+        assert body["finished_at"]
+        assert api.get(f"/api/jobs/{unknown_id}").get_json()["error"] == "Unknown platform: ebay"
+
+    def test_stale_running_job_is_requeued_and_run(self, manager, job_runner):
+        """Test that recover_jobs reruns a job whose worker died, not a live one"""
+        from bson import ObjectId
+        from config.settings import settings
+
+        jobs, fakes, drain = job_runner
+        fakes["amazon"] = FakeScraper("amazon")
+        stale_id = manager.create_job("collect", collect_params())
+        live_id = manager.create_job("collect", collect_params(max_results=1))
+        manager.claim_job(stale_id)
+        manager.claim_job(live_id)
+        manager.jobs.update_one(
+            {"_id": ObjectId(stale_id)},
+            {"$set": {"updated_at": datetime.now() - timedelta(seconds=settings.job_stale_seconds + 60)}},
+        )
+
+        jobs.recover_jobs()
+        drain()
+
+        assert manager.get_job(stale_id)["state"] == "succeeded"
+        assert manager.get_job(live_id)["state"] == "running"
+        assert manager.products.count_documents({}) == 3
+
+    def test_unknown_and_malformed_job_ids(self, api, job_runner):
+        """Test 404 for a well-formed id with no job and 400 for a malformed one"""
+        from bson import ObjectId
+
+        missing = api.get(f"/api/jobs/{ObjectId()}")
+        assert missing.status_code == 404
+        assert "No job found" in missing.get_json()["error"]
+        assert api.get("/api/jobs/not-an-id").status_code == 400
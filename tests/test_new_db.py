@@ -29,8 +29,9 @@ product = db_manager.get_product_by_id("amazon", "TEST123")
 print(f"   Current Price: ₹{product['current_price']}")
 print(f"   Price Trend: {product['price_trend']}")
 print(f"   Price Change: {product['price_change_percent']:.1f}%")
-print(f"   Price History: {len(product['price_history'])} records")
-for entry in product["price_history"]:
+history = db_manager.get_price_history(product["unique_id"])
+print(f"   Price History: {len(history)} records")
+for entry in history:
     print(f"      - {entry['timestamp']}: ₹{entry['price']}")
 print()
 
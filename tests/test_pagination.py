@@ -0,0 +1,70 @@
+# tests/test_pagination.py
+import threading
+import pytest
+from config.settings import settings
+from src.scrapers.base_scraper import BaseScraper
+
+
+@pytest.fixture(autouse=True)
+def no_snapshots(monkeypatch):
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+
+
+class PagedScraper(BaseScraper):
+    """Scraper over an in-memory catalogue of result pages"""
+
+    platform = "paged"
+    results_per_page = 3
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def build_search_url(self, query, page=1):
+        return f"https://paged.test/s?k={query}&page={page}"
+
+    def fetch(self, url):
+        page = int(url.rsplit("=", 1)[1])
+        with self.lock:
+            self.fetched.append(page)
+        cards = self.pages[page - 1] if page <= len(self.pages) else []
+        return "".join(f'<div class="card" data-id="{c}"></div>' for c in cards) or "<p></p>"
+
+    def find_product_cards(self, soup):
+        return soup.find_all("div", class_="card")
+
+    def _extract_product_info(self, div):
+        return {"product_id": div["data-id"]}
+
+
+class TestPagination:
+    """Test multi-page search with early stop"""
+
+    def test_single_page_when_enough(self):
+        """Test that one page is fetched when it satisfies max_results"""
+        scraper = PagedScraper([["a", "b", "c"], ["d", "e", "f"]])
+        products = scraper.search_products("x", max_results=2)
+        assert [p["product_id"] for p in products] == ["a", "b"]
+        assert scraper.fetched == [1]
+
+    def test_paginates_in_order(self):
+        """Test that results span pages in page order"""
+        scraper = PagedScraper([["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]])
+        products = scraper.search_products("x", max_results=7)
+        assert [p["product_id"] for p in products] == list("abcdefg")
+
+    def test_duplicates_and_end_of_results(self):
+        """Test that repeated cards are skipped and an empty page stops paging"""
+        scraper = PagedScraper([["a", "b", "c"], ["c", "d"]])
+        products = scraper.search_products("x", max_results=10)
+        assert [p["product_id"] for p in products] == ["a", "b", "c", "d"]
+
+    def test_iter_products_is_lazy(self):
+        """Test that streamed products arrive before later pages are fetched"""
+        scraper = PagedScraper([["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]])
+        stream = scraper.iter_products("x", max_results=3)
+        assert next(stream)["product_id"] == "a"
+        stream.close()
+        assert scraper.fetched == [1]
@@ -0,0 +1,41 @@
+# tests/test_rate_limiter.py
+import asyncio
+import time
+from src.utils.rate_limiter import RateLimiter, TokenBucket
+
+
+class TestRateLimiter:
+    """Test the per-domain token bucket"""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket serves the burst and then spaces requests"""
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0.05 < bucket.reserve() <= 0.1
+        assert 0.15 < bucket.reserve() <= 0.2
+
+    def test_domains_are_independent(self):
+        """Test that one busy domain does not delay another"""
+        limiter = RateLimiter()
+        limiter.acquire("a.test", 100, 1)
+        start = time.monotonic()
+        assert limiter.acquire("b.test", 100, 1) == 0
+        assert time.monotonic() - start < 0.01
+
+    def test_async_acquire_waits(self):
+        """Test that async callers share the same buckets"""
+        limiter = RateLimiter()
+        limiter.acquire("a.test", 50, 1)
+        waited = asyncio.run(limiter.acquire_async("a.test", 50, 1))
+        assert waited > 0
+
+    def test_stats(self):
+        """Test that wait metrics are reported per domain"""
+        limiter = RateLimiter()
+        for _ in range(3):
+            limiter.acquire("a.test", 100, 1)
+        stats = limiter.stats()["a.test"]
+        assert stats["requests"] == 3
+        assert stats["delayed_requests"] == 2
+        assert stats["max_wait_seconds"] > 0
@@ -0,0 +1,84 @@
+# tests/test_response_cache.py
+import time
+from types import SimpleNamespace
+
+from src.utils import response_cache
+from src.utils.response_cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class TestResponseCache:
+    """Test the versioned API response cache"""
+
+    def test_key_ignores_arg_order_and_blanks(self):
+        """Test that equivalent query strings share one entry"""
+        a = ResponseCache.make_key("/api/products", [("limit", "5"), ("platform", "amazon")], (0,))
+        b = ResponseCache.make_key(
+            "/api/products", [("platform", "amazon"), ("cursor", ""), ("limit", "5")], (0,)
+        )
+        assert a == b
+
+    def test_hit_after_set_and_miss_at_new_version(self):
+        """Test that a new data version hides every earlier entry"""
+        cache = ResponseCache(MemoryCacheBackend(max_entries=10, ttl=60))
+        key, value = cache.get("/api/stats", [], (1, 0, 0))
+        assert value is None
+        cache.set(key, b"{}")
+        assert cache.get("/api/stats", [], (1, 0, 0))[1] == b"{}"
+
+        assert cache.get("/api/stats", [], (1, 1, 0))[1] is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    def test_lru_eviction_and_ttl(self):
+        """Test that the least recently used entry goes first and entries expire"""
+        backend = MemoryCacheBackend(max_entries=2, ttl=0.05)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        assert backend.get("b") is None
+        assert backend.get("a") == 1
+        assert backend.evictions == 1
+
+        time.sleep(0.06)
+        assert backend.get("a") is None
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        assert isinstance(value, bytes) and ex
+        self.data[key] = value
+
+
+class TestRedisCacheBackend:
+    """Test the shared Redis backend's stored format"""
+
+    def test_entry_round_trips_as_json_and_raw_body(self, monkeypatch):
+        """Test that an entry is stored as JSON metadata plus body, not pickled"""
+        fake = FakeRedis()
+        monkeypatch.setattr(
+            response_cache, "redis",
+            SimpleNamespace(Redis=SimpleNamespace(from_url=lambda url: fake)),
+            raising=False,
+        )
+        backend = RedisCacheBackend("redis://cache", ttl=30)
+        entry = {
+            "status": 200,
+            "mimetype": "application/json",
+            "headers": [["Vary", "Accept"], ["X-Total", "3"]],
+            "body": b'{"a":"line\nbreak"}\n\x00',
+        }
+        backend.set("k", entry)
+
+        stored = fake.data["response_cache:k"]
+        assert stored.startswith(b"{")
+        assert backend.get("k") == entry
+        assert backend.get("missing") is None
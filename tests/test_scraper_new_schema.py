@@ -58,7 +58,7 @@ if products:
         print(f"\n   Product: {retrieved['title'][:50]}...")
         print(f"   Unique ID: {retrieved['unique_id']}")
         print(f"   Current Price: ₹{retrieved['current_price']}")
-        print(f"   Price History: {len(retrieved['price_history'])} records")
+        print(f"   Price History: {len(db_manager.get_price_history(retrieved['unique_id']))} records")
         print(f"   Times Scraped: {retrieved['times_scraped']}")
         print(f"   First Seen: {retrieved['first_seen']}")
         print(f"   Last Seen: {retrieved['last_seen']}")
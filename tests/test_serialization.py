@@ -0,0 +1,33 @@
+# tests/test_serialization.py
+import json
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from src.utils import serialization
+
+
+class TestSerialization:
+    """Test JSON encoding of MongoDB documents"""
+
+    def test_nested_bson_types(self):
+        """Test that ObjectId and datetime are encoded at any depth"""
+        oid = ObjectId()
+        ts = datetime(2026, 1, 2, 3, 4, 5, 6000)
+        doc = {"_id": oid, "meta": {"seen": [ts, {"ref": oid}]}, "price": 99.5}
+        assert json.loads(serialization.dumps(doc)) == {
+            "_id": str(oid),
+            "meta": {"seen": [ts.isoformat(), {"ref": str(oid)}]},
+            "price": 99.5,
+        }
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Test that the json fallback produces the same document"""
+        doc = [{"_id": ObjectId(), "b": 1, "a": datetime(2026, 1, 1), "title": "₹ 1,299"}]
+        fast = serialization.dumps(doc, sort_keys=True)
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+        assert serialization.dumps(doc, sort_keys=True) == fast
+
+    def test_unknown_types_raise(self):
+        """Test that non-BSON objects are not silently stringified"""
+        with pytest.raises(TypeError):
+            serialization.dumps({"x": object()})
@@ -0,0 +1,97 @@
+# tests/test_snapshot_store.py
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from config.settings import settings
+from src.scrapers import snapshot_store
+from src.scrapers.snapshot_store import SnapshotStore
+from tests.test_pagination import PagedScraper
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Process-wide snapshot store rooted in a temp dir"""
+    monkeypatch.setattr(settings, "snapshot_enabled", True)
+    store = SnapshotStore(root=str(tmp_path))
+    monkeypatch.setattr(snapshot_store, "_store", store)
+    return store
+
+
+class CountingScraper(PagedScraper):
+    """PagedScraper that counts how often pages are parsed"""
+
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.parsed = 0
+
+    def extract_page(self, html):
+        self.parsed += 1
+        return super().extract_page(html)
+
+
+class TestSnapshotStore:
+    """Test content-addressed HTML snapshots"""
+
+    def test_save_and_load_roundtrip(self, store):
+        """Test that a stored page decompresses to the original HTML"""
+        digest, unchanged = store.save("amazon", "usb cable", 1, "https://x/s?k=usb", "<p>₹199</p>")
+        assert not unchanged
+        assert store.load(digest) == "<p>₹199</p>"
+        assert store.last_digest("amazon", "usb cable", 1) == digest
+
+    def test_identical_page_is_unchanged(self, store):
+        """Test that refetching the same content is detected and indexed twice"""
+        store.save("amazon", "usb cable", 1, "u", "<p>a</p>")
+        _, unchanged = store.save("amazon", "usb cable", 1, "u", "<p>a</p>")
+        _, changed = store.save("amazon", "usb cable", 1, "u", "<p>b</p>")
+        assert unchanged and not changed
+        assert len(list(store.iter_records(platform="amazon", query="usb cable"))) == 3
+
+    def test_unchanged_page_skips_parsing(self, store):
+        """Test that a repeat search reuses the cached extraction"""
+        scraper = CountingScraper([["a", "b"]])
+        first = scraper.search_products("x", max_results=2)
+        second = scraper.search_products("x", max_results=2)
+        assert first == second
+        assert scraper.parsed == 1
+
+    def test_replay_reextracts_snapshots(self, store):
+        """Test that replay parses each stored page once"""
+        scraper = CountingScraper([["a", "b"]])
+        scraper.search_products("x", max_results=2)
+        scraper.search_products("x", max_results=2)
+        replayed = list(scraper.replay_snapshots())
+        assert len(replayed) == 1
+        record, (card_count, products) = replayed[0]
+        assert record["page"] == 1 and card_count == 2
+        assert [p["product_id"] for p in products] == ["a", "b"]
+
+    def test_prune_drops_expired_records_and_their_blobs(self, store):
+        """Test that old fetches are removed while pages still indexed survive"""
+        old, _ = store.save("amazon", "usb cable", 1, "u", "<p>old</p>")
+        new, _ = store.save("amazon", "usb cable", 1, "u", "<p>new</p>")
+        index = store._index_base("amazon", "usb cable") + ".jsonl"
+        with open(index, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        records[0]["timestamp"] = (datetime.now() - timedelta(days=40)).isoformat()
+        with open(index, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+
+        removed = store.prune(max_age_days=30, max_bytes=0)
+        assert (removed["records"], removed["blobs"]) == (1, 1)
+        assert store.load(new) == "<p>new</p>"
+        with pytest.raises(KeyError):
+            store.load(old)
+
+    def test_prune_enforces_size_budget_oldest_first(self, store):
+        """Test that the oldest pages go first once blobs exceed max_bytes"""
+        digests = [store.save("amazon", "q", page, "u", os.urandom(64).hex())[0] for page in (1, 2, 3)]
+        budget = sum(os.path.getsize(store._find_blob(d)) for d in digests[1:])
+
+        store.prune(max_age_days=0, max_bytes=budget)
+        assert store._find_blob(digests[0]) is None
+        assert all(store._find_blob(d) for d in digests[1:])
+        assert [r["page"] for r in store.iter_records()] == [2, 3]
+        assert store.last_digest("amazon", "q", 1) is None